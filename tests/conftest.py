@@ -6,6 +6,17 @@ from pytest import fixture
 import vecorel_cli.vecorel.util as util
 
 
+@fixture(autouse=True)
+def cache_dir(tmp_path_factory, monkeypatch):
+    # Don't read or write the persistent caches of the user during tests
+    folder = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("VECOREL_CACHE_DIR", str(folder))
+    monkeypatch.delenv("VECOREL_SCHEMA_MAP", raising=False)
+    monkeypatch.setattr(util, "mirrored_files", {})
+    monkeypatch.setattr(util, "_loaded_schema_maps", set())
+    yield folder
+
+
 @fixture
 def tmp_parquet_file():
     # Windows can't properly handle NamedTemporaryFile etc.
@@ -0,0 +1,91 @@
+import copy
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import pyarrow as pa
+import pytest
+
+from vecorel_cli.create_jsonschema import CreateJsonSchema
+from vecorel_cli.parquet.types import get_pyarrow_type
+from vecorel_cli.vecorel.cache import FrozenDict, FrozenList, LRUCache, freeze
+from vecorel_cli.vecorel.schemas import VecorelSchema
+
+
+def test_freeze():
+    data = freeze({"a": [1, {"b": 2}], "c": "d"})
+    assert isinstance(data, FrozenDict)
+    assert isinstance(data["a"], FrozenList)
+    assert data == {"a": [1, {"b": 2}], "c": "d"}
+    with pytest.raises(TypeError):
+        data["c"] = "e"
+    with pytest.raises(TypeError):
+        data["a"][1].pop("b")
+    with pytest.raises(TypeError):
+        data["a"].append(3)
+
+    # Copies can be modified
+    modifiable = copy.deepcopy(data)
+    modifiable["a"][1]["b"] = 3
+    assert type(modifiable["a"]) is list
+    assert data["a"][1]["b"] == 2
+    shallow = data.copy()
+    shallow["c"] = "e"
+    assert data["c"] == "d"
+
+    assert pickle.loads(pickle.dumps(data)) == data
+
+
+def test_lru_cache():
+    cache = LRUCache(max_size=10)
+    cache.set("a", b"1234", size=4)
+    cache.set("b", b"1234", size=4)
+    assert cache["a"] == b"1234"  # a is now the most recently used entry
+    cache.set("c", b"1234", size=4)
+    assert list(cache) == ["a", "c"]
+    assert cache.size == 8
+
+    frozen = cache.set("d", {"x": [1]})
+    assert isinstance(frozen, FrozenDict)
+    assert cache["d"] is frozen
+    assert "a" not in cache
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda i: cache.set(str(i), "x", size=1), range(100)))
+    assert len(cache) == 10
+    assert cache.size == 10
+
+
+def test_schemas_are_not_modified():
+    schema = freeze(
+        {
+            "type": "object",
+            "patternProperties": {"^a": {"type": "string"}},
+        }
+    )
+    assert get_pyarrow_type(schema) == pa.map_(pa.string(), pa.string())
+    assert get_pyarrow_type(schema) == pa.map_(pa.string(), pa.string())
+
+    datatypes = freeze({"geometry": {"type": "object"}})
+    prop_schema = freeze({"type": "geometry", "geometryTypes": ["Polygon"]})
+    result = CreateJsonSchema().convert_schema(prop_schema, datatypes)
+    assert result == {"anyOf": [{"$ref": "https://geojson.org/schema/Polygon.json"}]}
+
+
+def test_merged_schemas_are_modifiable():
+    sdl = VecorelSchema.sdl_schema
+    a = VecorelSchema(freeze({"$schema": sdl, "properties": {"id": {"type": "string"}}}))
+    b = VecorelSchema(
+        freeze(
+            {
+                "$schema": sdl,
+                "properties": {
+                    "id": {"type": "string", "enum": ["a"]},
+                    "geometry": {"type": "geometry", "geometryTypes": ["Polygon", "Point"]},
+                },
+            }
+        )
+    )
+    merged = VecorelSchema.merge_all(a, b)
+    merged["properties"]["geometry"]["geometryTypes"].sort()
+    merged["properties"]["id"]["enum"].append("b")
+    assert b["properties"]["geometry"]["geometryTypes"] == ["Polygon", "Point"]
@@ -0,0 +1,73 @@
+import copy
+from pathlib import Path
+
+import pytest
+
+from vecorel_cli.vecorel.collection import Collection
+from vecorel_cli.vecorel.schemas import VecorelSchema
+
+core_uri = "https://vecorel.org/specification/v0.1.0/schema.yaml"
+inspire_uri = "https://fiboa.github.io/inspire-extension/v0.3.0/schema.yaml"
+
+
+def test_merge_schemas_cache(monkeypatch):
+    calls = []
+    resolve = VecorelSchema.resolve_schema_uris
+
+    def counting_resolve(uris, **kwargs):
+        calls.append(set(uris))
+        return resolve(uris, **kwargs)
+
+    monkeypatch.setattr(VecorelSchema, "resolve_schema_uris", counting_resolve)
+
+    collection = Collection({"schemas": {"c1": [core_uri]}})
+    schema = collection.merge_schemas()
+    assert "id" in schema["properties"]
+    assert collection.merge_schemas() is schema
+    assert collection.get_collection_only_properties() is not None
+    assert len(calls) == 1
+
+    # Changes to the custom schemas or the schemas invalidate the cache
+    collection.set_custom_schemas(
+        {
+            "$schema": "https://vecorel.org/sdl/v0.2.0/schema.json",
+            "properties": {"height": {"type": "double"}},
+        }
+    )
+    custom = collection.merge_schemas()
+    assert custom is not schema
+    assert "height" in custom["properties"]
+    assert len(calls) == 2
+
+    collection["schemas"]["c2"] = [core_uri]
+    assert collection.merge_schemas() is custom
+    assert len(calls) == 2
+
+    collection["schemas"]["c2"].append(inspire_uri)
+    schema_map = {inspire_uri: Path("tests/data-files/sdl/inspire-schema.yaml")}
+    inspire = collection.merge_schemas(schema_map=schema_map)
+    assert inspire is not custom
+    assert collection.merge_schemas(schema_map=schema_map) is inspire
+    assert len(calls) == 3
+
+
+def test_merge_schemas_read_only():
+    collection = Collection({"schemas": {"c1": [core_uri]}})
+    schema = collection.merge_schemas()
+    plan = schema.get_plan()
+
+    # The cached schema can't be changed, copies can
+    with pytest.raises(TypeError):
+        schema["properties"]["id"] = {"type": "int8"}
+    with pytest.raises(TypeError):
+        schema["required"].append("height")
+    with pytest.raises(TypeError):
+        schema.merge(VecorelSchema())
+    modified = copy.deepcopy(schema)
+    modified["properties"]["id"] = {"type": "int8"}
+    modified["required"].append("height")
+
+    schema = collection.merge_schemas()
+    assert schema["properties"]["id"] != {"type": "int8"}
+    assert "height" not in schema["required"]
+    assert schema.get_plan() is plan
@@ -1,13 +1,23 @@
+import hashlib
+import json
 import sys
+import tarfile
+import zipfile
+from glob import glob
+from io import BytesIO
 from pathlib import Path
 
 import pytest
+from geopandas import GeoDataFrame
 from loguru import logger
+from shapely.geometry import Point
 
+from vecorel_cli.conversion import base
 from vecorel_cli.conversion.base import BaseConverter
 from vecorel_cli.convert import ConvertData
 from vecorel_cli.registry import Registry
 from vecorel_cli.validate import ValidateData
+from vecorel_cli.vecorel import util
 
 
 @pytest.fixture(autouse=True)
@@ -74,3 +84,207 @@ def test_data_access_exception(capsys, tmp_folder):
 
     assert isinstance(converter.converter, BaseConverter)
     assert converter.converter.data_access in out
+
+
+class FakeSource:
+    """
+    A remote file system that serves files from memory with ETags and can simulate
+    interrupted downloads.
+    """
+
+    def __init__(self):
+        self.files = {}
+        self.interrupted = []
+        self.opened = []
+        self.offsets = []
+
+    def add(self, uri, data, etag):
+        self.files[uri] = (data, etag)
+
+    def info(self, uri):
+        if uri not in self.files:
+            raise FileNotFoundError(uri)
+        data, etag = self.files[uri]
+        return {"size": len(data), "ETag": etag}
+
+    def open(self, uri, mode="rb", **kwargs):
+        self.opened.append(uri)
+        if uri not in self.files:
+            raise FileNotFoundError(uri)
+        data = self.files[uri][0]
+        if uri in self.interrupted:
+            self.interrupted.remove(uri)
+            data = data[: len(data) // 2]
+
+        offsets = self.offsets
+
+        class Stream(BytesIO):
+            def seek(self, offset, whence=0):
+                offsets.append(offset)
+                return super().seek(offset, whence)
+
+        return Stream(data)
+
+
+@pytest.fixture
+def fake_source(monkeypatch):
+    source = FakeSource()
+    get_fs = base.get_fs
+    monkeypatch.setattr(
+        base, "get_fs", lambda uri, **kwargs: source if "://" in str(uri) else get_fs(uri, **kwargs)
+    )
+    monkeypatch.setattr(base.time, "sleep", lambda seconds: None)
+    return source
+
+
+def test_download_files(tmp_folder, fake_source):
+    uris = {f"https://example.com/{i}.gpkg": f"{i}.gpkg" for i in range(5)}
+    for uri in uris:
+        fake_source.add(uri, uri.encode("utf-8") * 100, etag="v1")
+    fake_source.interrupted.append("https://example.com/2.gpkg")
+
+    converter = BaseConverter()
+    paths = converter.download_files(uris, tmp_folder)
+    assert paths == [(str(tmp_folder / name), uri) for uri, name in uris.items()]
+    for path, uri in paths:
+        data = Path(path).read_bytes()
+        assert data == uri.encode("utf-8") * 100
+        meta = json.loads(Path(path + ".json").read_text())
+        assert meta["size"] == len(data)
+        assert meta["version"] == "v1"
+        assert meta["sha256"] == hashlib.sha256(data).hexdigest()
+    assert list(tmp_folder.glob("*.part*")) == []
+
+    # 5 downloads + 1 retry, which resumed the interrupted download
+    assert len(fake_source.opened) == 6
+    assert fake_source.offsets == [len(b"https://example.com/2.gpkg") * 50]
+
+    # Cached files are not downloaded again
+    converter.download_files(uris, tmp_folder)
+    assert len(fake_source.opened) == 6
+
+
+def test_download_files_revalidate(tmp_folder, fake_source, monkeypatch):
+    uri = "https://example.com/data.gpkg"
+    fake_source.add(uri, b"version 1", etag="v1")
+    converter = BaseConverter()
+    ((path, _),) = converter.download_files(uri, tmp_folder)
+
+    # The source has changed
+    fake_source.add(uri, b"version 2", etag="v2")
+    converter.download_files(uri, tmp_folder)
+    assert Path(path).read_bytes() == b"version 2"
+    assert len(fake_source.opened) == 2
+
+    # The cached file is incomplete
+    Path(path).write_bytes(b"vers")
+    converter.download_files(uri, tmp_folder)
+    assert Path(path).read_bytes() == b"version 2"
+    assert len(fake_source.opened) == 3
+
+    # The source is not checked in offline mode
+    monkeypatch.setattr(util, "offline", True)
+    fake_source.add(uri, b"version 3", etag="v3")
+    converter.download_files(uri, tmp_folder)
+    assert Path(path).read_bytes() == b"version 2"
+    assert len(fake_source.opened) == 3
+
+
+def test_download_files_not_found(tmp_folder, fake_source):
+    converter = BaseConverter()
+    with pytest.raises(FileNotFoundError):
+        converter.download_files("https://example.com/missing.gpkg", tmp_folder)
+    # Missing files are not retried
+    assert len(fake_source.opened) == 1
+
+
+@pytest.fixture
+def archives(tmp_folder):
+    gdf = GeoDataFrame({"name": ["a"]}, geometry=[Point(1, 2)], crs="EPSG:4326")
+    gdf.to_file(tmp_folder / "fields.gpkg")
+
+    zip_path = tmp_folder / "data.zip"
+    with zipfile.ZipFile(zip_path, "w") as zip_file:
+        zip_file.write(tmp_folder / "fields.gpkg", "data/fields.gpkg")
+        zip_file.writestr("data/parcels.shp", b"shp")
+        zip_file.writestr("data/parcels.dbf", b"dbf")
+        zip_file.writestr("data/large.bin", b"large")
+        zip_file.writestr("data/db.gdb/a0001.gdbtable", b"gdb")
+
+    tar_path = tmp_folder / "data.tar.gz"
+    with tarfile.open(tar_path, "w:gz") as tar_file:
+        tar_file.add(tmp_folder / "fields.gpkg", "fields.gpkg")
+        tar_file.add(zip_path, "large.zip")
+
+    return zip_path, tar_path
+
+
+def test_download_files_extract(tmp_folder, archives):
+    zip_path, tar_path = archives
+    cache = tmp_folder / "cache"
+    converter = BaseConverter()
+    paths = converter.download_files(
+        {
+            str(zip_path): ["**/parcels.shp", "data/*.gdb"],
+            str(tar_path): ["fields.gpkg"],
+        },
+        cache,
+    )
+
+    zip_folder = cache / "extracted.data"
+    assert paths == [
+        (str(zip_folder / "**/parcels.shp"), str(zip_path)),
+        (str(zip_folder / "data/*.gdb"), str(zip_path)),
+        (str(cache / "extracted.data.tar" / "fields.gpkg"), str(tar_path)),
+    ]
+    # Only the listed files and the files that belong to them are extracted
+    extracted = sorted(p.relative_to(zip_folder).as_posix() for p in zip_folder.rglob("*.*"))
+    assert extracted == [
+        "data/db.gdb",
+        "data/db.gdb/a0001.gdbtable",
+        "data/parcels.dbf",
+        "data/parcels.shp",
+    ]
+    assert sorted(p.name for p in (cache / "extracted.data.tar").iterdir()) == ["fields.gpkg"]
+    assert list(cache.glob(".extracting.*")) == []
+
+
+def test_download_files_virtual(tmp_folder, archives):
+    zip_path, tar_path = archives
+    converter = BaseConverter()
+    converter.virtual_archives = True
+    paths = converter.download_files(
+        {str(zip_path): ["data/*.gpkg"], str(tar_path): ["fields.gpkg"]}, tmp_folder / "cache"
+    )
+    assert paths == [
+        (f"/vsizip/{zip_path}/data/fields.gpkg", str(zip_path)),
+        (f"/vsitar/{tar_path}/fields.gpkg", str(tar_path)),
+    ]
+    assert list((tmp_folder / "cache").iterdir()) == []
+
+    for gdf, _, _, _ in converter.get_data(paths):
+        assert gdf["name"].tolist() == ["a"]
+
+
+def test_match_members(tmp_folder):
+    names = BaseConverter.get_member_paths(["a.gpkg", "docs/legend.gpkg", "docs/sub/b.shp"])
+    for path in ["a.gpkg", "docs/legend.gpkg", "docs/sub/b.shp"]:
+        (tmp_folder / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_folder / path).touch()
+
+    # Same results as glob
+    for pattern in ["*.gpkg", "*/*.gpkg", "**/*.gpkg", "docs/**", "**/b.shp", "docs/*"]:
+        expected = sorted(
+            Path(p).relative_to(tmp_folder).as_posix()
+            for p in glob(str(tmp_folder / pattern), recursive=True)
+        )
+        matched = sorted(BaseConverter.match_members(names, pattern))
+        assert matched == expected, pattern
+
+
+def test_download_files_virtual_no_match(tmp_folder, archives):
+    zip_path, _ = archives
+    converter = BaseConverter()
+    converter.virtual_archives = True
+    with pytest.raises(ValueError, match="Can not match"):
+        converter.download_files({str(zip_path): ["*.gpkg"]}, tmp_folder / "cache")
@@ -1,8 +1,12 @@
+import json
+import tarfile
+import zipfile
 from pathlib import Path
 
 import pytest
 
 from vecorel_cli.create_geojson import CreateGeoJson
+from vecorel_cli.encoding.geojson import GeoJSON
 from vecorel_cli.vecorel.util import load_file
 
 
@@ -56,7 +60,59 @@ def test_create_geojson_features(tmp_folder: Path):
     check_file("6467975")
 
 
+@pytest.mark.parametrize("filename", ["features.zip", "features.tar.gz"])
+def test_create_geojson_features_archive(tmp_folder: Path, filename: str):
+    source = "tests/data-files/inspire.parquet"
+    out_file = tmp_folder / filename
+
+    gj = CreateGeoJson()
+    gj.create(source, out_file, split=True, jobs=2)
+
+    assert out_file.exists()
+
+    if zipfile.is_zipfile(out_file):
+        with zipfile.ZipFile(out_file) as zf:
+            files = {name: zf.read(name) for name in zf.namelist()}
+    else:
+        with tarfile.open(out_file) as tf:
+            files = {m.name: tf.extractfile(m).read() for m in tf.getmembers()}
+
+    assert sorted(files.keys()) == ["6467974.json", "6467975.json"]
+    for name, payload in files.items():
+        geojson = json.loads(payload)
+        assert geojson.get("type") == "Feature"
+        assert f"{geojson.get('id')}.json" == name
+        assert isinstance(geojson.get("schemas").get("inspire"), list)
+
+
 def test_create_geojson_invalid_file(tmp_folder):
     gj = CreateGeoJson()
     with pytest.raises(FileNotFoundError):
         gj.create("invalid.parquet", tmp_folder)
+
+
+def test_create_geojson_precision(tmp_folder: Path):
+    source = "tests/data-files/inspire.parquet"
+    out_file = tmp_folder / "inspire.json"
+
+    gj = CreateGeoJson()
+    gj.create(source, out_file, split=False, precision=1)
+
+    geojson = load_file(out_file)
+    for feature in geojson.get("features", []):
+        for x, y in feature["geometry"]["coordinates"][0]:
+            assert round(x, 1) == x
+            assert round(y, 1) == y
+
+
+def test_create_geojson_features_chunks(tmp_folder: Path, monkeypatch):
+    monkeypatch.setattr(GeoJSON, "feature_chunk_size", 1)
+    source = "tests/data-files/inspire.parquet"
+    out_file = tmp_folder / "features.zip"
+
+    gj = CreateGeoJson()
+    gj.create(source, out_file, split=True, jobs=2)
+
+    # The chunks are written in the order of the source data
+    with zipfile.ZipFile(out_file) as zf:
+        assert zf.namelist() == ["6467974.json", "6467975.json"]
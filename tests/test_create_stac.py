@@ -1,3 +1,4 @@
+import copy
 from pathlib import Path
 
 import pytest
@@ -25,8 +26,9 @@ def test_create_stac_collection(tmp_folder: Path, file: str, expected_file: str)
 
     assert out_file.exists()
 
-    created_file = load_file(out_file)
-    expected = load_file(expected_file)
+    # The loaded files are read-only
+    created_file = copy.deepcopy(load_file(out_file))
+    expected = copy.deepcopy(load_file(expected_file))
 
     assert isinstance(created_file, dict), "Created file is not a valid JSON dict"
 
@@ -13,8 +13,11 @@ tests = [
     ("invalid.parquet", GeoParquet),
     ("invalid.geojson", GeoJSON),
     ("invalid.geoparquet", GeoParquet),
+    ("invalid.json.gz", GeoJSON),
+    ("invalid.geojson.zst", GeoJSON),
     # non-existing encoding
     ("invalid.txt", None),
+    ("invalid.txt.gz", None),
     ("invalid", None),
 ]
 
@@ -1,6 +1,8 @@
 from pathlib import Path
 
 import pytest
+from geopandas import GeoSeries
+from shapely.geometry import Point
 
 from vecorel_cli.encoding.geojson import GeoJSON
 from vecorel_cli.vecorel.collection import Collection
@@ -24,6 +26,37 @@ def test_get_format():
     assert GeoJSON("test.json").get_format() == "GeoJSON"
 
 
+@pytest.mark.parametrize(
+    "test",
+    [
+        ("test.json", None),
+        ("test.geojson", None),
+        ("test.json.gz", "gzip"),
+        ("test.geojson.gz", "gzip"),
+        ("test.geojson.zst", "zstd"),
+    ],
+)
+def test_get_compression(test):
+    path, expected = test
+    assert GeoJSON(path).get_compression() == expected
+
+
+@pytest.mark.parametrize("ext", [".json.gz", ".geojson.zst"])
+def test_compressed_roundtrip(tmp_folder, ext):
+    source = GeoJSON("tests/data-files/inspire.json")
+    obj = source.read_geojson()
+
+    target = GeoJSON(tmp_folder / f"inspire{ext}")
+    target._write_json(obj, target.uri)
+
+    with open(target.uri, "rb") as f:
+        assert not f.read(1) == b"{", "File must be compressed"
+
+    assert target.read_geojson() == obj
+    assert target.get_collection() == source.get_collection()
+    assert len(target.read(num=1)) == 1
+
+
 @pytest.mark.parametrize(
     "test",
     [
@@ -55,3 +88,64 @@ def test_get_collection_returns_existing(tmp_folder):
 
     result = geojson.get_collection()
     assert result == expected
+
+
+def test_read_properties():
+    geojson = GeoJSON("tests/data-files/mixed.json")
+    full = geojson.read()
+    gdf = geojson.read(properties=["geometry", "id", "admin:country_code", "invalid"])
+
+    assert list(gdf.columns) == ["geometry", "id", "admin:country_code"]
+    assert len(gdf) == len(full)
+    assert list(gdf["id"]) == list(full["id"])
+    assert gdf.crs == full.crs
+    assert gdf.geometry.equals(full.geometry)
+
+
+@pytest.mark.parametrize("ext", [".json", ".json.gz"])
+@pytest.mark.parametrize(
+    "order", [["type", "features", "schemas"], ["schemas", "features", "type"]]
+)
+def test_read_header(tmp_folder, ext, order):
+    source = GeoJSON("tests/data-files/mixed.json")
+    obj = source.read_geojson()
+    obj["title"] = 'Title with "special" characters: ]}, {['
+    # Write the features before (some of) the collection metadata
+    keys = order + [k for k in obj.keys() if k not in order]
+    obj = {k: obj[k] for k in keys}
+
+    target = GeoJSON(tmp_folder / f"mixed{ext}")
+    target._write_json(obj, target.uri, indent=2)
+
+    collection = GeoJSON(target.uri).read_header()
+    assert isinstance(collection, Collection)
+    assert collection == source.get_collection() | {"title": obj["title"]}
+
+
+@pytest.mark.parametrize("max_size", [100, 1024 * 1024])
+def test_read_header_links_after_features(tmp_folder, monkeypatch, max_size):
+    monkeypatch.setattr(GeoJSON, "trailer_chunk_size", 100)
+    monkeypatch.setattr(GeoJSON, "trailer_max_size", max_size)
+    source = GeoJSON("tests/data-files/mixed.json")
+    obj = source.read_geojson()
+    # A large array of objects after the features must not be mistaken for the features
+    links = [{"rel": "item", "href": f"https://example.com/{i}.json"} for i in range(100)]
+    obj = {"schemas": obj.pop("schemas"), **obj, "links": links, "collection": "c"}
+
+    target = GeoJSON(tmp_folder / "mixed.json")
+    target._write_json(obj, target.uri)
+
+    collection = GeoJSON(target.uri).read_header()
+    assert collection == source.get_collection() | {"links": links, "collection": "c"}
+
+
+def test_round_coordinates():
+    geometries = [Point(1.123, 2.126, 3.98), Point(1.123, 2.126)]
+    rounded = GeoJSON.round_coordinates(geometries, 1)
+    assert rounded[0].equals_exact(Point(1.1, 2.1, 4.0), 0)
+    assert rounded[0].has_z
+    assert not rounded[1].has_z
+
+    series = GeoJSON.round_coordinates(GeoSeries(geometries), 1)
+    assert series.has_z.tolist() == [True, False]
+    assert series[0].z == 4.0
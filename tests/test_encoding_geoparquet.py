@@ -46,3 +46,12 @@ def test_get_collection_returns_existing(tmp_folder):
     result = geojson.get_collection()
     assert isinstance(result, Collection)
     assert result == test_collection
+
+
+def test_read_row_group():
+    encoding = GeoParquet("tests/data-files/inspire.parquet")
+    metadata = encoding.get_parquet_metadata()
+
+    table = encoding.read_row_group(0, properties=["id"])
+    assert table.column_names == ["id"]
+    assert table.num_rows == metadata.row_group(0).num_rows
@@ -1,4 +1,6 @@
-from vecorel_cli.create_jsonschema import CreateJsonSchema
+import pytest
+
+from vecorel_cli.create_jsonschema import CreateJsonSchema, jsonschema_cache
 from vecorel_cli.encoding.geojson import GeoJSON
 from vecorel_cli.validate_schema import ValidateSchema
 from vecorel_cli.vecorel.util import load_file
@@ -134,3 +136,30 @@ def test_invalid_prop_in_root():
     )
     assert len(result) > 0
     assert result[0].message == "'' should be non-empty"
+
+
+def test_cache(cache_dir):
+    jsonschema_cache.clear()
+    cmd = CreateJsonSchema()
+    jsonschema = cmd.create_from_dict(vecorel_schema, datatypes, schema_id)
+    assert cmd.create_from_dict(vecorel_schema, datatypes, schema_id) is jsonschema
+    assert cmd.create_from_dict(vecorel_schema, datatypes) is not jsonschema
+
+    # The cached schemas are read-only
+    with pytest.raises(TypeError):
+        jsonschema["$id"] = "https://example.com/other.json"
+
+    # The schemas are also stored on disk
+    key = cmd.get_cache_key("collection", vecorel_schema, datatypes, schema_id)
+    assert (cache_dir / "jsonschema" / f"{key}.json").exists()
+    jsonschema_cache.clear()
+    assert cmd.create_from_dict(vecorel_schema, datatypes, schema_id) == jsonschema
+
+    # The feature schemas depend on the top-level properties of the FeatureCollection
+    header, feature = cmd.create_feature_schemas_from_dict(vecorel_schema, datatypes, {"id"})
+    assert cmd.create_feature_schemas_from_dict(vecorel_schema, datatypes, {"id"}) == (
+        header,
+        feature,
+    )
+    _, other = cmd.create_feature_schemas_from_dict(vecorel_schema, datatypes, set())
+    assert other is not feature
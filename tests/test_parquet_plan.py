@@ -0,0 +1,63 @@
+import copy
+import pickle
+
+import pandas as pd
+import pyarrow as pa
+
+from vecorel_cli.vecorel.schemas import VecorelSchema
+
+schema = {
+    "$schema": "https://vecorel.org/sdl/v0.2.0/schema.json",
+    "required": ["id"],
+    "properties": {
+        "id": {"type": "string"},
+        "height": {"type": "float", "minimum": 0},
+        "geometry": {"type": "geometry"},
+    },
+}
+
+
+def test_column_plan():
+    plan = VecorelSchema(schema).get_plan()
+    assert plan.get("unknown") is None
+
+    column = plan.get("id")
+    assert not column.nullable
+    assert column.field == pa.field("id", pa.string(), nullable=False)
+    assert column.type_check(pa.string())
+    assert list(column.cast(pd.Series(["a"], dtype="object"))) == ["a"]
+
+    column = plan.get("height")
+    assert column.nullable
+    assert column.pandas_dtype == "Float32"
+    assert column.field == pa.field("height", pa.float32())
+    assert str(column.cast(pd.Series([1, None])).dtype) == "Float32"
+    validator = column.create_validator()
+    assert validator.checks is column.checks
+    validator.update(pa.array([1.0, -1.0], pa.float32()))
+    assert validator.get_issues() == [
+        "Value -1.0 is less than the minimum allowed value of 0. Invalid in 1 row: 1"
+    ]
+
+    # All columns are nullable for multiple collections
+    assert VecorelSchema(schema).get_plan(multiple_collections=True).get("id").nullable
+
+
+def test_schema_plan_cache():
+    vecorel_schema = VecorelSchema(schema)
+    plan = vecorel_schema.get_plan()
+    assert vecorel_schema.get_plan() is plan
+    assert vecorel_schema.get_plan(multiple_collections=True) is not plan
+
+    # Copies and pickled schemas don't share the plans
+    assert copy.deepcopy(vecorel_schema).get_plan() is not plan
+    assert pickle.loads(pickle.dumps(vecorel_schema)) == vecorel_schema
+
+    # Merging changes the schema, so the plans are created again
+    vecorel_schema.merge(
+        {
+            "$schema": "https://vecorel.org/sdl/v0.2.0/schema.json",
+            "properties": {"note": {"type": "string"}},
+        }
+    )
+    assert vecorel_schema.get_plan().get("note") is not None
@@ -0,0 +1,99 @@
+import json
+
+import pytest
+import requests
+
+from vecorel_cli.cli.util import valid_schemas_for_cli
+from vecorel_cli.prefetch_schemas import PrefetchSchemas
+from vecorel_cli.vecorel import util
+
+inspire_uri = "https://fiboa.github.io/inspire-extension/v0.3.0/schema.yaml"
+
+documents = {
+    "https://example.com/a/schema.yaml": b"properties:\n  x:\n    $ref: ../b.json#/$defs/x\n",
+    "https://example.com/b.json": b'{"$defs": {"x": {"$ref": "https://geojson.org/schema/Point.json"}}}',
+    "https://geojson.org/schema/Point.json": b'{"type": "object"}',
+}
+
+
+@pytest.fixture
+def fake_remote(monkeypatch):
+    def get(uri, **kwargs):
+        response = requests.Response()
+        response.url = uri
+        if uri in documents:
+            response.status_code = 200
+            response._content = documents[uri]
+        else:
+            response.status_code = 404
+        return response
+
+    monkeypatch.setattr(requests, "get", get)
+
+
+def test_get_uris():
+    uris = PrefetchSchemas().get_uris(
+        ["tests/data-files/inspire.parquet"], ["https://example.com/x"]
+    )
+    assert inspire_uri in uris
+    assert "https://example.com/x" in uris
+    assert "https://vecorel.org/specification/v0.1.0/schema.yaml" in uris
+    assert "https://vecorel.org/specification/v0.1.0/geojson/datatypes.json" in uris
+    assert "https://vecorel.org/sdl/v0.2.0/schema.json" in uris
+    assert "https://geoparquet.org/releases/v1.1.0/schema.json" in uris
+    assert "https://geojson.org/schema/Feature.json" in uris
+
+
+def test_prefetch(tmp_folder, fake_remote):
+    schema_map = PrefetchSchemas().prefetch({"https://example.com/a/schema.yaml"}, tmp_folder)
+    assert set(schema_map.keys()) == set(documents.keys())
+    for uri, path in schema_map.items():
+        assert path.read_bytes() == documents[uri]
+    assert schema_map["https://example.com/b.json"] == tmp_folder / "example.com" / "b.json"
+
+    map_file = tmp_folder / PrefetchSchemas.schema_map_filename
+    with open(map_file, "r", encoding="utf-8") as f:
+        assert json.load(f)["https://example.com/b.json"] == "example.com/b.json"
+    assert valid_schemas_for_cli((str(map_file),)) == schema_map
+
+    with pytest.raises(ValueError, match="1 schemas could not be downloaded"):
+        PrefetchSchemas().prefetch({"https://example.com/missing.json"}, tmp_folder)
+
+
+def test_mirror(tmp_folder, fake_remote, monkeypatch):
+    target = tmp_folder / "mirror"
+    PrefetchSchemas().prefetch({"https://example.com/a/schema.yaml"}, target)
+
+    # No network access, all files are loaded from the mirror
+    def no_network(*args, **kwargs):
+        raise requests.ConnectionError("No network")
+
+    monkeypatch.setattr(requests, "get", no_network)
+    monkeypatch.setattr(util.time, "sleep", lambda seconds: None)
+    monkeypatch.setenv("VECOREL_SCHEMA_MAP", str(target / PrefetchSchemas.schema_map_filename))
+    for uri, data in documents.items():
+        assert util.load_remote_file(uri) == data
+    with pytest.raises(requests.ConnectionError):
+        util.load_remote_file("https://example.com/other.json")
+
+
+def test_prefetch_updates(tmp_folder, fake_remote, monkeypatch):
+    uri = "https://geojson.org/schema/Point.json"
+    PrefetchSchemas().prefetch({uri}, tmp_folder)
+    assert util.load_remote_file(uri) == documents[uri]
+
+    # Running prefetch again downloads the latest version, even if cached or mirrored
+    monkeypatch.setitem(documents, uri, b'{"type": "string"}')
+    monkeypatch.setenv("VECOREL_SCHEMA_MAP", str(tmp_folder / PrefetchSchemas.schema_map_filename))
+    schema_map = PrefetchSchemas().prefetch({uri}, tmp_folder)
+    assert schema_map[uri].read_bytes() == b'{"type": "string"}'
+
+
+def test_default_mirror_not_used(cache_dir, fake_remote, monkeypatch):
+    uri = "https://geojson.org/schema/Point.json"
+    target = util.get_cache_dir("mirror")
+    PrefetchSchemas().prefetch({uri}, target)
+    (target / "geojson.org" / "schema" / "Point.json").write_bytes(b"{}")
+
+    # The mirror in the cache folder is only used if requested explicitly
+    assert util.load_remote_file(uri) == documents[uri]
@@ -0,0 +1,115 @@
+import pytest
+import requests
+
+import vecorel_cli.vecorel.util as util
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, content=b"", headers={}):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code}")
+
+
+@pytest.fixture
+def fake_server(monkeypatch):
+    calls = []
+    responses = []
+
+    def get(uri, headers={}, **kwargs):
+        calls.append(headers)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(requests, "get", get)
+    monkeypatch.setattr(util.time, "sleep", lambda seconds: None)
+    return calls, responses
+
+
+def test_load_remote_file(fake_server, monkeypatch):
+    calls, responses = fake_server
+    uri = "https://example.com/schema.json"
+
+    responses.append(FakeResponse(content=b'{"a": 1}', headers={"ETag": '"v1"'}))
+    assert util.load_remote_file(uri) == b'{"a": 1}'
+    assert len(calls) == 1
+
+    # Within the TTL, no request is sent
+    assert util.load_remote_file(uri) == b'{"a": 1}'
+    assert len(calls) == 1
+
+    # After the TTL, the file is revalidated with the ETag
+    monkeypatch.setattr(util, "cache_ttl", 0)
+    responses.append(FakeResponse(status_code=304))
+    assert util.load_remote_file(uri) == b'{"a": 1}'
+    assert calls[-1]["If-None-Match"] == '"v1"'
+
+    responses.append(FakeResponse(content=b'{"a": 2}', headers={"ETag": '"v2"'}))
+    assert util.load_remote_file(uri) == b'{"a": 2}'
+
+    # The server is not reachable (also after retrying), the cached file is used
+    responses.extend([requests.ConnectionError("No network")] * (util.request_retries + 1))
+    assert util.load_remote_file(uri) == b'{"a": 2}'
+
+    # No requests in offline mode
+    monkeypatch.setattr(util, "offline", True)
+    assert util.load_remote_file(uri) == b'{"a": 2}'
+    assert len(calls) == 6
+    with pytest.raises(FileNotFoundError, match="offline mode"):
+        util.load_remote_file("https://example.com/other.json")
+
+
+def test_http_get_retries(fake_server):
+    calls, responses = fake_server
+    responses.extend(
+        [requests.Timeout(), FakeResponse(status_code=503), FakeResponse(content=b"1")]
+    )
+    assert util.http_get("https://example.com/a.json").content == b"1"
+    assert len(calls) == 3
+
+    # Client errors are not retried
+    responses.append(FakeResponse(status_code=404))
+    with pytest.raises(requests.HTTPError):
+        util.http_get("https://example.com/a.json")
+    assert len(calls) == 4
+
+
+def test_load_files():
+    results = util.load_files(["tests/data-files/admin.json", "missing.json", "pyproject.toml"])
+    assert results[0]["type"] == "Feature"
+    assert isinstance(results[1], FileNotFoundError)
+    assert isinstance(results[2], bytes)
+
+
+def test_get_cache_dir(cache_dir, monkeypatch):
+    assert util.get_cache_dir("remote") == cache_dir / "remote"
+
+    monkeypatch.delenv("VECOREL_CACHE_DIR")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_dir))
+    assert util.get_cache_dir() == cache_dir / "vecorel-cli"
+
+
+def test_download_semaphore():
+    uri = "https://example.com/data.zip"
+
+    downloads = util.get_download_semaphore(uri)
+    assert downloads is util.get_download_semaphore("https://example.com/other.zip")
+    assert downloads is not util.get_host_semaphore(uri)
+
+    # Long-running downloads don't block other requests to the same host
+    for _ in range(util.max_downloads_per_host):
+        assert downloads.acquire(blocking=False)
+    try:
+        assert not downloads.acquire(blocking=False)
+        others = util.get_host_semaphore(uri)
+        assert others.acquire(blocking=False)
+        others.release()
+    finally:
+        for _ in range(util.max_downloads_per_host):
+            downloads.release()
@@ -1,10 +1,19 @@
+import json
 import re
 
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 from jsonschema.exceptions import ValidationError
 
 from vecorel_cli.registry import Registry
 from vecorel_cli.validate import ValidateData
+from vecorel_cli.validation import geojson as geojson_validation
+from vecorel_cli.validation.cache import ValidationCache
+from vecorel_cli.validation.geojson import GeoJSONValidator
+from vecorel_cli.validation.geoparquet import GeoParquetValidator
+from vecorel_cli.vecorel import schemas, util
+from vecorel_cli.vecorel.util import reservoir_sample
 
 inspire_str = "https://fiboa.github.io/inspire-extension/v0.3.0/schema.yaml"
 inspire_re = re.compile(r"https://fiboa.github.io/inspire-extension/v0.3.\d+/schema.yaml")
@@ -38,9 +47,13 @@ tests = [
     (
         "tests/data-files/mixed-invalid.parquet",
         [
-            Exception("admin:country_code: String 'DEE' is longer than the maximum length of 2."),
             Exception(
-                "admin:country_code: String 'DEE' does not match the required pattern: ^[A-Z]{2}$."
+                "admin:country_code: String 'DEE' is longer than the maximum length of 2. "
+                "Invalid in 1 row: 0"
+            ),
+            Exception(
+                "admin:country_code: String 'DEE' does not match the required pattern: ^[A-Z]{2}$. "
+                "Invalid in 1 row: 0"
             ),
         ],
         [],
@@ -108,3 +121,238 @@ def test_validate(test):
                 assert error == expect
 
         assert not result.is_valid()
+
+
+def test_validate_row_groups(tmp_path, monkeypatch):
+    # Write the invalid rows three times into separate row groups
+    table = pq.read_table("tests/data-files/mixed-invalid.parquet")
+    table = pa.concat_tables([table, table, table])
+    filepath = tmp_path / "row-groups.parquet"
+    pq.write_table(table, filepath, row_group_size=1)
+    assert pq.ParquetFile(filepath).metadata.num_row_groups == 6
+
+    monkeypatch.setattr(GeoParquetValidator, "max_workers", 2)
+    result = ValidateData().validate(filepath)
+    assert [str(error) for error in result.errors] == [
+        "admin:country_code: String 'DEE' is longer than the maximum length of 2. "
+        "Invalid in 3 rows: 0, 2, 4",
+        "admin:country_code: String 'DEE' does not match the required pattern: ^[A-Z]{2}$. "
+        "Invalid in 3 rows: 0, 2, 4",
+    ]
+
+    result = ValidateData().validate(filepath, num=3)
+    assert [str(error) for error in result.errors] == [
+        "admin:country_code: String 'DEE' is longer than the maximum length of 2. "
+        "Invalid in 2 rows: 0, 2",
+        "admin:country_code: String 'DEE' does not match the required pattern: ^[A-Z]{2}$. "
+        "Invalid in 2 rows: 0, 2",
+    ]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_validate_jobs(jobs):
+    files = [
+        "tests/data-files/inspire.json",
+        "tests/data-files/mixed-invalid.parquet",
+        "invalid.parquet",
+        "tests/data-files/inspire.parquet",
+        "tests/data-files/inspire-invalid.json",
+    ]
+    results = list(ValidateData()._validate_files_parallel(files, num=None, jobs=jobs))
+    assert len(results) == len(files)
+    assert results[0].is_valid()
+    assert not results[1].is_valid()
+    assert len(results[1].errors) == 2
+    assert isinstance(results[2].errors[0], FileNotFoundError)
+    assert results[3].is_valid()
+    assert not results[4].is_valid()
+
+    with pytest.raises(ValueError, match="Validation failed for 3 files."):
+        ValidateData().validate_cli(files, jobs=jobs)
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_validate_geojson_features(jobs, tmp_folder, monkeypatch):
+    monkeypatch.setattr(GeoJSONValidator, "chunk_size", 1)
+    data = util.load_file("tests/data-files/mixed-invalid.json")
+    # The first feature is invalid, the second one is valid
+    invalid, valid = data["features"]
+    data = {**data, "features": [valid, invalid, valid, invalid]}
+    filepath = tmp_folder / "features.json"
+    filepath.write_text(json.dumps(data), encoding="utf-8")
+
+    result = ValidateData().validate(filepath, jobs=jobs)
+    assert len(result.errors) == 4
+    for error, index in zip(result.errors, [1, 1, 3, 3]):
+        assert isinstance(error, ValidationError)
+        assert list(error.path) == ["features", index, "properties", "admin:country_code"]
+
+    # A single file passes the number of jobs to the validator
+    results = list(ValidateData()._validate_files_parallel([filepath], num=None, jobs=jobs))
+    assert [list(e.path)[1] for e in results[0].errors] == [1, 1, 3, 3]
+
+    # No features are validated
+    result = ValidateData().validate("tests/data-files/mixed-invalid.json", num=0)
+    assert [str(e) for e in result.errors] == ["FeatureCollection is empty"]
+
+
+def test_group_rows():
+    values = pa.chunked_array([["a", "b", None], ["a", "c"]])
+    groups = GeoParquetValidator.group_rows(values)
+    assert {cid: rows.tolist() for cid, rows in groups.items()} == {
+        "a": [0, 3],
+        "b": [1],
+        "c": [4],
+    }
+
+
+def test_validate_sample(tmp_path):
+    table = pq.read_table("tests/data-files/mixed-invalid.parquet")
+    table = pa.concat_tables([table] * 5)
+    filepath = tmp_path / "sample.parquet"
+    pq.write_table(table, filepath, row_group_size=2)
+
+    result = ValidateData().validate(filepath, sample=4, seed=42)
+    assert "Data was not fully validated, only a random sample of 4 rows was checked" in (
+        result.warnings
+    )
+    # Only the rows with even numbers are invalid
+    rows = [int(r) for r in str(result.errors[0]).split(": ")[-1].split(", ")]
+    assert all(r % 2 == 0 for r in rows)
+    # Same sample for the same seed
+    again = ValidateData().validate(filepath, sample=4, seed=42)
+    assert [str(e) for e in again.errors] == [str(e) for e in result.errors]
+
+    result = ValidateData().validate(filepath, sample=100)
+    assert len(result.errors) == 2
+    assert str(result.errors[0]).endswith("Invalid in 5 rows: 0, 2, 4, 6, 8")
+    assert not any(w.startswith("Data was not fully validated") for w in result.warnings)
+
+    result = ValidateData().validate("tests/data-files/mixed-invalid.json", sample=1, seed=1)
+    assert "Data was not fully validated, only a random sample of 1 features was checked" in (
+        result.warnings
+    )
+
+
+def test_reservoir_sample():
+    sample, count = reservoir_sample(range(1000), 10, seed=1)
+    assert count == 1000
+    assert len(sample) == 10
+    assert sample == sorted(sample)
+    assert reservoir_sample(range(1000), 10, seed=1)[0] == sample
+    assert reservoir_sample(range(5), 10) == ([0, 1, 2, 3, 4], 5)
+
+
+def test_validate_level_metadata(tmp_path):
+    table = pq.read_table("tests/data-files/inspire.parquet")
+    collection = json.loads(table.schema.metadata[b"collection"])
+    collection["schemas:custom"]["required"] = ["note"]
+    collection["schemas:custom"]["properties"].update(
+        {
+            "height": {"type": "double", "minimum": 0},
+            "method": {"type": "string", "enum": ["driven", "manual"]},
+            "note": {"type": "string"},
+        }
+    )
+    table = table.append_column("height", pa.array([-1.5, 5.0]))
+    table = table.append_column("method", pa.array(["manual", "surveyed"]))
+    table = table.append_column("note", pa.array(["a", None]))
+    metadata = {**table.schema.metadata, b"collection": json.dumps(collection).encode("utf-8")}
+    filepath = tmp_path / "stats.parquet"
+    pq.write_table(table.replace_schema_metadata(metadata), filepath)
+
+    result = ValidateData().validate(filepath, level="metadata")
+    assert [str(e) for e in result.errors] == [
+        "height: Value -1.5 is less than the minimum allowed value of 0.",
+        "method: Value 'surveyed' is not one of the allowed values in the enumeration: driven, manual",
+        "note: Nullability differs, is True but must be False",
+        "note: Required field contains 1 null values",
+    ]
+    assert "Data was not validated, only structural checks and statistics were applied" in (
+        result.warnings
+    )
+
+    result = ValidateData().validate(filepath, level="full")
+    errors = [str(e) for e in result.errors]
+    assert len(errors) == 3
+    assert errors[1].startswith("height: Value -1.5 is less than the minimum")
+    assert errors[2].startswith("method: String 'surveyed' is not one of the allowed values")
+
+
+def test_validate_cache(tmp_path, cache_dir, monkeypatch):
+    filepath = tmp_path / "cached.parquet"
+    filepath.write_bytes(open("tests/data-files/mixed-invalid.parquet", "rb").read())
+
+    results = list(ValidateData()._validate_files_parallel([filepath], cache=True, num=None))
+    assert not results[0].is_valid()
+    assert len(list((cache_dir / "validation").glob("*.json"))) == 1
+
+    # Cache hits skip the validation
+    def fail(*args, **kwargs):
+        raise Exception("Validated again")
+
+    monkeypatch.setattr(ValidateData, "validate", fail)
+    cached = list(ValidateData()._validate_files_parallel([filepath], cache=True, num=None))[0]
+    assert not cached.is_valid()
+    assert [str(e) for e in cached.errors] == [str(e) for e in results[0].errors]
+    assert cached.warnings == results[0].warnings
+
+    # Other options or changed files are validated again
+    other = list(ValidateData()._validate_files_parallel([filepath], cache=True, num=1))[0]
+    assert isinstance(other, Exception)
+    filepath.write_bytes(open("tests/data-files/inspire.parquet", "rb").read())
+    changed = list(ValidateData()._validate_files_parallel([filepath], cache=True, num=None))[0]
+    assert isinstance(changed, Exception)
+
+    # Missing files can't be fingerprinted
+    assert ValidationCache().get_key(tmp_path / "missing.parquet") is None
+
+
+def test_validate_cache_schema_changes(monkeypatch):
+    filepath = "tests/data-files/inspire.parquet"
+    cache = ValidationCache()
+    documents = {}
+
+    def load_files(uris):
+        return [documents.get(uri, {"type": "object"}) for uri in uris]
+
+    monkeypatch.setattr("vecorel_cli.validation.cache.load_files", load_files)
+    key = cache.get_key(filepath)
+    assert key is not None
+    assert cache.get_key(filepath) == key
+
+    # The key changes if the content of a schema changes without a new URL
+    documents[inspire_str] = b"type: string"
+    assert cache.get_key(filepath) != key
+
+    # Schemas that can't be loaded disable caching
+    documents[inspire_str] = ConnectionError("No network")
+    assert cache.get_key(filepath) is None
+
+    # Schemas in the schema map are fingerprinted as local files instead
+    schema_map = {inspire_str: "tests/data-files/inspire.json"}
+    assert cache.get_key(filepath, schema_map=schema_map) is not None
+
+
+def test_validate_cache_load_errors(tmp_path, cache_dir, monkeypatch):
+    filepath = tmp_path / "cached.json"
+    filepath.write_bytes(open("tests/data-files/inspire.json", "rb").read())
+
+    # Schemas that can't be loaded (e.g. no network) don't lead to cached results
+    monkeypatch.setattr(
+        schemas, "load_files", lambda uris: [ConnectionError("No network") for _ in uris]
+    )
+    result = list(ValidateData()._validate_files_parallel([filepath], cache=True, num=None))[0]
+    assert not result.is_valid()
+    assert not result.cacheable
+    assert list((cache_dir / "validation").glob("*.json")) == []
+
+
+def test_init_worker_offline(monkeypatch):
+    # Workers started via spawn or forkserver don't inherit the offline mode
+    monkeypatch.setattr(util, "offline", False)
+    ValidateData._init_worker({}, {}, [], True)
+    assert util.offline
+    monkeypatch.setattr(util, "offline", False)
+    geojson_validation._init_worker({}, True)
+    assert util.offline
@@ -1,6 +1,9 @@
+import pytest
 from jsonschema.exceptions import ValidationError
 
+from vecorel_cli import validate_schema
 from vecorel_cli.validate_schema import ValidateSchema
+from vecorel_cli.vecorel.cache import LRUCache
 
 
 def test_validate_schema_valid():
@@ -20,3 +23,29 @@ def test_validate_schema_invalid():
     error = result[0]
     assert isinstance(error, ValidationError)
     assert error.message.startswith("'STRING' is not one of [")
+
+
+def test_validator_cache():
+    schema = {"$schema": "https://json-schema.org/draft/2020-12/schema", "type": "object"}
+    cmd = ValidateSchema()
+    validator = cmd.create_validator(schema)
+    assert cmd.create_validator(dict(schema)) is validator
+    assert ValidateSchema(dict(schema)).validator is validator
+    assert cmd.create_validator({**schema, "type": "array"}) is not validator
+
+
+def test_schema_caches_are_bounded(monkeypatch):
+    monkeypatch.setattr(validate_schema, "validator_cache", LRUCache(max_size=1))
+    schema = {"$schema": "https://json-schema.org/draft/2020-12/schema", "type": "object"}
+    cmd = ValidateSchema()
+    validator = cmd.create_validator(schema)
+    cmd.create_validator({**schema, "type": "array"})
+    # The least recently used validator has been evicted
+    assert len(validate_schema.validator_cache) == 1
+    assert cmd.create_validator(schema) is not validator
+
+    # Referenced schemas are read-only, e.g. when passed to worker processes
+    uri = "https://example.com/schema.json"
+    monkeypatch.setitem(validate_schema.resource_cache, uri, {"type": "object"})
+    with pytest.raises(TypeError):
+        validate_schema.resource_cache[uri]["type"] = "array"
@@ -0,0 +1,176 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+from shapely.geometry import Point, Polygon
+
+from vecorel_cli.validation.data import ColumnValidator, validate_column
+
+
+def test_string():
+    rules = {
+        "type": "string",
+        "minLength": 2,
+        "maxLength": 3,
+        "pattern": "^[a-z]+",
+        "enum": ["ab", "abc", "x"],
+    }
+    data = pd.Series(["ab", "abc", "abcd", None, "x", "AB"])
+    assert validate_column(data, rules) == [
+        "String 'x' is shorter than the minimum length of 2. Invalid in 1 row: 4",
+        "String 'abcd' is longer than the maximum length of 3. Invalid in 1 row: 2",
+        "String 'AB' does not match the required pattern: ^[a-z]+. Invalid in 1 row: 5",
+        "String 'abcd' is not one of the allowed values in the enumeration: ab, abc, x Invalid in 2 rows: 2, 5",
+    ]
+
+
+@pytest.mark.parametrize(
+    "fmt,valid,invalid",
+    [
+        ("email", "a@b.de", "a.de"),
+        ("uri", "https://vecorel.org", "vecorel.org"),
+        ("uuid", "123e4567-e89b-12d3-a456-426614174000", "123e4567"),
+    ],
+)
+def test_string_format(fmt, valid, invalid):
+    rules = {"type": "string", "format": fmt}
+    assert validate_column(pd.Series([valid, None]), rules) == []
+    issues = validate_column(pd.Series([valid, invalid]), rules)
+    assert len(issues) == 1
+    assert issues[0].startswith(f"String '{invalid}' is not a valid")
+
+
+def test_pattern_fallback():
+    # Lookaheads are not supported by Arrow, falls back to Python
+    rules = {"type": "string", "pattern": "^(?!x)"}
+    assert validate_column(pd.Series(["a", "xa", "b"]), rules) == [
+        "String 'xa' does not match the required pattern: ^(?!x). Invalid in 1 row: 1"
+    ]
+
+
+def test_numerical():
+    rules = {"type": "int32", "minimum": 0, "exclusiveMaximum": 10, "enum": [0, 5, 10]}
+    data = pd.Series([0, 5, -1, 10, pd.NA], dtype="Int32")
+    assert validate_column(data, rules) == [
+        "Value -1 is less than the minimum allowed value of 0. Invalid in 1 row: 2",
+        "Value 10 is greater than or equal to the exclusive maximum value of 10. Invalid in 1 row: 3",
+        "Integer '-1' is not one of the allowed values in the enumeration: 0, 5, 10 Invalid in 1 row: 2",
+    ]
+
+
+def test_enum_type_mismatch():
+    # Enum values that don't fit the data type are reported as invalid values
+    rules = {"type": "int32", "enum": ["a", "b"]}
+    data = pd.Series([1, 2, pd.NA], dtype="Int32")
+    assert validate_column(data, rules) == [
+        "Integer '1' is not one of the allowed values in the enumeration: a, b Invalid in 2 rows: 0, 1",
+    ]
+    rules = {"type": "int8", "enum": [1, 1.5, 300, "a"]}
+    data = pd.Series([1, 2], dtype="Int8")
+    assert validate_column(data, rules) == [
+        "Integer '2' is not one of the allowed values in the enumeration: 1, 1.5, 300, a Invalid in 1 row: 1",
+    ]
+    rules = {"type": "string", "enum": ["a", 1]}
+    assert validate_column(pd.Series(["a", "b"]), rules) == [
+        "String 'b' is not one of the allowed values in the enumeration: a, 1 Invalid in 1 row: 1",
+    ]
+
+
+def test_type():
+    rules = {"type": "string", "maxLength": 1}
+    assert validate_column(pd.Series(["a", 1, "abc"]), rules) == [
+        "Value '1' is not of type string, is <class 'int'> Invalid in 1 row: 1"
+    ]
+    assert validate_column(pd.Series([1.5, 2.0]), rules) == [
+        "Value '1.5' is not of type string, is double Invalid in 2 rows: 0, 1"
+    ]
+    # The index doesn't start at 0, rows are reported by index
+    assert validate_column(pd.Series(["a", 1, "b"], index=[10, 11, 12]), rules) == [
+        "Value '1' is not of type string, is <class 'int'> Invalid in 1 row: 11"
+    ]
+
+
+def test_array():
+    rules = {
+        "type": "array",
+        "minItems": 1,
+        "maxItems": 2,
+        "uniqueItems": True,
+        "items": {"type": "int32"},
+    }
+    data = pd.Series(
+        [np.array([1, 2]), np.array([], dtype=int), np.array([1, 1]), None, np.array([1, 2, 3])]
+    )
+    assert validate_column(data, rules) == [
+        "Array has fewer items than the minimum of 1. Invalid in 1 row: 1",
+        "Array has more items than the maximum of 2. Invalid in 1 row: 4",
+        "Array items are not unique. Invalid in 1 row: 2",
+    ]
+
+
+def test_object():
+    rules = {"type": "object", "maxProperties": 1, "properties": {"a": {}, "b": {}}}
+    struct = pa.array([{"a": 1}, None])
+    assert validate_column(struct, rules) == [
+        "Key 'b' is missing from the object. Invalid in 1 row: 0",
+    ]
+    maps = pa.array([[("a", 1), ("b", 2)], [("a", 1)], None], type=pa.map_(pa.string(), pa.int64()))
+    assert validate_column(maps, rules) == [
+        "Object has more properties than the maximum of 1. Invalid in 1 row: 0",
+        "Key 'b' is missing from the object. Invalid in 1 row: 1",
+    ]
+    # Null rows don't shift the row numbers
+    struct = pa.array([None, {"a": 1}, {"a": 2}])
+    assert validate_column(struct, {"type": "object", "minProperties": 2}) == [
+        "Object has fewer properties than the minimum of 2. Invalid in 2 rows: 1, 2",
+    ]
+
+
+def test_bbox():
+    rules = {"type": "bounding-box"}
+    data = pd.Series(
+        [{"xmin": 0, "ymin": 0, "xmax": 1, "ymax": 1}, {"xmin": 2, "ymin": 0, "xmax": 1, "ymax": 1}]
+    )
+    assert validate_column(data, rules) == [
+        "Bounding box has xmin value greater than xmax value: 2 > 1 Invalid in 1 row: 1"
+    ]
+
+
+def test_geometry():
+    rules = {"type": "geometry", "geometryTypes": ["Polygon"]}
+    bowtie = Polygon([(0, 0), (1, 1), (1, 0), (0, 1), (0, 0)])
+    issues = validate_column(pd.Series([Point(0, 0), bowtie, None]), rules)
+    assert (
+        issues[0]
+        == "Geometry type 'Point' is not one of the allowed types: Polygon Invalid in 1 row: 0"
+    )
+    assert issues[1].startswith(
+        "Geometry POLYGON ((0 0, 1 1, 1 0, 0 1, 0 0)) is not valid: Self-intersection"
+    )
+    assert issues[1].endswith("Invalid in 1 row: 1")
+
+
+def test_batches():
+    validator = ColumnValidator({"type": "int64", "maximum": 0}, num_examples=3)
+    validator.update(pa.array([1, 0, 2]))
+    validator.update(pa.array([0, 3, 4]), offset=3)
+    assert validator.get_issues() == [
+        "Value 1 is greater than the maximum allowed value of 0. Invalid in 4 rows: 0, 2, 4, ..."
+    ]
+
+
+def test_geometry_reasons(monkeypatch):
+    monkeypatch.setattr("vecorel_cli.validation.data.GEOMETRY_CHUNK_SIZE", 2)
+    bowtie = Polygon([(0, 0), (1, 1), (1, 0), (0, 1), (0, 0)])
+    bowtie2 = Polygon([(0, 0), (2, 2), (2, 0), (0, 2), (0, 0)])
+    hole = Polygon(
+        [(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)], [[(2, 2), (3, 2), (3, 3), (2, 3), (2, 2)]]
+    )
+    square = Polygon([(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)])
+    data = pd.Series([square, bowtie, None, hole, bowtie2])
+    issues = validate_column(data, {"type": "geometry"})
+    assert len(issues) == 2
+    assert issues[0].endswith("Invalid in 2 rows: 1, 4")
+    assert "Self-intersection" in issues[0]
+    assert "Hole lies outside shell" in issues[1]
+    assert issues[1].endswith("Invalid in 1 row: 3")
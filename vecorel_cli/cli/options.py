@@ -2,6 +2,7 @@ import click
 
 from ..const import COMPRESSION_METHODS, GEOPARQUET_DEFAULT_VERSION, GEOPARQUET_VERSIONS
 from ..registry import Registry
+from ..vecorel import util
 from .path_url import PathOrURL
 from .util import valid_schemas_for_cli
 
@@ -24,6 +25,39 @@ JSON_INDENT = click.option(
     default=None,
 )
 
+JSON_PRECISION = click.option(
+    "--precision",
+    type=click.IntRange(min=0, max=15),
+    help="GeoJSON only: Number of decimal places for coordinates, e.g. 7 for ~1cm. Defaults to full precision.",
+    default=None,
+)
+
+
+JOBS = click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    help="Number of worker processes to run in parallel.",
+    show_default=True,
+    default=1,
+)
+
+
+def _set_offline(ctx, param, value):
+    if value:
+        util.offline = True
+
+
+OFFLINE = click.option(
+    "--offline",
+    is_flag=True,
+    type=click.BOOL,
+    expose_value=False,
+    callback=_set_offline,
+    help="Don't access the network, remote schemas are only loaded from the cache. Can also be enabled with the environment variable VECOREL_OFFLINE=1.",
+    default=False,
+)
+
 
 GEOPARQUET_COMPRESSION = click.option(
     "--compression",
@@ -58,7 +92,7 @@ SCHEMA_MAP = click.option(
     "-s",
     multiple=True,
     callback=lambda ctx, param, value: valid_schemas_for_cli(value),
-    help=f"Maps a {Registry.project} schema URL to a local file. First the URL, then the local file path. Separated with a comma. Example: https://example.com/schema.yaml,/path/to/schema.yaml",
+    help=f"Maps a {Registry.project} schema URL to a local file. First the URL, then the local file path. Separated with a comma. Example: https://example.com/schema.yaml,/path/to/schema.yaml. Alternatively, a JSON file with a schema map, e.g. created by prefetch-schemas.",
 )
 
 PROPERTIES = click.option(
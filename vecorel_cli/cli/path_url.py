@@ -66,7 +66,8 @@ class PathOrURL(click.ParamType):
         return filepath
 
     def _check_extension(self, filepath: pathlib.Path) -> bool:
-        return len(self.extensions) == 0 or filepath.suffix.lower() in self.extensions
+        name = filepath.name.lower()
+        return len(self.extensions) == 0 or any(name.endswith(ext) for ext in self.extensions)
 
     def shell_complete(self, ctx, param, incomplete):
         if "://" in incomplete:
@@ -4,7 +4,7 @@ from typing import Optional
 import click
 import pandas as pd
 
-from ..vecorel.util import is_url, name_from_uri
+from ..vecorel.util import add_mirrored_files, is_url, load_schema_map, name_from_uri
 
 
 def parse_converter_input_files(ctx, param, value):
@@ -46,6 +46,10 @@ def parse_map(value: tuple[str], separator: str = "=") -> dict[str, str]:
 def valid_schemas_for_cli(value: tuple[str]) -> dict[str, Path]:
     map_ = {}
     for v in value:
+        if "," not in v and v.endswith(".json"):
+            map_.update(load_schema_map_for_cli(Path(v)))
+            continue
+
         part = v.split(",", 2)
 
         if len(part) != 2:
@@ -61,9 +65,22 @@ def valid_schemas_for_cli(value: tuple[str]) -> dict[str, Path]:
 
         map_[part[0]] = p
 
+    # Use the local files also for the schemas that are not loaded through the schema map
+    add_mirrored_files(map_)
     return map_
 
 
+def load_schema_map_for_cli(path: Path) -> dict[str, Path]:
+    """
+    Load a schema map file (e.g. created by prefetch-schemas), which maps URLs to file paths.
+    Relative paths are resolved against the folder of the schema map.
+    """
+    try:
+        return load_schema_map(path)
+    except (OSError, ValueError) as e:
+        raise click.BadParameter(f"Schema map '{path}' can't be loaded: {e}")
+
+
 def display_pandas_unrestricted(max_colwidth: Optional[int] = 50):
     pd.set_option("display.max_columns", None)
     pd.set_option("display.max_rows", None)
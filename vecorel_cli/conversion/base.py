@@ -4,10 +4,14 @@ import hashlib
 import inspect
 import json
 import os
+import shutil
 import sys
 import tarfile
+import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from copy import copy
+from fnmatch import fnmatchcase
 from glob import glob
 from io import StringIO
 from tempfile import TemporaryDirectory
@@ -19,16 +23,24 @@ import pandas as pd
 import py7zr
 import rarfile
 from fsspec import AbstractFileSystem
+from fsspec.implementations.http import HTTPFileSystem
 from fsspec.implementations.local import LocalFileSystem
 from geopandas import GeoDataFrame
 
 from ..cli.logger import LoggerMixin
 from ..cli.util import display_pandas_unrestricted
 from ..encoding.geoparquet import GeoParquet
+from ..vecorel import util
 from ..vecorel.collection import Collection
 from ..vecorel.schemas import Schemas
 from ..vecorel.typing import Sources
-from ..vecorel.util import get_fs, name_from_uri, stream_file
+from ..vecorel.util import (
+    format_filesize,
+    get_download_semaphore,
+    get_file_version,
+    get_fs,
+    name_from_uri,
+)
 from .flatdict import FlatDict
 
 
@@ -48,6 +60,15 @@ class BaseConverter(LoggerMixin):
     data_access: str = ""
     open_options: dict = {}
     avoid_range_request: bool = False
+    # Maximum number of files that are downloaded in parallel
+    max_downloads: int = 4
+    # Number of bytes that are read and written at once when downloading files
+    chunk_size: int = 10 * 1024 * 1024
+    # Read the files from ZIP and TAR archives via GDAL's virtual file systems
+    # (/vsizip/, /vsitar/) instead of extracting them
+    virtual_archives: bool = False
+    # Files with these extensions are not read through GDAL and are always extracted
+    non_gdal_extensions: tuple[str, ...] = (".parquet", ".geoparquet", ".json", ".geojson")
     variants: dict[str, Sources] = {}
     variant: Optional[str] = None
 
@@ -100,14 +121,26 @@ class BaseConverter(LoggerMixin):
         return cache_fs, cache_folder
 
     def download_files(self, uris, cache_folder=None, **kwargs):
-        """Download (and cache) files from various sources"""
+        """
+        Download (and cache) files from various sources.
+
+        The files are downloaded in parallel, see max_downloads.
+        Files that exist in the cache folder are revalidated and only downloaded again
+        if the source has changed, see download_file.
+        Only the listed files are extracted from archives, multiple archives are extracted
+        in parallel. Alternatively, the files are read directly from the archives,
+        see virtual_archives.
+        """
         if isinstance(uris, str):
             uris = {uris: name_from_uri(uris)}
 
         if self.avoid_range_request and "block_size" not in kwargs:
             kwargs["block_size"] = 0
 
-        paths = []
+        cache_fs, cache_folder = self.get_cache(cache_folder)
+
+        entries = []
+        downloads = {}
         for uri, target in uris.items():
             is_archive = isinstance(target, list)
             if is_archive:
@@ -119,54 +152,428 @@ class BaseConverter(LoggerMixin):
                 name = target
 
             source_fs = get_fs(uri, **kwargs)
-            cache_fs, cache_folder = self.get_cache(cache_folder)
-
-            if isinstance(source_fs, LocalFileSystem):
+            is_local = isinstance(source_fs, LocalFileSystem)
+            if is_local:
                 cache_file = uri
             else:
                 cache_file = os.path.join(cache_folder, name)
 
             zip_folder = os.path.join(cache_folder, "extracted." + os.path.splitext(name)[0])
-            must_extract = is_archive and not os.path.exists(zip_folder)
-
-            if (not is_archive or must_extract) and not cache_fs.exists(cache_file):
-                with cache_fs.open(cache_file, mode="wb") as file:
-                    stream_file(source_fs, uri, file)
-
-            if must_extract:
-                if zipfile.is_zipfile(cache_file):
-                    try:
-                        with zipfile.ZipFile(cache_file, "r") as zip_file:
-                            zip_file.extractall(zip_folder)
-                    except NotImplementedError as e:
-                        if str(e) != "That compression method is not supported":
-                            raise e
-                        import zipfile_deflate64
-
-                        with zipfile_deflate64.ZipFile(cache_file, "r") as zip_file:
-                            zip_file.extractall(zip_folder)
-                elif py7zr.is_7zfile(cache_file):
-                    with py7zr.SevenZipFile(cache_file, "r") as sz_file:
-                        sz_file.extractall(zip_folder)
-                elif rarfile.is_rarfile(cache_file):
-                    with rarfile.RarFile(cache_file, "r") as w:
-                        w.extractall(zip_folder)
-                elif tarfile.is_tarfile(cache_file):
-                    with tarfile.open(cache_file, "r") as w:
-                        w.extractall(zip_folder)
-                else:
-                    raise ValueError(
-                        f"Only ZIP and 7Z files are supported for extraction, fails for: {cache_file}"
-                    )
+            needs_archive = is_archive and (
+                self.virtual_archives or not self.is_extracted(zip_folder, target)
+            )
 
-            if is_archive:
-                for filename in target:
-                    paths.append((os.path.join(zip_folder, filename), uri))
-            else:
+            # Download missing files, revalidate cached files
+            if not is_local and cache_file not in downloads:
+                if not is_archive or needs_archive or cache_fs.exists(cache_file):
+                    downloads[cache_file] = (source_fs, uri)
+
+            entries.append((uri, target, cache_file, zip_folder))
+
+        downloaded = self.download(downloads, cache_fs)
+
+        paths = []
+        archives = {}
+        for uri, target, cache_file, zip_folder in entries:
+            if not isinstance(target, list):
                 paths.append((cache_file, uri))
+                continue
+
+            if self.virtual_archives:
+                virtual_paths = self.get_virtual_paths(cache_file, target)
+                if virtual_paths is not None:
+                    paths.extend((path, uri) for path in virtual_paths)
+                    continue
+
+            if cache_file in downloaded and cache_file not in archives:
+                shutil.rmtree(zip_folder, ignore_errors=True)
+            if cache_file in downloaded or not self.is_extracted(zip_folder, target):
+                members = archives.get(cache_file, (zip_folder, []))[1]
+                archives[cache_file] = (zip_folder, members + target)
+
+            for filename in target:
+                paths.append((os.path.join(zip_folder, filename), uri))
+
+        self.extract_archives(archives)
+
+        return paths
 
+    def download(
+        self,
+        downloads: dict[str, tuple[AbstractFileSystem, str]],
+        cache_fs: AbstractFileSystem,
+    ) -> set[str]:
+        """
+        Download the files in parallel threads.
+
+        downloads maps the target files in the cache to the source filesystem and URI.
+        Returns the target files that have been downloaded, i.e. were missing or outdated.
+        """
+        total = len(downloads)
+        if total == 0:
+            return set()
+
+        self.info(f"Downloading {total} file(s) if not cached yet")
+        downloaded = set()
+        workers = max(1, min(self.max_downloads, total))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.download_file, source_fs, uri, cache_fs, cache_file): (
+                    cache_file,
+                    uri,
+                )
+                for cache_file, (source_fs, uri) in downloads.items()
+            }
+            try:
+                for i, future in enumerate(as_completed(futures), start=1):
+                    cache_file, uri = futures[future]
+                    size = future.result()
+                    if size is None:
+                        self.info(f"{i}/{total}: {uri} is up-to-date")
+                    else:
+                        downloaded.add(cache_file)
+                        self.info(f"Downloaded {i}/{total}: {uri} ({format_filesize(size)})")
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        return downloaded
+
+    def download_file(
+        self,
+        source_fs: AbstractFileSystem,
+        uri: str,
+        cache_fs: AbstractFileSystem,
+        cache_file: str,
+    ) -> Optional[int]:
+        """
+        Download a file into the cache with at most max_downloads_per_host concurrent downloads per host.
+
+        The file is written to a temporary file (.part) and moved into place once it is complete.
+        The size, version (ETag or modification time) and SHA-256 checksum of the file are stored
+        in a sidecar file (.json). Cached files are only downloaded again if the source has changed
+        (a HEAD request for HTTP) or the cached file is incomplete.
+        Failed downloads are retried with an exponential backoff and resumed if possible,
+        missing files are not retried.
+
+        Returns the size of the downloaded file or None if the cached file is up-to-date.
+        """
+        for attempt in range(util.request_retries + 1):
+            try:
+                with get_download_semaphore(uri):
+                    source = self.get_source_info(source_fs, uri)
+                    if cache_fs.exists(cache_file) and not self.is_outdated(
+                        cache_fs, cache_file, source
+                    ):
+                        return None
+                    return self._download(source_fs, uri, cache_fs, cache_file, source)
+            except (FileNotFoundError, PermissionError):
+                raise
+            except Exception as e:
+                if attempt == util.request_retries:
+                    raise
+                self.warning(f"Downloading {uri} failed, retrying: {e}")
+            time.sleep(0.5 * 2**attempt)
+
+    def _download(
+        self,
+        source_fs: AbstractFileSystem,
+        uri: str,
+        cache_fs: AbstractFileSystem,
+        cache_file: str,
+        source: dict,
+    ) -> int:
+        part_file = cache_file + ".part"
+        checksum = hashlib.sha256()
+        offset = 0
+
+        # Resume an incomplete download of the same version of the file
+        can_resume = isinstance(cache_fs, LocalFileSystem) and not self.avoid_range_request
+        if (
+            can_resume
+            and source.get("version") is not None
+            and self.read_sidecar(cache_fs, part_file) == source
+            and cache_fs.exists(part_file)
+        ):
+            with cache_fs.open(part_file, mode="rb") as f:
+                for chunk in iter(lambda: f.read(self.chunk_size), b""):
+                    checksum.update(chunk)
+                    offset += len(chunk)
+        else:
+            self.write_sidecar(cache_fs, part_file, source)
+
+        src, start = self.open_source(source_fs, uri, offset)
+        with src:
+            if start != offset:
+                checksum = hashlib.sha256()
+            size = start
+            with cache_fs.open(part_file, mode="ab" if start > 0 else "wb") as dst:
+                for chunk in iter(lambda: src.read(self.chunk_size), b""):
+                    dst.write(chunk)
+                    checksum.update(chunk)
+                    size += len(chunk)
+
+        expected = source.get("size")
+        if expected is not None and size != expected:
+            if size > expected:
+                cache_fs.rm(part_file)
+            raise OSError(f"Incomplete download, expected {expected} bytes but got {size} bytes")
+
+        if cache_fs.exists(cache_file):
+            cache_fs.rm(cache_file)
+        cache_fs.mv(part_file, cache_file)
+        meta = {**source, "uri": uri, "size": size, "sha256": checksum.hexdigest()}
+        self.write_sidecar(cache_fs, cache_file, meta)
+        cache_fs.rm(self.get_sidecar_path(part_file))
+        return size
+
+    def open_source(self, source_fs: AbstractFileSystem, uri: str, offset: int = 0):
+        """
+        Open a source file for streaming, if possible starting at the given offset
+        (e.g. via an HTTP Range request).
+
+        Returns the file and the offset it starts at, which is 0 if the source can't be read from the offset.
+        """
+        if offset > 0 and isinstance(source_fs, HTTPFileSystem):
+            headers = {**source_fs.kwargs.get("headers", {}), "Range": f"bytes={offset}-"}
+            file = source_fs.open(uri, mode="rb", block_size=0, headers=headers)
+            # Servers that don't support Range requests send the whole file
+            if getattr(getattr(file, "r", None), "status", None) == 206:
+                return file, offset
+            return file, 0
+        elif offset > 0:
+            file = source_fs.open(uri, mode="rb")
+            try:
+                file.seek(offset)
+                return file, offset
+            except (OSError, ValueError):
+                file.close()
+
+        return source_fs.open(uri, mode="rb", block_size=0), 0
+
+    @staticmethod
+    def get_source_info(source_fs: AbstractFileSystem, uri: str) -> dict:
+        """
+        Get the size and version (ETag or modification time) of a source file.
+
+        Returns empty values if the information is not available, e.g. in offline mode.
+        """
+        info = {}
+        if not util.offline:
+            try:
+                info = source_fs.info(uri)
+            except Exception:
+                pass
+        return {"size": info.get("size"), "version": get_file_version(info)}
+
+    def is_outdated(self, cache_fs: AbstractFileSystem, cache_file: str, source: dict) -> bool:
+        """
+        Check whether a cached file is incomplete or differs from the source.
+        """
+        size = cache_fs.size(cache_file)
+        meta = self.read_sidecar(cache_fs, cache_file)
+        if meta is None:
+            # The file was cached without metadata, compare the size only
+            return source["size"] is not None and size != source["size"]
+        elif size != meta.get("size"):
+            return True
+
+        for key in ("size", "version"):
+            if source[key] is not None and source[key] != meta.get(key):
+                return True
+        return False
+
+    @staticmethod
+    def get_sidecar_path(path: str) -> str:
+        return path + ".json"
+
+    def read_sidecar(self, cache_fs: AbstractFileSystem, path: str) -> Optional[dict]:
+        try:
+            with cache_fs.open(self.get_sidecar_path(path), mode="rb") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def write_sidecar(self, cache_fs: AbstractFileSystem, path: str, meta: dict):
+        cache_fs.pipe_file(self.get_sidecar_path(path), json.dumps(meta).encode("utf-8"))
+
+    @staticmethod
+    def is_extracted(zip_folder: str, target: list[str]) -> bool:
+        if not os.path.exists(zip_folder):
+            return False
+        return all(glob(os.path.join(zip_folder, filename), recursive=True) for filename in target)
+
+    def extract_archives(self, archives: dict[str, tuple[str, list[str]]]):
+        """
+        Extract the archives in parallel threads.
+
+        archives maps the archive files to the target folder and the files to extract.
+        """
+        if len(archives) == 0:
+            return
+
+        def extract(item):
+            cache_file, (zip_folder, members) = item
+            self.info(f"Extracting {cache_file}")
+            self.extract_archive(cache_file, zip_folder, members)
+
+        workers = max(1, min(len(archives), os.cpu_count() or 1))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(extract, archives.items()))
+
+    def extract_archive(
+        self, cache_file: str, zip_folder: str, members: Optional[list[str]] = None
+    ):
+        """
+        Extract the given files (which can be glob patterns) from an archive into a folder.
+
+        Files that belong to the selected files are extracted as well, e.g. the .dbf and .prj
+        files of a Shapefile or the contents of a folder. Extracts all files if no files are given.
+        The files are extracted into a temporary folder first and then moved into the folder,
+        so that interrupted extractions are not mistaken for complete files.
+        """
+        parent = os.path.dirname(zip_folder) or "."
+        with TemporaryDirectory(dir=parent, prefix=".extracting.") as tmp_folder:
+            self._extract(cache_file, tmp_folder, members)
+            for root, _, files in os.walk(tmp_folder):
+                folder = os.path.normpath(
+                    os.path.join(zip_folder, os.path.relpath(root, tmp_folder))
+                )
+                os.makedirs(folder, exist_ok=True)
+                for file in files:
+                    os.replace(os.path.join(root, file), os.path.join(folder, file))
+
+    def _extract(self, cache_file: str, folder: str, members: Optional[list[str]] = None):
+        if zipfile.is_zipfile(cache_file):
+            try:
+                with zipfile.ZipFile(cache_file, "r") as zip_file:
+                    selected = self.select_members(zip_file.namelist(), members)
+                    zip_file.extractall(folder, members=selected)
+            except NotImplementedError as e:
+                if str(e) != "That compression method is not supported":
+                    raise e
+                import zipfile_deflate64
+
+                with zipfile_deflate64.ZipFile(cache_file, "r") as zip_file:
+                    selected = self.select_members(zip_file.namelist(), members)
+                    zip_file.extractall(folder, members=selected)
+        elif py7zr.is_7zfile(cache_file):
+            with py7zr.SevenZipFile(cache_file, "r") as sz_file:
+                selected = self.select_members(sz_file.getnames(), members)
+                if selected is None:
+                    sz_file.extractall(folder)
+                else:
+                    sz_file.extract(folder, targets=selected)
+        elif rarfile.is_rarfile(cache_file):
+            with rarfile.RarFile(cache_file, "r") as w:
+                w.extractall(folder, members=self.select_members(w.namelist(), members))
+        elif tarfile.is_tarfile(cache_file):
+            with tarfile.open(cache_file, "r") as w:
+                selected = self.select_members(w.getnames(), members)
+                if selected is not None:
+                    selected = set(selected)
+                    w.extractall(folder, members=[m for m in w.getmembers() if m.name in selected])
+                else:
+                    w.extractall(folder)
+        else:
+            raise ValueError(
+                f"Only ZIP and 7Z files are supported for extraction, fails for: {cache_file}"
+            )
+
+    def select_members(
+        self, names: list[str], patterns: Optional[list[str]] = None
+    ) -> Optional[list[str]]:
+        """
+        Select the files in an archive that match the patterns and the files that belong to them.
+
+        Returns None if no patterns are given, i.e. all files should be selected.
+        """
+        if not patterns:
+            return None
+
+        files = [name for name in names if not name.endswith("/")]
+        candidates = self.get_member_paths(files)
+        matched = set()
+        for pattern in patterns:
+            matched.update(self.match_members(candidates, pattern))
+
+        stems = {os.path.splitext(path)[0] for path in matched}
+        folders = tuple(path + "/" for path in matched)
+        return [
+            name
+            for name in files
+            if name in matched or os.path.splitext(name)[0] in stems or name.startswith(folders)
+        ]
+
+    @staticmethod
+    def get_member_paths(names: list[str]) -> list[str]:
+        """
+        Get the files and the (implicit) folders in an archive.
+        """
+        paths = set()
+        for name in names:
+            parts = name.rstrip("/").split("/")
+            for i in range(1, len(parts) + 1):
+                paths.add("/".join(parts[:i]))
+        return sorted(paths)
+
+    @staticmethod
+    def match_members(paths: list[str], pattern: str) -> list[str]:
+        """
+        Match paths in an archive against a glob pattern with the same rules as glob(recursive=True):
+        * and ? match within a folder, ** matches any number of folders (including none).
+        """
+        pattern_parts = pattern.replace("\\", "/").strip("/").split("/")
+
+        def match(parts: list[str], pattern_parts: list[str]) -> bool:
+            if len(pattern_parts) == 0:
+                return len(parts) == 0
+            head, rest = pattern_parts[0], pattern_parts[1:]
+            if head == "**":
+                return any(match(parts[i:], rest) for i in range(len(parts) + 1))
+            return len(parts) > 0 and fnmatchcase(parts[0], head) and match(parts[1:], rest)
+
+        return [path for path in paths if match(path.split("/"), pattern_parts)]
+
+    def get_virtual_paths(self, cache_file: str, target: list[str]) -> Optional[list[str]]:
+        """
+        Get the GDAL virtual file system paths (/vsizip/, /vsitar/) for the files in an archive.
+
+        Returns None if the files can't be read directly from the archive, e.g. for 7Z and RAR archives
+        or GeoParquet and GeoJSON files, which are not read through GDAL.
+        """
+        if any(name.endswith(self.non_gdal_extensions) for name in target):
+            return None
+        elif zipfile.is_zipfile(cache_file):
+            prefix = "/vsizip/"
+        elif tarfile.is_tarfile(cache_file):
+            prefix = "/vsitar/"
+        else:
+            return None
+
+        names = None
+        paths = []
+        for filename in target:
+            if "*" in filename:
+                if names is None:
+                    names = self.get_member_paths(self.list_archive(cache_file))
+                matches = self.match_members(names, filename)
+                if len(matches) != 1:
+                    raise ValueError(f"Can not match {filename} to a single file")
+                filename = matches[0]
+            paths.append(prefix + os.path.abspath(cache_file) + "/" + filename.lstrip("/"))
         return paths
 
+    @staticmethod
+    def list_archive(cache_file: str) -> list[str]:
+        if zipfile.is_zipfile(cache_file):
+            with zipfile.ZipFile(cache_file, "r") as zip_file:
+                return zip_file.namelist()
+        else:
+            with tarfile.open(cache_file, "r") as w:
+                return w.getnames()
+
     def get_urls(self):
         urls = self.sources
         if not urls and self.variants:
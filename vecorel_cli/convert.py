@@ -5,6 +5,7 @@ from .cli.options import (
     GEOPARQUET_COMPRESSION,
     GEOPARQUET_COMPRESSION_LEVEL,
     GEOPARQUET_VERSION,
+    OFFLINE,
     PY_PACKAGE,
     VECOREL_TARGET,
 )
@@ -85,6 +86,7 @@ class ConvertData(BaseCommand):
                 default=False,
             ),
             "py-package": PY_PACKAGE,
+            "offline": OFFLINE,
         }
 
     @staticmethod
@@ -5,7 +5,14 @@ import click
 from yarl import URL
 
 from .basecommand import BaseCommand, runnable
-from .cli.options import JSON_INDENT, PROPERTIES, VECOREL_FILE_ARG, VECOREL_TARGET
+from .cli.options import (
+    JOBS,
+    JSON_INDENT,
+    JSON_PRECISION,
+    PROPERTIES,
+    VECOREL_FILE_ARG,
+    VECOREL_TARGET,
+)
 from .encoding.auto import create_encoding
 from .encoding.geojson import GeoJSON
 
@@ -28,7 +35,7 @@ class CreateGeoJson(BaseCommand):
                 "-f",
                 is_flag=True,
                 type=click.BOOL,
-                help="Create seperate files with a GeoJSON Feature each instead of one file with a GeoJSON FeatureCollection.",
+                help="Create seperate files with a GeoJSON Feature each instead of one file with a GeoJSON FeatureCollection. If the target is a ZIP or tar file (e.g. .zip or .tar.gz), the files are written into the archive.",
                 default=False,
             ),
             "num": click.option(
@@ -39,6 +46,8 @@ class CreateGeoJson(BaseCommand):
                 default=None,
             ),
             "indent": JSON_INDENT,
+            "precision": JSON_PRECISION,
+            "jobs": JOBS,
         }
 
     @runnable
@@ -50,6 +59,8 @@ class CreateGeoJson(BaseCommand):
         split: bool = False,
         num: Optional[int] = None,
         indent: Optional[int] = None,
+        precision: Optional[int] = None,
+        jobs: int = 1,
     ):
         if isinstance(source, str):
             source = Path(source)
@@ -68,22 +79,17 @@ class CreateGeoJson(BaseCommand):
         # Write to target
         if split:
             # GeoJSON features
-            geodata.to_crs(epsg=4326, inplace=True)
-            i = 0
-            for obj in geodata.iterfeatures():
-                i += 1
-
-                obj = GeoJSON.fix_geo_interface(obj)
-                id_ = obj.get("id", i)
-                target_file = target / f"{id_}.json"
-
-                target_encoding = GeoJSON(target_file)
-                target_encoding.set_collection(collection)
-                target_encoding.write_feature(obj, properties=properties, indent=indent)
+            target_encoding = GeoJSON(target)
+            target_encoding.set_collection(collection)
+            target_encoding.write_features(
+                geodata, properties=properties, indent=indent, precision=precision, jobs=jobs
+            )
         else:
             # GeoJSON feature collection
             target_encoding = GeoJSON(target)
             target_encoding.set_collection(collection)
-            target_encoding.write(geodata, properties=properties, indent=indent)
+            target_encoding.write(
+                geodata, properties=properties, indent=indent, precision=precision
+            )
 
         return target
@@ -7,6 +7,7 @@ from .basecommand import BaseCommand, runnable
 from .cli.options import (
     GEOPARQUET_COMPRESSION,
     GEOPARQUET_VERSION,
+    OFFLINE,
     PROPERTIES,
     SCHEMA_MAP,
     VECOREL_FILES_ARG,
@@ -33,6 +34,7 @@ class CreateGeoParquet(BaseCommand):
             "compression": GEOPARQUET_COMPRESSION,
             "geoparquet_version": GEOPARQUET_VERSION,
             "schema_map": SCHEMA_MAP,
+            "offline": OFFLINE,
         }
 
     @runnable
@@ -1,4 +1,5 @@
-import copy
+import hashlib
+import json
 from pathlib import Path
 from typing import Optional, Union
 
@@ -6,14 +7,23 @@ import click
 from yarl import URL
 
 from .basecommand import BaseCommand, runnable
-from .cli.options import JSON_INDENT, VECOREL_TARGET_CONSOLE
+from .cli.options import JSON_INDENT, OFFLINE, VECOREL_TARGET_CONSOLE
 from .cli.path_url import PathOrURL
 from .encoding.geojson import GeoJSON
-from .jsonschema.template import jsonschema_template
+from .jsonschema.template import (
+    feature_jsonschema_template,
+    featurecollection_header_template,
+    jsonschema_template,
+)
+from .registry import Registry
+from .vecorel.cache import LRUCache
 from .vecorel.schemas import Schemas
-from .vecorel.util import load_file
+from .vecorel.util import get_cache_dir, load_file, write_file_atomic
 from .vecorel.version import vecorel_version
 
+# The generated JSON Schemas (read-only), keyed by a hash of the inputs
+jsonschema_cache = LRUCache()
+
 
 class CreateJsonSchema(BaseCommand):
     cmd_name = "jsonschema"
@@ -21,6 +31,9 @@ class CreateJsonSchema(BaseCommand):
     cmd_help: str = "Create a JSON Schema for a Vecorel Schema"
     cmd_final_report: bool = True
 
+    # Store the generated JSON Schemas in the cache directory, too
+    persistent_cache: bool = True
+
     @staticmethod
     def get_cli_args():
         return {
@@ -52,6 +65,7 @@ class CreateJsonSchema(BaseCommand):
                 default=None,
             ),
             "indent": JSON_INDENT,
+            "offline": OFFLINE,
         }
 
     @runnable
@@ -77,13 +91,87 @@ class CreateJsonSchema(BaseCommand):
         return self.create_from_dict(schema, datatypes, schema_id)
 
     def create_from_dict(self, schema: dict, datatypes: dict, schema_id=None):
-        required = schema.get("required", [])
-        collection = schema.get("collection", {})
+        """
+        Create the JSON Schema for a Vecorel schema.
+
+        The JSON Schemas are cached, the returned schema is read-only.
+        """
+
+        def create():
+            required = schema.get("required", [])
+            collection = schema.get("collection", {})
+            properties = self.convert_properties(schema, datatypes)
+            return jsonschema_template(properties, set(required), collection, schema_id)
+
+        return self._get_cached(create, "collection", schema, datatypes, schema_id)
+
+    def create_feature_schemas_from_dict(
+        self, schema: dict, datatypes: dict, collection_keys: set[str], schema_id=None
+    ) -> tuple[dict, dict]:
+        """
+        Create the JSON Schemas to validate a FeatureCollection feature by feature.
+
+        Returns a schema for the FeatureCollection without the features and
+        a schema for the individual features, which depends on the properties that
+        are present at the top-level of the FeatureCollection (collection_keys).
+        The JSON Schemas are cached, the returned schemas are read-only.
+        """
+
+        def create():
+            required = set(schema.get("required", []))
+            collection = schema.get("collection", {})
+            properties = self.convert_properties(schema, datatypes)
+            header = featurecollection_header_template(required, collection, schema_id)
+            feature = feature_jsonschema_template(
+                properties, required, collection, collection_keys, schema_id
+            )
+            return [header, feature]
+
+        keys = sorted(collection_keys)
+        header, feature = self._get_cached(create, "features", schema, datatypes, schema_id, keys)
+        return header, feature
+
+    @staticmethod
+    def get_cache_key(*parts) -> str:
+        """
+        Compute the cache key for the inputs of a JSON Schema, including the CLI version
+        as the templates may change between versions.
+        """
+        data = [Registry.get_version(), *parts]
+        encoded = json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _get_cached(self, create, *parts):
+        key = self.get_cache_key(*parts)
+        cached = jsonschema_cache.get(key)
+        if cached is not None:
+            return cached
+
+        path = get_cache_dir("jsonschema") / f"{key}.json"
+        data = None
+        if self.persistent_cache:
+            try:
+                data = json.loads(path.read_bytes())
+            except (OSError, ValueError):
+                pass
+
+        if data is None:
+            data = create()
+            if self.persistent_cache:
+                try:
+                    encoded = json.dumps(data).encode("utf-8")
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    write_file_atomic(path, encoded)
+                except (OSError, TypeError, ValueError):
+                    pass
+
+        return jsonschema_cache.set(key, data)
+
+    def convert_properties(self, schema: dict, datatypes: dict) -> dict:
         properties = schema.get("properties", {}).copy()
         for key, prop_schema in properties.items():
             properties[key] = self.convert_schema(prop_schema, datatypes)
-
-        return jsonschema_template(properties, set(required), collection, schema_id)
+        return properties
 
     def convert_schema(self, prop_schema, datatypes, required=False):
         if not isinstance(prop_schema, dict) or "type" not in prop_schema:
@@ -91,7 +179,8 @@ class CreateJsonSchema(BaseCommand):
         elif prop_schema["type"] not in datatypes:
             raise ValueError(f"Unknown datatype {prop_schema['type']}")
 
-        datatype_schema = copy.deepcopy(datatypes[prop_schema["type"]])
+        # A shallow copy is sufficient as nested objects are replaced instead of modified
+        datatype_schema = dict(datatypes[prop_schema["type"]])
 
         if prop_schema["type"] == "geometry":
             geom_types = prop_schema.get("geometryTypes", [])
@@ -101,7 +190,6 @@ class CreateJsonSchema(BaseCommand):
                         {"$ref": f"https://geojson.org/schema/{type}.json"} for type in geom_types
                     ]
                 }
-                prop_schema.pop("geometryTypes", None)
 
         # Avoid conflicting statements
         if "exclusiveMaximum" in prop_schema:
@@ -119,10 +207,14 @@ class CreateJsonSchema(BaseCommand):
                 schema = self.convert_schema(value, datatypes)
                 datatype_schema["items"] = {**datatype_schema.get("items", {}), **schema}
             elif key == "properties" and isinstance(value, dict):
-                if not isinstance(datatype_schema.get("properties"), dict):
-                    datatype_schema["properties"] = {}
-                if not isinstance(datatype_schema.get("required"), list):
-                    datatype_schema["required"] = []
+                properties = datatype_schema.get("properties")
+                datatype_schema["properties"] = (
+                    dict(properties) if isinstance(properties, dict) else {}
+                )
+                required_props = datatype_schema.get("required")
+                datatype_schema["required"] = (
+                    list(required_props) if isinstance(required_props, list) else []
+                )
                 for prop_name, prop_value in value.items():
                     required = key in value.get("required", [])
                     schema = self.convert_schema(prop_value, datatypes, required)
@@ -132,6 +224,9 @@ class CreateJsonSchema(BaseCommand):
                     }
                     if required:
                         datatype_schema["required"].append(prop_name)
+            elif key == "geometryTypes" and prop_schema["type"] == "geometry":
+                if not isinstance(value, list):
+                    datatype_schema[key] = value
             elif key not in ["type", "required"]:
                 datatype_schema[key] = value
 
@@ -76,12 +76,8 @@ class CreateStacCollection(BaseCommand):
         # Read source data
         source_encoding = create_encoding(source)
         properties = source_encoding.get_properties()
-        if properties is None:
-            data = source_encoding.read()
-        else:
-            property_names = properties.keys()
-            required_properties = property_names & {"geometry", temporal_property}
-            data = source_encoding.read(properties=list(required_properties))
+        # Only read the properties that are needed, properties that don't exist are ignored
+        data = source_encoding.read(properties=["geometry", temporal_property])
 
         collection = source_encoding.get_collection()
 
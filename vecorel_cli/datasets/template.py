@@ -29,6 +29,9 @@ class Converter(BaseConverter):
     # sources = {
     #   "https://vecorel.example/north_america.zip": ["us.gpkg", "canaga.gpkg"]
     # }
+    # Only the listed files are extracted, glob patterns such as "**/*.shp" are allowed.
+    # To read the files directly from ZIP or TAR archives via GDAL instead of extracting them:
+    # virtual_archives = True
 
     # 4. if multiple variants (e.g. years) are available, you can replace sources by the variants.
     # The dict-key can be used on the cli command line, the value will be used as 'sources'
@@ -14,13 +14,14 @@ def create_encoding(filepath: Union[Path, URL, str]) -> BaseEncoding:
     if isinstance(filepath, str):
         filepath = Path(filepath)
 
-    for encoding in Registry.get_encodings():
-        if isinstance(filepath, URL):
-            ext = Path(filepath.path).suffix
-        else:
-            ext = filepath.suffix
+    if isinstance(filepath, URL):
+        name = Path(filepath.path).name.lower()
+    else:
+        name = filepath.name.lower()
 
-        if ext in encoding.ext:
+    for encoding in Registry.get_encodings():
+        # Check the full name so that multi-part extensions (e.g. .json.gz) are detected
+        if any(name.endswith(ext) for ext in encoding.ext):
             return encoding(filepath)
 
     raise ValueError("Unsupported file type")
@@ -1,19 +1,25 @@
 import json
+import tarfile
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
 from pathlib import Path
-from typing import Optional, Union
+from typing import Iterator, Optional, Union
 
 import json_stream
 import numpy as np
 import pandas as pd
-from geopandas import GeoDataFrame
+import shapely
+from geopandas import GeoDataFrame, GeoSeries
 from pandas import DataFrame
-from shapely.geometry import shape
+from shapely.geometry import mapping, shape
 from yarl import URL
 
 from ..validation.base import Validator
 from ..vecorel.collection import Collection
 from ..vecorel.typing import Feature, FeatureCollection, SchemaMapping
-from ..vecorel.util import load_file, to_iso8601
+from ..vecorel.util import load_file, register_zstd_compression, to_iso8601
 from ..vecorel.version import vecorel_version
 from .base import BaseEncoding
 
@@ -22,9 +28,27 @@ class GeoJSON(BaseEncoding):
     feature_properties = {"type", "id", "geometry", "bbox", "properties"}
     feature_collection_properties = {"type", "features"}
     datatypes_schema_uri = "https://vecorel.org/specification/v{version}/geojson/datatypes.json"
-    ext = [".json", ".geojson"]
+    ext = [".json", ".geojson", ".json.gz", ".geojson.gz", ".json.zst", ".geojson.zst"]
+    # Compression methods (as named by fsspec) by file extension
+    compression_ext = {".gz": "gzip", ".zst": "zstd"}
+    archive_ext = {
+        ".zip": None,
+        ".tar": "w",
+        ".tar.gz": "w:gz",
+        ".tgz": "w:gz",
+        ".tar.bz2": "w:bz2",
+        ".tar.xz": "w:xz",
+    }
     media_type = "application/geo+json"
     crs = "EPSG:4326"
+    # Number of features that are serialized per task when writing separate Feature files
+    feature_chunk_size = 1000
+    # Number of bytes that are initially read from the end of the file to find the
+    # properties after the features, see read_header
+    trailer_chunk_size = 64 * 1024
+    # Maximum number of bytes that are read from the end of the file, the features are
+    # streamed through if the properties after the features are larger than this
+    trailer_max_size = 16 * 1024 * 1024
 
     def __init__(self, file: Union[Path, URL, str]):
         super().__init__(file)
@@ -43,11 +67,115 @@ class GeoJSON(BaseEncoding):
     def get_format(self) -> str:
         return "GeoJSON"
 
+    def get_compression(self) -> Optional[str]:
+        return GeoJSON.get_compression_for(self.uri)
+
+    @staticmethod
+    def get_compression_for(uri: Union[Path, URL, str]) -> Optional[str]:
+        """
+        Get the compression method for a file based on its file extension.
+        """
+        if isinstance(uri, URL):
+            uri = uri.path
+        return GeoJSON.compression_ext.get(Path(uri).suffix.lower())
+
+    def _open(self, mode: str = "r", uri: Optional[Union[Path, URL]] = None):
+        """
+        Open the file in text mode, (de)compressing transparently based on the file extension.
+        """
+        uri = self.uri if uri is None else uri
+        compression = GeoJSON.get_compression_for(uri)
+        if compression == "zstd" and not register_zstd_compression():
+            raise ValueError(
+                "zstd compressed files require Python 3.14 or the backports.zstd package"
+            )
+
+        return self.fs.open(str(uri), mode=mode, compression=compression, encoding="utf-8")
+
     def _load_collection(self) -> Union[Collection, dict]:
         if self.fs.exists(self.uri):
-            self.read(num=0)
+            return self.read_header()
         return self.collection or {}
 
+    def read_header(self) -> Collection:
+        """
+        Read the collection metadata (i.e. all non-GeoJSON properties at the top-level)
+        without reading the features.
+
+        The document is streamed from the start until the features are reached.
+        Properties after the features are read by scanning from the end of the file,
+        so that the features don't need to be parsed regardless of the order of the keys.
+        """
+        header = self.read_top_level()
+        is_feature = header.pop("type", None) == "Feature"
+        geojson_props = (
+            GeoJSON.feature_properties if is_feature else GeoJSON.feature_collection_properties
+        )
+        return Collection({k: v for k, v in header.items() if k not in geojson_props})
+
+    def read_top_level(self) -> dict:
+        """
+        Read all top-level properties of the GeoJSON object except for the features.
+
+        See read_header for details.
+        """
+        header = {}
+        with self._open() as f:
+            stream = json_stream.load(f)
+            if not isinstance(stream, json_stream.base.StreamingJSONObject):
+                raise ValueError("JSON file must contain a GeoJSON object")
+            for key, value in stream.items():
+                if key == "features":
+                    trailer = self._read_trailer()
+                    if trailer is not None:
+                        header.update(trailer)
+                        break
+                    # Fall back to streaming through the features, skipping them
+                    continue
+
+                header[key] = json_stream.to_standard_types(value)
+
+        return header
+
+    def iter_features(self, num: Optional[int] = None) -> Iterator[dict]:
+        """
+        Stream the (first num) features of a FeatureCollection one by one,
+        without loading the whole file into memory.
+        """
+        with self._open() as f:
+            stream = json_stream.load(f)
+            if not isinstance(stream, json_stream.base.StreamingJSONObject):
+                raise ValueError("JSON file must contain a GeoJSON object")
+            for key, value in stream.items():
+                if key != "features":
+                    continue
+                for index, feature in enumerate(value):
+                    if num is not None and index >= num:
+                        break
+                    yield json_stream.to_standard_types(feature)
+                break
+
+    def _read_trailer(self) -> Optional[dict]:
+        """
+        Read the top-level properties after the features by scanning from the end of the file.
+
+        Returns None if the trailer can't be read this way, e.g. for compressed files
+        or if the beginning of the features is not within trailer_max_size bytes.
+        """
+        if self.get_compression() is not None:
+            return None
+
+        size = self.fs.size(str(self.uri))
+        chunk_size = self.trailer_chunk_size
+        with self.fs.open(str(self.uri), mode="rb") as f:
+            while True:
+                offset = max(0, size - chunk_size)
+                f.seek(offset)
+                trailer = _parse_trailer(f.read())
+                if trailer is not None or offset == 0 or chunk_size >= self.trailer_max_size:
+                    return trailer
+                chunk_size = min(chunk_size * 4, self.trailer_max_size)
+
     def get_validator(self) -> Optional[Validator]:
         from ..validation.geojson import GeoJSONValidator
 
@@ -59,6 +187,8 @@ class GeoJSON(BaseEncoding):
 
     # indent: int, optional, default None
     #     If set, the JSON will be pretty-printed with the given indentation level.
+    # precision: int, optional, default None
+    #     If set, the coordinates will be rounded to the given number of decimal places.
     def write(
         self,
         data: GeoDataFrame,
@@ -66,6 +196,7 @@ class GeoJSON(BaseEncoding):
         schema_map: SchemaMapping = {},
         dehydrate: bool = True,
         indent: Optional[int] = None,
+        precision: Optional[int] = None,
         **kwargs,  # capture unknown arguments
     ) -> bool:
         self.uri.parent.mkdir(parents=True, exist_ok=True)
@@ -75,6 +206,8 @@ class GeoJSON(BaseEncoding):
 
         # We need to write GeoJSON in EPSG:4326
         data.to_crs(epsg=4326, inplace=True)
+        if precision is not None:
+            data.geometry = GeoJSON.round_coordinates(data.geometry, precision)
 
         # Convert to GeoJSON
         features = data.__geo_interface__["features"]
@@ -91,11 +224,14 @@ class GeoJSON(BaseEncoding):
 
     # indent: int, optional, default None
     #     If set, the JSON will be pretty-printed with the given indentation level.
+    # precision: int, optional, default None
+    #     If set, the coordinates will be rounded to the given number of decimal places.
     def write_feature(
         self,
         data: dict,
         properties: Optional[list[str]] = None,
         indent: Optional[int] = None,
+        precision: Optional[int] = None,
     ) -> bool:
         """
         Write a single GeoJSON feature to the file.
@@ -104,25 +240,152 @@ class GeoJSON(BaseEncoding):
         """
         self.uri.parent.mkdir(parents=True, exist_ok=True)
 
-        # If the input is originating from a __geo_interface__ object,
-        # it may not be in the correct format.
-        data = GeoJSON.fix_geo_interface(data)
+        if precision is not None and data.get("geometry"):
+            geometry = GeoJSON.round_coordinates(shape(data["geometry"]), precision)
+            data["geometry"] = mapping(geometry)
 
-        # Let's get all collection metadata into the feature itself
+        feature_props, top_level_props = self._split_collection()
+        data = GeoJSON.merge_collection_into_feature(
+            data, feature_props, top_level_props, properties=properties
+        )
+
+        return self._write_json(data, self.uri, indent=indent)
+
+    # indent: int, optional, default None
+    #     If set, the JSON will be pretty-printed with the given indentation level.
+    # precision: int, optional, default None
+    #     If set, the coordinates will be rounded to the given number of decimal places.
+    # jobs: int, optional, default 1
+    #     Number of worker processes to serialize the features with.
+    def write_features(
+        self,
+        data: GeoDataFrame,
+        properties: Optional[list[str]] = None,
+        indent: Optional[int] = None,
+        precision: Optional[int] = None,
+        jobs: int = 1,
+    ) -> bool:
+        """
+        Write each row of the GeoDataFrame to a separate GeoJSON Feature file.
+
+        The files are named by the feature ids and are written to the folder given as uri.
+        If the uri has a ZIP or tar extension (see `archive_ext`), the files are
+        written into the archive instead.
+        """
+        archive_mode = GeoJSON.get_archive_mode(self.uri)
+        if archive_mode is False:
+            self.uri.mkdir(parents=True, exist_ok=True)
+            folder = self.uri
+        else:
+            self.uri.parent.mkdir(parents=True, exist_ok=True)
+            folder = None
+
+        # We need to write GeoJSON in EPSG:4326
+        data = data.to_crs(epsg=4326)
+        if precision is not None:
+            data.geometry = GeoJSON.round_coordinates(data.geometry, precision)
+
+        # The collection metadata is the same for all features, so split it only once
+        feature_props, top_level_props = self._split_collection()
+
+        size = self.feature_chunk_size
+        offsets = range(0, len(data), size)
+        chunks = (data.iloc[offset : offset + size] for offset in offsets)
+        args = (feature_props, top_level_props, properties, indent, folder)
+
+        if jobs > 1:
+            executor = ProcessPoolExecutor(max_workers=jobs)
+            results = _serialize_features_parallel(executor, chunks, offsets, args, jobs * 2)
+        else:
+            executor = None
+            results = (_serialize_features(c, o, *args) for c, o in zip(chunks, offsets))
+
+        try:
+            if folder is not None:
+                for _ in results:
+                    pass
+            elif archive_mode is None:
+                with zipfile.ZipFile(self.uri, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+                    for files in results:
+                        for name, payload in files:
+                            zf.writestr(name, payload)
+            else:
+                with tarfile.open(self.uri, archive_mode) as tf:
+                    for files in results:
+                        for name, payload in files:
+                            info = tarfile.TarInfo(name)
+                            info.size = len(payload)
+                            tf.addfile(info, BytesIO(payload))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        return True
+
+    @staticmethod
+    def round_coordinates(geometries, precision: int):
+        """
+        Round the coordinates of a GeoSeries or shapely geometries to the given number of decimals.
+        """
+
+        def round_(coords):
+            return np.round(coords, precision)
+
+        # include_z=None keeps the dimensions of each geometry (2D or 3D)
+        if isinstance(geometries, GeoSeries):
+            return geometries.transform(round_, include_z=None)
+        else:
+            return shapely.transform(geometries, round_, include_z=None)
+
+    @staticmethod
+    def get_archive_mode(uri: Union[Path, URL]) -> Union[str, None, bool]:
+        """
+        Returns the mode to open the archive with: a tarfile mode for tar archives,
+        None for ZIP archives and False if the uri is not an archive.
+        """
+        name = Path(uri.path if isinstance(uri, URL) else uri).name.lower()
+        for ext, mode in GeoJSON.archive_ext.items():
+            if name.endswith(ext):
+                return mode
+        return False
+
+    def _split_collection(self) -> tuple[dict, dict]:
+        """
+        Split the collection metadata into the properties that are added to the
+        Feature properties and the properties that are added to the top-level of the Feature.
+        """
         collection = self.get_collection()
         collection_only = collection.get_collection_only_properties()
+        feature_props = {}
+        top_level_props = {}
         for key, value in collection.items():
             if key not in collection_only:
-                data["properties"][key] = value
+                feature_props[key] = value
             elif key not in GeoJSON.feature_properties:
-                data[key] = value
+                top_level_props[key] = value
+
+        return feature_props, top_level_props
+
+    @staticmethod
+    def merge_collection_into_feature(
+        data: Feature,
+        feature_props: dict,
+        top_level_props: dict,
+        properties: Optional[list[str]] = None,
+    ) -> Feature:
+        # If the input is originating from a __geo_interface__ object,
+        # it may not be in the correct format.
+        data = GeoJSON.fix_geo_interface(data)
+
+        # Let's get all collection metadata into the feature itself
+        data["properties"].update(feature_props)
+        data.update(top_level_props)
 
         # Remove properties that are not in the properties list
-        for key, value in data["properties"].items():
-            if properties is not None and key not in properties:
-                data["properties"].pop(key)
+        if properties is not None:
+            data["properties"] = {k: v for k, v in data["properties"].items() if k in properties}
 
-        return self._write_json(data, self.uri, indent=indent)
+        return data
 
     def read(
         self,
@@ -135,6 +398,9 @@ class GeoJSON(BaseEncoding):
         if num is None and properties is None:
             # The memory intensive and fast way: read the whole file into memory
             gdf = self._read_json(num=num, properties=properties, schema_map=schema_map)
+        elif num is None:
+            # Also read the whole file into memory, but only extract the requested properties
+            gdf = self._read_json_projected(properties=properties, schema_map=schema_map)
         else:
             # The memory efficient way: stream the file
             gdf = self._stream_json(num=num, properties=properties, schema_map=schema_map)
@@ -152,7 +418,7 @@ class GeoJSON(BaseEncoding):
         enforce_featurecollection: bool = False,
     ) -> Union[FeatureCollection, Feature]:
         # num only applies to FeatureCollections
-        with open(self.uri, "r") as f:
+        with self._open() as f:
             obj = json.load(f)
 
         if not isinstance(obj, dict):
@@ -227,13 +493,47 @@ class GeoJSON(BaseEncoding):
         gdf = GeoDataFrame.from_features(obj, crs=crs, columns=properties)
         return gdf
 
+    def _read_json_projected(
+        self,
+        properties: list[str],
+        schema_map: SchemaMapping = {},
+    ) -> GeoDataFrame:
+        obj = self.read_geojson(schema_map=schema_map, enforce_featurecollection=True)
+        features = obj["features"]
+        feature_props = [feature.get("properties") or {} for feature in features]
+
+        # Build the columns directly, only properties that exist in any of the features are added
+        data = {}
+        for key in properties:
+            if key == "geometry":
+                # Parsing the geometries in bulk in GEOS is faster than shape() per geometry
+                geometries = [
+                    json.dumps(feature["geometry"]) if feature.get("geometry") else None
+                    for feature in features
+                ]
+                data[key] = shapely.from_geojson(geometries)
+            elif key == "id":
+                # Preserve id, the same way as in _read_json
+                data[key] = [
+                    props["id"] if "id" in props else feature.get("id")
+                    for feature, props in zip(features, feature_props)
+                ]
+            elif any(key in props for props in feature_props):
+                data[key] = [props.get(key) for props in feature_props]
+
+        if "geometry" not in data:
+            data["geometry"] = [None] * len(features)
+
+        crs = self.crs if len(features) > 0 else None
+        return GeoDataFrame(data, geometry="geometry", crs=crs)
+
     def _stream_json(
         self,
         num: Optional[int] = None,
         schema_map: SchemaMapping = {},
         properties: Optional[list[str]] = None,
     ) -> GeoDataFrame:
-        with open(self.uri, "r") as f:
+        with self._open() as f:
             stream = json_stream.load(f)
             data = {
                 "id": [],
@@ -291,7 +591,7 @@ class GeoJSON(BaseEncoding):
             return gdf
 
     def _write_json(self, obj, path, indent=None) -> bool:
-        with open(path, "w") as f:
+        with self._open("w", uri=path) as f:
             json.dump(obj, f, allow_nan=False, indent=indent, cls=VecorelJSONEncoder)
         return True
 
@@ -319,7 +619,7 @@ class GeoJSON(BaseEncoding):
 
     @staticmethod
     def _fix_omit_nulled_properties(obj):
-        for key in obj.keys():
+        for key in list(obj.keys()):
             if obj[key] is None:
                 obj.pop(key)
             elif isinstance(obj[key], dict):
@@ -333,6 +633,122 @@ class GeoJSON(BaseEncoding):
         return obj
 
 
+def _parse_trailer(buffer: bytes) -> Optional[dict]:
+    """
+    Parse the top-level members of a JSON object that follow the features array,
+    given the last bytes of the document.
+
+    Scans backwards while keeping track of strings and nesting. Each member at the
+    top-level is parsed individually until the features are reached.
+    The features are only detected by their key, other arrays of objects (e.g. links)
+    can follow the features.
+    Returns None if the buffer doesn't contain all members after the features,
+    including the key of the features.
+    """
+    members = []
+
+    def parse_member(start, end) -> bool:
+        member = buffer[start:end].strip()
+        if len(member) > 0:
+            members.append(json.loads(b"{" + member + b"}"))
+        return len(member) > 0 and "features" in members[-1]
+
+    def to_dict() -> dict:
+        # The members were collected backwards and the features are not part of the trailer
+        trailer = {}
+        for member in reversed(members):
+            if "features" not in member:
+                trailer.update(member)
+        return trailer
+
+    end = len(buffer.rstrip())
+    if end == 0 or buffer[end - 1] != ord("}"):
+        return None
+    end -= 1
+
+    try:
+        depth = 1
+        in_string = False
+        i = end
+        while i > 0:
+            i -= 1
+            c = buffer[i]
+            if in_string:
+                if c == ord('"'):
+                    # The quote is escaped if it's preceded by an odd number of backslashes
+                    j = i
+                    while j > 0 and buffer[j - 1] == ord("\\"):
+                        j -= 1
+                    in_string = (i - j) % 2 == 1
+            elif c == ord('"'):
+                in_string = True
+            elif c == ord("}") or c == ord("]"):
+                depth += 1
+            elif c == ord("{") or c == ord("["):
+                depth -= 1
+                if depth == 0:
+                    # Reached the start of the document
+                    parse_member(i + 1, end)
+                    return to_dict()
+            elif c == ord(",") and depth == 1:
+                if parse_member(i + 1, end):
+                    return to_dict()
+                end = i
+    except ValueError:
+        return None
+
+    # The buffer starts in the middle of a member, which can't be identified
+    return None
+
+
+def _serialize_features_parallel(
+    executor: ProcessPoolExecutor,
+    chunks: Iterator[GeoDataFrame],
+    offsets: range,
+    args: tuple,
+    max_pending: int,
+) -> Iterator[list[tuple[str, bytes]]]:
+    # Limit the number of pending chunks so that the data is not queued completely at once
+    pending = deque()
+    for chunk, offset in zip(chunks, offsets):
+        pending.append(executor.submit(_serialize_features, chunk, offset, *args))
+        if len(pending) > max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _serialize_features(
+    data: GeoDataFrame,
+    offset: int,
+    feature_props: dict,
+    top_level_props: dict,
+    properties: Optional[list[str]] = None,
+    indent: Optional[int] = None,
+    folder: Optional[Path] = None,
+) -> list[tuple[str, bytes]]:
+    """
+    Serialize a chunk of rows to GeoJSON Features.
+
+    Writes the files to the folder if given, otherwise returns the file names and contents.
+    Module-level so that it can be used by worker processes.
+    """
+    files = []
+    for i, obj in enumerate(data.iterfeatures(), start=offset + 1):
+        obj = GeoJSON.merge_collection_into_feature(
+            obj, feature_props, top_level_props, properties=properties
+        )
+        name = f"{obj.get('id', i)}.json"
+        payload = json.dumps(obj, allow_nan=False, indent=indent, cls=VecorelJSONEncoder)
+        if folder is None:
+            files.append((name, payload.encode("utf-8")))
+        else:
+            with open(folder / name, "w") as f:
+                f.write(payload)
+
+    return files
+
+
 class VecorelJSONEncoder(json.JSONEncoder):
     def default(self, o):
         if isinstance(o, pd.Timestamp):
@@ -13,7 +13,7 @@ from yarl import URL
 from ..const import GEOPARQUET_DEFAULT_VERSION, GEOPARQUET_VERSIONS
 from ..encoding.geojson import VecorelJSONEncoder
 from ..parquet.geopandas import to_parquet
-from ..parquet.types import get_geopandas_dtype, get_pyarrow_field, get_pyarrow_type_for_geopandas
+from ..parquet.types import get_pyarrow_field, get_pyarrow_type_for_geopandas
 from ..validation.base import Validator
 from ..vecorel.typing import SchemaMapping
 from ..vecorel.util import get_fs, load_file
@@ -88,9 +88,9 @@ class GeoParquet(BaseEncoding):
         schema = self.get_parquet_schema().to_arrow_schema()
         return schema.metadata
 
-    def _get_pg_file(self) -> pq.ParquetFile:
+    def _get_pg_file(self, metadata: Optional[pq.FileMetaData] = None) -> pq.ParquetFile:
         pa_file = self._get_pyarrow_file()
-        return pq.ParquetFile(pa_file)
+        return pq.ParquetFile(pa_file, metadata=metadata)
 
     def get_parquet_metadata(self) -> pq.FileMetaData:
         if self.pq_metadata is None:
@@ -170,27 +170,21 @@ class GeoParquet(BaseEncoding):
         schemas_per_collection = collection.get_schemas()
         has_multiple_collections = len(schemas_per_collection) > 1
         schemas = collection.merge_schemas(schema_map)
+        plan = schemas.get_plan(multiple_collections=has_multiple_collections)
 
         # Update the GeoDataFrame with the correct types and create the parquet schema
-        props = schemas.get("properties", {})
-        required_props = schemas.get("required", [])
         pq_fields = []
         for column in properties:
-            required = column in required_props and not has_multiple_collections
-            schema = props.get(column, {})
-            dtype = schema.get("type")
+            column_plan = plan.get(column)
+            dtype = column_plan.dtype if column_plan is not None else None
 
             # Convert the data types in the GeoDataFrame
             if dtype is not None:
-                gp_type = get_geopandas_dtype(dtype, required, schema)
-                if gp_type is None:
+                if column_plan.pandas_dtype is None:
                     self.warning(f"{column}: No type conversion available for {dtype}")
                 else:
                     try:
-                        if callable(gp_type):
-                            data[column] = gp_type(data[column])
-                        else:
-                            data[column] = data[column].astype(gp_type)
+                        data[column] = column_plan.cast(data[column])
                     except Exception as e:
                         self.warning(f"{column}: Can't convert to {dtype}: {e}")
 
@@ -198,7 +192,7 @@ class GeoParquet(BaseEncoding):
             field = None
             if dtype is not None:
                 try:
-                    field = get_pyarrow_field(column, schema=schema, required=required)
+                    field = column_plan.field
                 except Exception as e:
                     self.warning(f"{column}: Skipped - {e}")
             else:
@@ -275,20 +269,37 @@ class GeoParquet(BaseEncoding):
             existing_properties = set(self.get_properties().keys())
             properties = list(set(properties) & existing_properties)
 
+        table = self.read_table(num=num, properties=properties)
+        gdf = _arrow_to_geopandas(table)
+
+        if hydrate:
+            gdf = self.hydrate_from_collection(gdf, schema_map=schema_map)
+
+        return gdf
+
+    def read_table(
+        self, num: Optional[int] = None, properties: Optional[list[str]] = None
+    ) -> pa.Table:
+        """
+        Read the first num rows (or all rows if None) of the given properties as Arrow table.
+        """
         if num is None:
             pa_file = self._get_pyarrow_file()
-            table = pq.read_table(pa_file, columns=properties)
+            return pq.read_table(pa_file, columns=properties)
         else:
             pf = self._get_pg_file()
             rows = next(pf.iter_batches(batch_size=num, columns=properties))
-            table = pa.Table.from_batches([rows])
-
-        gdf = _arrow_to_geopandas(table)
+            return pa.Table.from_batches([rows])
 
-        if hydrate:
-            gdf = self.hydrate_from_collection(gdf, schema_map=schema_map)
+    def read_row_group(self, index: int, properties: Optional[list[str]] = None) -> pa.Table:
+        """
+        Read a single row group of the given properties as Arrow table.
 
-        return gdf
+        Opens the file separately so that row groups can be read from multiple threads.
+        The cached metadata is reused so that the footer doesn't need to be read again.
+        """
+        with self._get_pg_file(metadata=self.get_parquet_metadata()) as pf:
+            return pf.read_row_group(index, columns=properties)
 
     def _get_pyarrow_file(self) -> NativeFile:
         filepath = str(self.uri)
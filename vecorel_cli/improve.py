@@ -9,6 +9,7 @@ from .cli.options import (
     GEOPARQUET_COMPRESSION,
     GEOPARQUET_VERSION,
     JSON_INDENT,
+    OFFLINE,
     VECOREL_FILE_ARG,
     VECOREL_TARGET,
 )
@@ -66,6 +67,7 @@ class ImproveData(BaseCommand):
             "compression": GEOPARQUET_COMPRESSION,
             "geoparquet_version": GEOPARQUET_VERSION,
             "indent": JSON_INDENT,
+            "offline": OFFLINE,
         }
 
     @runnable
@@ -151,3 +151,95 @@ def jsonschema_template(
     if schema_id:
         schema["$id"] = schema_id
     return schema
+
+
+def feature_jsonschema_template(
+    property_schemas: dict,
+    required: set[str],
+    collection: dict[str, bool],
+    collection_keys: set[str],
+    schema_id: Optional[str] = None,
+):
+    """
+    Schema for the individual Features of a FeatureCollection.
+
+    Applies the checks for the features in the FeatureCollection schema to a single feature,
+    so that features can be validated one by one.
+    The checks depend on the properties that are present at the top-level of the
+    FeatureCollection (collection_keys).
+    """
+    properties = set(property_schemas.keys())
+    collection_keys = set(collection_keys)
+
+    only_collection = set()
+    only_properties = set()
+    for key, value in collection.items():
+        chosen_set = only_collection if value else only_properties
+        chosen_set.add(key)
+
+    top_level_feature = GeoJSON.feature_properties | only_collection
+
+    # Required properties that are not present in the collection must be present in the feature
+    required_in_feature = (required & only_properties) | (required - only_properties - collection_keys)
+
+    schema = {
+        "$schema": "https://json-schema.org/draft/2020-12/schema",
+        "allOf": [
+            {"$ref": "https://geojson.org/schema/Feature.json"},
+            {"$ref": "#/$defs/feature_schemas"},
+            {"$ref": "#/$defs/feature_requirements"},
+            {"$ref": "#/$defs/feature_uniqueness"}
+        ],
+        "$defs": {
+            "feature_schemas": jsonschema_template(
+                property_schemas, required, collection
+            )["$defs"]["feature_schemas"],
+            "feature_requirements": {
+                # Check that the features don't contain any properties
+                **not_required(toSortedList((properties & only_properties) - top_level_feature)),
+                # Require any properties in the features that can only be used in the properties
+                # or that are not present in the collection
+                **check_properties({"required": toSortedList(required_in_feature - top_level_feature)})
+            },
+            "feature_uniqueness": {
+                # Don't allow properties in the feature that are present in the collection
+                "allOf": [
+                    check_properties({
+                        "not": {"required": [key]}
+                    }) for key in toSortedList(properties & collection_keys)
+                ]
+            }
+        }
+    }
+    if schema_id:
+        schema["$id"] = schema_id
+    return schema
+
+
+def featurecollection_header_template(
+    required: set[str],
+    collection: dict[str, bool],
+    schema_id: Optional[str] = None,
+):
+    """
+    Schema for a FeatureCollection without the checks for the features.
+
+    Use feature_jsonschema_template to validate the features.
+    """
+    only_collection = {key for key, value in collection.items() if value}
+
+    schema = {
+        "$schema": "https://json-schema.org/draft/2020-12/schema",
+        "type": "object",
+        "allOf": [
+            {"$ref": "https://geojson.org/schema/FeatureCollection.json"},
+            {
+                # Check that the required collection properties are present
+                "type": "object",
+                "required": toSortedList(required & only_collection)
+            }
+        ]
+    }
+    if schema_id:
+        schema["$id"] = schema_id
+    return schema
@@ -7,6 +7,7 @@ from yarl import URL
 from .basecommand import BaseCommand, runnable
 from .cli.options import (
     CRS,
+    OFFLINE,
     VECOREL_FILES_ARG,
     VECOREL_TARGET,
 )
@@ -52,6 +53,7 @@ class MergeDatasets(BaseCommand):
                 multiple=True,
                 help="Core properties to exclude.",
             ),
+            "offline": OFFLINE,
         }
 
     @runnable
@@ -0,0 +1,70 @@
+from functools import cached_property
+from typing import Callable, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+
+from ..validation.data import Check, ColumnValidator, compile_checks
+from .types import PA_TYPE_CHECK, get_geopandas_dtype, get_pyarrow_field
+
+
+class ColumnPlan:
+    """
+    The type information for a column, derived once from its property schema.
+
+    Holds the pandas data type (see cast), the Arrow field, the check for the Arrow data type,
+    the compiled validation checks and the nullability.
+    """
+
+    def __init__(self, name: str, schema: dict, required: bool = False):
+        self.name = name
+        self.schema = schema
+        self.dtype: Optional[str] = schema.get("type")
+        self.required = required
+        self.nullable = not required
+        self.pandas_dtype: Union[str, Callable, None] = None
+        if self.dtype is not None:
+            self.pandas_dtype = get_geopandas_dtype(self.dtype, required, schema)
+        self.type_check: Optional[Callable[[pa.DataType], bool]] = PA_TYPE_CHECK.get(self.dtype)
+
+    @cached_property
+    def field(self) -> Optional[pa.Field]:
+        """
+        The Arrow field, raises an exception if the data type is not supported.
+        """
+        return get_pyarrow_field(self.name, schema=self.schema, required=self.required)
+
+    @cached_property
+    def checks(self) -> list[Check]:
+        return compile_checks(self.schema)
+
+    def cast(self, data: pd.Series) -> pd.Series:
+        """
+        Convert the values to the pandas data type.
+        """
+        if callable(self.pandas_dtype):
+            return self.pandas_dtype(data)
+        else:
+            return data.astype(self.pandas_dtype)
+
+    def create_validator(self, num_examples: int = 5) -> ColumnValidator:
+        return ColumnValidator(self.schema, num_examples=num_examples, checks=self.checks)
+
+
+class SchemaPlan:
+    """
+    The column plans for the properties of a (merged) Vecorel schema.
+
+    If the data contains multiple collections, all columns are nullable.
+    """
+
+    def __init__(self, schema: dict, multiple_collections: bool = False):
+        required = set(schema.get("required", []))
+        self.columns: dict[str, ColumnPlan] = {}
+        for key, prop_schema in schema.get("properties", {}).items():
+            if isinstance(prop_schema, dict):
+                is_required = key in required and not multiple_collections
+                self.columns[key] = ColumnPlan(key, prop_schema, required=is_required)
+
+    def get(self, column: str) -> Optional[ColumnPlan]:
+        return self.columns.get(column)
@@ -0,0 +1,195 @@
+import json
+from pathlib import Path
+from typing import Optional, Union
+from urllib.parse import urldefrag, urljoin, urlparse
+
+import click
+import yaml
+from yarl import URL
+
+from .basecommand import BaseCommand, runnable
+from .cli.options import VECOREL_FILES_ARG
+from .const import GEOPARQUET_VERSIONS
+from .encoding.auto import create_encoding
+from .encoding.geojson import GeoJSON
+from .encoding.geoparquet import GeoParquet
+from .registry import Registry
+from .vecorel import util
+from .vecorel.schemas import Schemas
+from .vecorel.util import get_cache_dir, http_get, write_file_atomic
+from .vecorel.version import sdl_uri
+
+
+class PrefetchSchemas(BaseCommand):
+    cmd_name = "prefetch-schemas"
+    cmd_title: str = "Prefetch Schemas"
+    cmd_help: str = (
+        f"Downloads all schemas that are required for {Registry.project} files into a local folder."
+    )
+    cmd_final_report: bool = True
+
+    schema_map_filename: str = "schema-map.json"
+    # Schemas that are referenced by the JSON Schemas created for GeoJSON
+    geojson_schemas: list[str] = [
+        f"https://geojson.org/schema/{name}.json"
+        for name in [
+            "FeatureCollection",
+            "Feature",
+            "Geometry",
+            "Point",
+            "LineString",
+            "Polygon",
+            "MultiPoint",
+            "MultiLineString",
+            "MultiPolygon",
+            "GeometryCollection",
+        ]
+    ]
+
+    @staticmethod
+    def get_cli_args():
+        return {
+            "source": VECOREL_FILES_ARG,
+            "uris": click.option(
+                "uris",
+                "--uri",
+                "-u",
+                type=click.STRING,
+                multiple=True,
+                help="Additional schema URL to download. Can be used multiple times.",
+            ),
+            "target": click.option(
+                "--out",
+                "-o",
+                "target",
+                type=click.Path(exists=False, file_okay=False, resolve_path=True),
+                help="Folder to store the schemas in. Defaults to a folder in the cache directory.",
+                default=None,
+            ),
+        }
+
+    @runnable
+    def prefetch_cli(
+        self,
+        source: list[Union[Path, URL, str]] = [],
+        uris: list[str] = [],
+        target: Optional[Union[Path, str]] = None,
+    ) -> Path:
+        target = Path(target) if target else get_cache_dir("mirror")
+        schema_map = self.prefetch(self.get_uris(source, uris), target)
+
+        self.info(f"Downloaded {len(schema_map)} schemas to {target}")
+        self.info("Use the schema map with other commands as follows:")
+        self.info(f"--schema {target / self.schema_map_filename}", indent="  ", end="\n\n")
+        return target / self.schema_map_filename
+
+    def get_uris(self, files: list[Union[Path, URL, str]] = [], uris: list[str] = []) -> set[str]:
+        """
+        Get the schemas that are required for the given files, including the default schemas.
+        """
+        found = set(uris)
+        found.update(
+            [
+                Schemas.get_core_uri(),
+                sdl_uri,
+                GeoJSON.get_datatypes_uri(),
+                *[GeoParquet.schema_uri.format(version=v) for v in GEOPARQUET_VERSIONS],
+                *self.geojson_schemas,
+            ]
+        )
+
+        for file in files:
+            collection = create_encoding(file).get_collection()
+            for schemas in collection.get_schemas().get_all():
+                found.update(schemas)
+                version = schemas.get_core_version()
+                if version is not None:
+                    found.add(Schemas.get_core_uri(version))
+                    found.add(GeoJSON.get_datatypes_uri(version))
+
+        return found
+
+    def prefetch(self, uris: set[str], target: Path) -> dict[str, Path]:
+        """
+        Download the schemas and all schemas referenced by them into the target folder.
+
+        Writes a schema map, which maps the URLs to the local files.
+        """
+        schema_map: dict[str, Path] = {}
+        failed = []
+        pending = sorted(uris, reverse=True)
+        while len(pending) > 0:
+            uri = pending.pop()
+            if uri in schema_map or uri in failed:
+                continue
+
+            try:
+                data = self.download(uri)
+            except Exception as e:
+                self.error(f"Schema {uri} can't be loaded. {e}")
+                failed.append(uri)
+                continue
+
+            path = target / self.get_relative_path(uri)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            write_file_atomic(path, data)
+            schema_map[uri] = path
+            self.info(f"{uri} -> {path}")
+
+            pending.extend(sorted(self.get_references(uri, data), reverse=True))
+
+        mapping = {uri: path.relative_to(target).as_posix() for uri, path in schema_map.items()}
+        target.mkdir(parents=True, exist_ok=True)
+        write_file_atomic(
+            target / self.schema_map_filename,
+            json.dumps(mapping, indent=2, sort_keys=True).encode("utf-8"),
+        )
+
+        if len(failed) > 0:
+            raise ValueError(f"{len(failed)} schemas could not be downloaded.")
+
+        return schema_map
+
+    @staticmethod
+    def download(uri: str) -> bytes:
+        """
+        Download the latest version of a schema, bypassing mirrors and the persistent cache.
+        """
+        if util.offline:
+            raise FileNotFoundError(f"{uri} can't be downloaded as offline mode is enabled")
+        # see https://github.com/OSGeo/PROJ/issues/4567
+        return http_get(uri, headers={"User-Agent": Registry.name}).content
+
+    @staticmethod
+    def get_relative_path(uri: str) -> Path:
+        parsed = urlparse(uri)
+        parts = [p for p in parsed.path.split("/") if p not in ("", ".", "..")]
+        if len(parts) == 0:
+            parts = ["index"]
+        return Path(parsed.netloc.replace(":", "_"), *parts)
+
+    @staticmethod
+    def get_references(uri: str, data: bytes) -> set[str]:
+        """
+        Get the absolute URLs of all remote schemas that are referenced via $ref.
+        """
+        try:
+            doc = yaml.safe_load(data)
+        except yaml.YAMLError:
+            return set()
+
+        refs = set()
+        stack = [doc]
+        while len(stack) > 0:
+            obj = stack.pop()
+            if isinstance(obj, dict):
+                ref = obj.get("$ref")
+                if isinstance(ref, str):
+                    url = urldefrag(urljoin(uri, ref)).url
+                    if urlparse(url).scheme in ("http", "https") and url != uri:
+                        refs.add(url)
+                stack.extend(obj.values())
+            elif isinstance(obj, list):
+                stack.extend(obj)
+
+        return refs
@@ -99,6 +99,7 @@ class VecorelRegistry:
         from .describe import DescribeFile
         from .improve import ImproveData
         from .merge import MergeDatasets
+        from .prefetch_schemas import PrefetchSchemas
         from .rename_extension import RenameExtension
         from .validate import ValidateData
         from .validate_schema import ValidateSchema
@@ -113,6 +114,7 @@ class VecorelRegistry:
             DescribeFile,
             ImproveData,
             MergeDatasets,
+            PrefetchSchemas,
             RenameExtension,
             ValidateData,
             ValidateSchema,
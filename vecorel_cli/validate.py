@@ -1,14 +1,23 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 from typing import Optional, Union
 
 import click
+from jsonschema.exceptions import ValidationError
 
 from .basecommand import BaseCommand, runnable
-from .cli.options import SCHEMA_MAP, VECOREL_FILES_ARG
+from .cli.options import JOBS, OFFLINE, SCHEMA_MAP, VECOREL_FILES_ARG
 from .encoding.auto import create_encoding
 from .registry import Registry
+from .validate_schema import make_picklable, resource_cache
 from .validation.base import Validator
+from .validation.cache import ValidationCache
+from .vecorel import util
+from .vecorel.schemas import SchemaLoadError
 from .vecorel.typing import SchemaMapping
+from .vecorel.util import file_cache
 
 
 class ValidateData(BaseCommand):
@@ -28,7 +37,40 @@ class ValidateData(BaseCommand):
                 help="Number of features to validate. Defaults to the first 100. Specify -1 to validate all features.",
                 default=100,
             ),
+            "sample": click.option(
+                "--sample",
+                type=click.IntRange(min=1),
+                help="Number of randomly selected features to validate instead of the first features (see --num).",
+                default=None,
+            ),
+            "seed": click.option(
+                "--seed",
+                type=click.INT,
+                help="Seed for the random selection of features (see --sample), for reproducible results.",
+                default=None,
+            ),
+            "level": click.option(
+                "--level",
+                type=click.Choice(["metadata", "sample", "full"]),
+                help=(
+                    "Validation level. "
+                    "metadata: Only check the metadata and the column statistics (GeoParquet), don't read the data. "
+                    "sample: Validate a random sample of features (see --sample, defaults to --num). "
+                    "full: Validate all features. "
+                    "If not provided, validates the first features (see --num)."
+                ),
+                default=None,
+            ),
             "schema_map": SCHEMA_MAP,
+            "jobs": JOBS,
+            "no_cache": click.option(
+                "--no-cache",
+                is_flag=True,
+                type=click.BOOL,
+                help="Validate all files again, ignoring the results of previous validations of unchanged files.",
+                default=False,
+            ),
+            "offline": OFFLINE,
         }
 
     @runnable
@@ -37,6 +79,11 @@ class ValidateData(BaseCommand):
         source: list[Union[str, Path]],
         num: Optional[int] = 100,
         schema_map: SchemaMapping = {},
+        jobs: int = 1,
+        sample: Optional[int] = None,
+        seed: Optional[int] = None,
+        level: Optional[str] = None,
+        no_cache: bool = False,
     ):
         if not isinstance(source, list):
             raise ValueError("Source must be a list.")
@@ -45,30 +92,42 @@ class ValidateData(BaseCommand):
         if num is not None and num < 0:
             num = None
 
+        # The first file is always validated in this process so that the schemas are
+        # loaded only once and can be passed to the worker processes
+        results = self._validate_files_parallel(
+            source,
+            jobs=jobs,
+            cache=not no_cache,
+            num=num,
+            schema_map=schema_map,
+            sample=sample,
+            seed=seed,
+            level=level,
+        )
+
         invalid = 0
-        for file in source:
+        for file, result in zip(source, results):
             self.info(f"Validating {file}", style="bold", end=": ")
-            try:
-                result = self.validate(file, num=num, schema_map=schema_map)
-                if result.is_valid():
-                    self.success("VALID", style="bold")
-                else:
-                    self.error("INVALID", style="bold")
-                    invalid += 1
-
-                for e in result.errors:
-                    self.error(e, indent=" - ")
-                for e in result.warnings:
-                    self.warning(e, indent=" - ")
-                for e in result.infos:
-                    self.info(e, indent=" - ")
-
-            except Exception as e:
+            if isinstance(result, Exception):
                 self.error("UNKNOWN", style="bold")
-                self.error(e, indent=" - ")
+                self.error(result, indent=" - ")
                 invalid += 1
                 if self.verbose:
-                    raise e
+                    raise result
+                continue
+
+            if result.is_valid():
+                self.success("VALID", style="bold")
+            else:
+                self.error("INVALID", style="bold")
+                invalid += 1
+
+            for e in result.errors:
+                self.error(e, indent=" - ")
+            for e in result.warnings:
+                self.warning(e, indent=" - ")
+            for e in result.infos:
+                self.info(e, indent=" - ")
 
         print()
 
@@ -77,6 +136,86 @@ class ValidateData(BaseCommand):
         else:
             return "Validation succeeded for all files."
 
+    def _validate_files_parallel(
+        self, files: list[Union[str, Path]], jobs: int = 1, cache: bool = False, **kwargs
+    ):
+        """
+        Validate the files and yield the results (validation result or exception) in order.
+
+        If cache is True, the results for unchanged files are read from the validation cache.
+        The keyword arguments are passed to validate.
+        The files are validated in up to the given number of processes, a single file
+        is passed the number of processes to validate its data in parallel instead.
+        """
+        validate = ValidateData._validate_cached_worker if cache else ValidateData._validate_worker
+        if len(files) == 1:
+            # Validate the data of a single file in parallel instead, if supported
+            yield validate(files[0], {**kwargs, "jobs": jobs})
+            return
+        yield validate(files[0], kwargs)
+
+        files = files[1:]
+        if len(files) == 0:
+            return
+        elif jobs <= 1:
+            for file in files:
+                yield validate(file, kwargs)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=ValidateData._init_worker,
+            initargs=(
+                dict(file_cache),
+                dict(resource_cache),
+                Registry.required_extensions,
+                util.offline,
+            ),
+        ) as executor:
+            yield from executor.map(validate, files, repeat(kwargs))
+
+    @staticmethod
+    def _init_worker(files: dict, resources: dict, required_extensions: list, offline: bool):
+        file_cache.update(files)
+        resource_cache.update(resources)
+        Registry.required_extensions = required_extensions
+        util.offline = offline
+
+    @staticmethod
+    def _validate_worker(
+        file: Union[str, Path], kwargs: dict
+    ) -> Union["ValidationResult", Exception]:
+        try:
+            return ValidationResult(ValidateData().validate(file, **kwargs))
+        except Exception as e:
+            return e
+
+    @staticmethod
+    def _validate_cached_worker(
+        file: Union[str, Path], kwargs: dict
+    ) -> Union["ValidationResult", Exception]:
+        # Unseeded random samples differ in each run, so they can't be cached
+        sample = kwargs.get("sample") or kwargs.get("level") == "sample"
+        if sample and kwargs.get("seed") is None:
+            return ValidateData._validate_worker(file, kwargs)
+
+        cache = ValidationCache()
+        # The number of processes doesn't change the outcome
+        options = {k: v for k, v in kwargs.items() if k != "jobs"}
+        key = cache.get_key(file, required_schemas=Registry.required_extensions, **options)
+        if key is not None:
+            data = cache.get(key)
+            if data is not None:
+                return ValidationResult.from_dict(data)
+
+        result = ValidateData._validate_worker(file, kwargs)
+        if key is not None and isinstance(result, ValidationResult) and result.cacheable:
+            try:
+                cache.set(key, result.to_dict())
+            except OSError:
+                pass  # The cache is optional, e.g. if the folder is not writable
+        return result
+
     def validate_files(
         self,
         files: list[Union[str, Path]],
@@ -99,11 +238,83 @@ class ValidateData(BaseCommand):
         file: Union[str, Path],
         num: Optional[int] = None,
         schema_map: SchemaMapping = {},
+        sample: Optional[int] = None,
+        seed: Optional[int] = None,
+        level: Optional[str] = None,
+        jobs: int = 1,
     ) -> Validator:
+        if level == "metadata":
+            num = 0
+            sample = None
+        elif level == "sample":
+            sample = sample or num or 100
+        elif level == "full":
+            num = None
+            sample = None
+
         encoding = create_encoding(file)
         validator = encoding.get_validator()
         if validator is None:
             raise ValueError(f"No validator available for files of type {encoding.get_format()}")
         validator.set_required_schemas(Registry.required_extensions)
+        validator.set_sample(sample, seed=seed)
+        validator.set_level(level)
+        validator.set_jobs(jobs)
         validator.validate(num=num, schema_map=schema_map)
         return validator
+
+
+class ValidationResult:
+    """
+    The outcome of a validation, which (unlike the validator) can be passed between processes.
+    """
+
+    def __init__(self, validator: Validator):
+        self.valid = validator.is_valid()
+        # Results with errors that may be temporary (e.g. network errors) are not cached
+        self.cacheable = not any(self._is_load_error(e) for e in validator.errors)
+        self.errors = [self._picklable(e) for e in validator.errors]
+        self.warnings = validator.warnings
+        self.infos = validator.infos
+
+    @staticmethod
+    def _picklable(error: Exception) -> Exception:
+        if isinstance(error, ValidationError):
+            return make_picklable(error)
+        try:
+            pickle.dumps(error)
+            return error
+        except Exception:
+            return Exception(str(error))
+
+    @staticmethod
+    def _is_load_error(error: Exception) -> bool:
+        while error is not None:
+            if isinstance(error, (SchemaLoadError, OSError)):
+                return True
+            error = error.__cause__ or error.__context__
+        return False
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ValidationResult":
+        """
+        Restore a result from the validation cache, errors are restored as plain exceptions.
+        """
+        result = cls.__new__(cls)
+        result.valid = data["valid"]
+        result.cacheable = True
+        result.errors = [Exception(e) for e in data["errors"]]
+        result.warnings = data["warnings"]
+        result.infos = data["infos"]
+        return result
+
+    def to_dict(self) -> dict:
+        return {
+            "valid": self.valid,
+            "errors": [str(e) for e in self.errors],
+            "warnings": [str(w) for w in self.warnings],
+            "infos": [str(i) for i in self.infos],
+        }
+
+    def is_valid(self) -> bool:
+        return self.valid
@@ -1,7 +1,7 @@
+import hashlib
 import json
 from pathlib import Path
 from typing import Optional, Union
-from urllib.request import Request, urlopen
 
 import click
 import referencing
@@ -12,9 +12,26 @@ from yarl import URL
 
 from .basecommand import BaseCommand, runnable
 from .cli.path_url import PathOrURL
-from .vecorel.util import load_file
+from .vecorel.cache import LRUCache
+from .vecorel.util import load_file, load_remote_file
 from .vecorel.version import sdl_uri
 
+# Compiled validators by the hash of the schema, sized by the schema
+validator_cache = LRUCache()
+# Read-only contents of the remote schemas that have been referenced by schemas, by URI
+resource_cache = LRUCache()
+
+
+def make_picklable(error: ValidationError) -> ValidationError:
+    """
+    Remove the reference to the type checker from the error (and its sub-errors),
+    so that it can be passed between processes.
+    """
+    error._type_checker = None
+    for suberror in error.context:
+        make_picklable(suberror)
+    return error
+
 
 class ValidateSchema(BaseCommand):
     cmd_name = "validate-schema"
@@ -23,6 +40,9 @@ class ValidateSchema(BaseCommand):
 
     @staticmethod
     def get_cli_args():
+        # Imported here as the options depend on the encodings, which depend on this module
+        from .cli.options import OFFLINE
+
         return {
             "files": click.argument(
                 "files",
@@ -38,6 +58,7 @@ class ValidateSchema(BaseCommand):
                 show_default=True,
                 default=sdl_uri,
             ),
+            "offline": OFFLINE,
         }
 
     @staticmethod
@@ -112,26 +133,42 @@ class ValidateSchema(BaseCommand):
         return list(sorted(validator.iter_errors(obj), key=lambda e: e.path))
 
     def create_validator(self, schema) -> Validator:
+        """
+        Create a validator for the schema.
+
+        Validators are cached by the content of the schema, so that the same schema
+        is only compiled once, e.g. when validating multiple files.
+        """
+        key = ValidateSchema.get_schema_hash(schema)
+        cached = validator_cache.get(key)
+        if cached is not None:
+            return cached
+
         if schema["$schema"] == "http://json-schema.org/draft-07/schema#":
             instance = Draft7Validator
         else:
             instance = Draft202012Validator
 
-        return instance(
+        validator = instance(
             schema,
             format_checker=instance.FORMAT_CHECKER,
             registry=referencing.Registry(retrieve=ValidateSchema.retrieve_remote_schema),
         )
+        return validator_cache.set(key, validator, size=LRUCache.estimate_size(schema))
+
+    @staticmethod
+    def get_schema_hash(schema: dict) -> str:
+        data = json.dumps(schema, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(data).hexdigest()
 
     @staticmethod
     def retrieve_remote_schema(uri: str):
-        request = Request(
-            uri,
-            # see https://github.com/OSGeo/PROJ/issues/4567
-            headers={"User-Agent": "vecorel-cli"},
+        contents = resource_cache.get(uri)
+        if contents is None:
+            data = load_remote_file(uri)
+            contents = resource_cache.set(uri, json.loads(data), size=len(data))
+
+        return referencing.Resource.from_contents(
+            contents,
+            default_specification=referencing.jsonschema.DRAFT202012,
         )
-        with urlopen(request) as response:
-            return referencing.Resource.from_contents(
-                json.load(response),
-                default_specification=referencing.jsonschema.DRAFT202012,
-            )
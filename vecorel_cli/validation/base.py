@@ -22,6 +22,10 @@ class Validator:
         self.warnings = []
         self.infos = []
         self.required_schemas: list[Union[str, re.Pattern]] = []
+        self.sample: Optional[int] = None
+        self.seed: Optional[int] = None
+        self.level: Optional[str] = None
+        self.jobs: int = 1
 
     def info(self, message: str):
         self.infos.append(message)
@@ -46,6 +50,28 @@ class Validator:
     def set_required_schemas(self, patterns: list[Union[str, re.Pattern]]):
         self.required_schemas = patterns
 
+    def set_sample(self, size: Optional[int], seed: Optional[int] = None):
+        """
+        Validate a random sample of the given number of features instead of the first num features.
+        """
+        self.sample = size
+        self.seed = seed
+
+    def set_level(self, level: Optional[str]):
+        """
+        Set the validation level: metadata, sample or full.
+
+        The level "metadata" applies checks that don't require reading the data,
+        e.g. based on statistics in the file.
+        """
+        self.level = level
+
+    def set_jobs(self, jobs: int):
+        """
+        Set the number of processes that validate the data in parallel, if supported.
+        """
+        self.jobs = jobs
+
     def validate(self, num: Optional[int] = None, schema_map: SchemaMapping = {}) -> bool:
         self._validate(num=num, schema_map=schema_map)
         self.validated = True
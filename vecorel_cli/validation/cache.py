@@ -0,0 +1,146 @@
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Optional, Union
+
+from yarl import URL
+
+from ..encoding.auto import create_encoding
+from ..encoding.geojson import GeoJSON
+from ..registry import Registry
+from ..vecorel.schemas import Schemas
+from ..vecorel.typing import SchemaMapping
+from ..vecorel.util import (
+    get_cache_dir,
+    get_file_version,
+    get_fs,
+    load_files,
+    write_file_atomic,
+)
+from ..vecorel.version import sdl_uri, supported_vecorel_versions
+
+
+class ValidationCache:
+    """
+    Stores the outcome of validations on disk so that unchanged files don't need to be validated again.
+
+    The entries are keyed by a fingerprint of the file (size, modification time or ETag and
+    a hash of the last bytes, which contain the footer for GeoParquet), the content of the
+    schemas and the validation options.
+    """
+
+    # Number of bytes at the end of the file that are hashed
+    footer_size: int = 64 * 1024
+
+    def __init__(self, folder: Optional[Union[Path, str]] = None):
+        self.folder = Path(folder) if folder else get_cache_dir("validation")
+
+    def get_key(
+        self,
+        uri: Union[Path, URL, str],
+        schema_map: SchemaMapping = {},
+        required_schemas: list[Union[str, re.Pattern]] = [],
+        **options,
+    ) -> Optional[str]:
+        """
+        Compute the cache key for validating the given file with the given options.
+
+        Returns None if the file or its schemas can't be fingerprinted,
+        which disables caching for the file.
+        """
+        fingerprint = self.get_fingerprint(uri)
+        if fingerprint is None:
+            return None
+
+        schemas = self.get_schema_fingerprints(uri, schema_map)
+        if schemas is None:
+            return None
+
+        mapped = {}
+        for schema_uri, path in schema_map.items():
+            mapped[schema_uri] = self.get_fingerprint(path)
+            if mapped[schema_uri] is None:
+                return None
+
+        data = {
+            "file": fingerprint,
+            "cli": Registry.get_version(),
+            "vecorel": supported_vecorel_versions,
+            "sdl": sdl_uri,
+            "required_schemas": [
+                p.pattern if isinstance(p, re.Pattern) else p for p in required_schemas
+            ],
+            "schema_map": mapped,
+            "schemas": schemas,
+            "options": options,
+        }
+        encoded = json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get_schema_fingerprints(
+        self, uri: Union[Path, URL, str], schema_map: SchemaMapping = {}
+    ) -> Optional[dict[str, str]]:
+        """
+        Compute a hash of the content of each schema that the file is validated against.
+
+        Schemas can change without a new version (e.g. unversioned URLs or updated mirrors),
+        so the schemas are loaded (usually from the cache) instead of relying on their URLs.
+        Schemas in the schema map are covered by the fingerprints of the local files.
+        """
+        try:
+            collection = create_encoding(uri).get_collection()
+        except Exception:
+            return None
+
+        uris = set()
+        for schemas in collection.get_schemas().get_all():
+            uris.update(schemas)
+            version = schemas.get_core_version()
+            if version is not None:
+                uris.add(Schemas.get_core_uri(version))
+                uris.add(GeoJSON.get_datatypes_uri(version))
+        uris = sorted(u for u in uris if u not in schema_map)
+
+        hashes = {}
+        for schema_uri, data in zip(uris, load_files(uris)):
+            if isinstance(data, Exception):
+                return None
+            if not isinstance(data, bytes):
+                data = json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+            hashes[schema_uri] = hashlib.sha256(data).hexdigest()
+
+        return hashes
+
+    def get_fingerprint(self, uri: Union[Path, URL, str]) -> Optional[dict]:
+        if isinstance(uri, Path):
+            uri = str(uri.absolute())
+        elif isinstance(uri, URL):
+            uri = str(uri)
+
+        try:
+            fs = get_fs(uri)
+            info = fs.info(uri)
+            version = get_file_version(info)
+            size = info.get("size")
+            if version is None or size is None:
+                return None
+
+            with fs.open(uri, mode="rb") as f:
+                f.seek(max(0, size - self.footer_size))
+                footer = hashlib.sha256(f.read()).hexdigest()
+        except Exception:
+            return None
+
+        return {"uri": uri, "size": size, "version": version, "footer": footer}
+
+    def get(self, key: str) -> Optional[dict]:
+        try:
+            with open(self.folder / f"{key}.json", "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key: str, data: dict):
+        self.folder.mkdir(parents=True, exist_ok=True)
+        write_file_atomic(self.folder / f"{key}.json", json.dumps(data).encode("utf-8"))
@@ -1,176 +1,585 @@
 import re
-from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Union
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.types as pat
+import shapely
 from shapely.validation import explain_validity
 
-from ..parquet.types import PYTHON_TYPES, is_numerical_type, is_scalar_type
+from ..parquet.types import (
+    PYTHON_TYPES,
+    is_floating_type,
+    is_integer_type,
+    is_scalar_type,
+)
 
 REGEX_EMAIL = re.compile("^[^@]+@[^@]+\\.[^@]+$")
 REGEX_UUID = re.compile("^[0-9a-f]{8}-[0-9a-f]{4}-[1-5][0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$")
-
-
-def validate_column(data, rules):
-    for value in data:
-        isna = pd.isna(value)
-        if isinstance(isna, bool) and isna:
-            # Skip validation for NaN values or implement special handling if required
-            continue
-
-        dtype = rules.get("type")
-        expected_pytype = PYTHON_TYPES.get(dtype)
-        if expected_pytype is not None and not isinstance(value, expected_pytype):
-            actualy_pytype = type(value)
-            return [f"Value '{value}' is not of type {dtype}, is {actualy_pytype}"]
-
-        if dtype == "string":
-            issues = validate_string(value, rules)
-        elif is_numerical_type(dtype):
-            issues = validate_numerical(value, rules)
-        elif dtype == "array":
-            issues = validate_array(value, rules)
-        elif dtype == "geometry":
-            issues = validate_geometry(value, rules)
-        elif dtype == "bounding-box":
-            issues = validate_bbox(value, rules)
-        elif dtype == "object":
-            issues = validate_object(value, rules)
-        else:
-            continue
-
-        if len(issues) > 0:
-            return issues
-
-    return []
-
-
-# Geometry validation
-def validate_bbox(value, rules):
-    issues = []
-
-    if value["xmin"] > value["xmax"]:
-        issues.append(
-            f"Bounding box has xmin value greater than xmax value: {value['xmin']} > {value['xmax']}"
+# Same as the scheme detection in urllib.parse.urlparse
+REGEX_URI_SCHEME = re.compile("^[A-Za-z][A-Za-z0-9+\\-.]*:")
+REGEX_REASON_LOCATION = re.compile("\\[.*\\]$")
+
+# A check returns a boolean mask (True = invalid) for an Arrow array or None if not applicable.
+# The message function creates the issue for the first invalid value.
+Check = tuple[str, Callable[[Any], Optional[pa.Array]], Callable[[Any], str]]
+
+
+def validate_column(data, rules) -> list[str]:
+    """
+    Validate all values of a column against the property schema.
+
+    Returns one issue per violated rule.
+    """
+    validator = ColumnValidator(rules)
+    validator.update(data)
+    return validator.get_issues()
+
+
+class ColumnValidator:
+    """
+    Validates the values of a column against a property schema.
+
+    The property schema is compiled once into checks that are evaluated for all values at once
+    (using Arrow compute functions), so that large columns can be validated quickly.
+    The data can be passed in batches (see `update`), the number of violations and the first
+    offending rows are accumulated per rule.
+    """
+
+    def __init__(self, rules: dict, num_examples: int = 5, checks: Optional[list[Check]] = None):
+        self.rules = rules
+        self.dtype = rules.get("type")
+        self.num_examples = num_examples
+        # The checks can be compiled upfront and shared, e.g. see ColumnPlan
+        self.checks = compile_checks(rules) if checks is None else checks
+        # Violations per check: name => [count, rows, message]
+        self.violations: dict[str, list] = {}
+
+    def update(self, data, offset: int = 0, rows=None):
+        """
+        Validate a batch of values, which is a pandas Series, a pyarrow (Chunked)Array or a list.
+
+        The row numbers of the values can be given explicitly as array.
+        Otherwise, the index labels are reported for pandas Series and
+        the position plus the offset for all other data.
+        """
+        if rows is None and isinstance(data, pd.Series):
+            rows = data.index
+
+        if self.dtype == "geometry":
+            values = to_geometries(data)
+            for name, check, message in self.checks:
+                self._add(name, check(values), values, rows, offset, message)
+            return
+
+        values, invalid_types = to_arrow(data, self.dtype)
+        if invalid_types is not None:
+            self._add("type", invalid_types, data, rows, offset, self._type_message)
+            return
+
+        # Don't apply any further checks if the data type is invalid
+        invalid_types = check_type(values, self.dtype)
+        if invalid_types is not None:
+            message = lambda value: f"Value '{value}' is not of type {self.dtype}, is {values.type}"  # noqa: E731
+            self._add("type", invalid_types, values, rows, offset, message)
+            return
+
+        for name, check, message in self.checks:
+            self._add(name, check(values), values, rows, offset, message)
+
+    def merge(self, other: "ColumnValidator"):
+        """
+        Merge the violations of another validator for the same rules, e.g. for a subsequent batch.
+        """
+        for name, (count, rows, message) in other.violations.items():
+            if name not in self.violations:
+                self.violations[name] = [0, [], message]
+            violation = self.violations[name]
+            violation[0] += count
+            missing = self.num_examples - len(violation[1])
+            if missing > 0:
+                violation[1].extend(rows[:missing])
+
+    def get_issues(self) -> list[str]:
+        """
+        Get the issues found so far, one per violated rule.
+        """
+        issues = []
+        for count, rows, message in self.violations.values():
+            rows_str = ", ".join(map(str, rows))
+            if count > len(rows):
+                rows_str += ", ..."
+            noun = "row" if count == 1 else "rows"
+            issues.append(f"{message} Invalid in {count} {noun}: {rows_str}")
+        return issues
+
+    def _type_message(self, value) -> str:
+        return f"Value '{value}' is not of type {self.dtype}, is {type(value)}"
+
+    def _add(self, name, mask, values, rows, offset, message):
+        if mask is None:
+            return
+        elif isinstance(mask, dict):
+            # Separate masks for different kinds of violations
+            for kind, submask in mask.items():
+                self._add(f"{name}:{kind}", submask, values, rows, offset, message)
+            return
+
+        if isinstance(mask, (pa.Array, pa.ChunkedArray)):
+            mask = pc.fill_null(mask, False).to_numpy(zero_copy_only=False)
+        positions = np.flatnonzero(mask)
+        if len(positions) == 0:
+            return
+
+        if name not in self.violations:
+            if isinstance(values, pd.Series):
+                value = values.iloc[int(positions[0])]
+            else:
+                value = values[int(positions[0])]
+            if isinstance(value, pa.Scalar):
+                value = value.as_py()
+            self.violations[name] = [0, [], message(value)]
+
+        violation = self.violations[name]
+        violation[0] += len(positions)
+        missing = self.num_examples - len(violation[1])
+        if missing > 0:
+            positions = positions[:missing]
+            if rows is None:
+                violation[1].extend(int(p) + offset for p in positions)
+            else:
+                violation[1].extend(rows[positions].tolist())
+
+
+def to_arrow(data, dtype: str) -> tuple[Optional[pa.Array], Optional[np.ndarray]]:
+    """
+    Convert the data to an Arrow array.
+
+    If the data can't be converted, e.g. due to mixed types, the values are checked
+    individually and a mask for the values with invalid types is returned instead.
+    """
+    if isinstance(data, pa.ChunkedArray):
+        return data.combine_chunks(), None
+    elif isinstance(data, pa.Array):
+        return data, None
+
+    try:
+        return pa.array(data, from_pandas=True), None
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        expected_pytype = PYTHON_TYPES.get(dtype, object)
+        invalid = [not (is_null(value) or isinstance(value, expected_pytype)) for value in data]
+        return None, np.array(invalid, dtype=bool)
+
+
+def to_geometries(data) -> np.ndarray:
+    """
+    Convert the data to a numpy array of shapely geometries.
+    """
+    if isinstance(data, (pa.Array, pa.ChunkedArray)):
+        return shapely.from_wkb(np.asarray(data.to_numpy(zero_copy_only=False)))
+    return np.asarray(data)
+
+
+def is_null(value) -> bool:
+    isna = pd.isna(value)
+    return isinstance(isna, (bool, np.bool_)) and bool(isna)
+
+
+def check_type(values: pa.Array, dtype: str) -> Optional[np.ndarray]:
+    """
+    Check whether the Arrow type of the values is compatible with the data type.
+
+    Returns None if compatible, otherwise a mask with all non-null values.
+    """
+    pa_type = values.type
+    if dtype is None or pat.is_null(pa_type):
+        compatible = True
+    elif dtype == "boolean":
+        compatible = pat.is_boolean(pa_type)
+    elif is_integer_type(dtype):
+        # pandas represents nullable integer columns as floats
+        compatible = pat.is_integer(pa_type) or (
+            pat.is_floating(pa_type)
+            and pc.all(pc.equal(values, pc.floor(values))).as_py() is not False
         )
-    elif value["ymin"] > value["ymax"]:
-        issues.append(
-            f"Bounding box has ymin value greater than ymax value: {value['ymin']} > {value['ymax']}"
-        )
-
-    return issues
+    elif is_floating_type(dtype):
+        compatible = pat.is_floating(pa_type)
+    elif dtype == "string":
+        compatible = pat.is_string(pa_type) or pat.is_large_string(pa_type)
+    elif dtype == "binary":
+        compatible = pat.is_binary(pa_type) or pat.is_large_binary(pa_type)
+    elif dtype == "array":
+        compatible = pat.is_list(pa_type) or pat.is_large_list(pa_type)
+    elif dtype == "object":
+        compatible = pat.is_struct(pa_type) or pat.is_map(pa_type)
+    elif dtype == "date":
+        compatible = pat.is_date(pa_type) or pat.is_timestamp(pa_type)
+    elif dtype == "date-time":
+        compatible = pat.is_timestamp(pa_type)
+    elif dtype == "bounding-box":
+        compatible = pat.is_struct(pa_type)
+    else:
+        compatible = True
+
+    if compatible:
+        return None
+    return values.is_valid().to_numpy(zero_copy_only=False)
+
+
+def compile_checks(rules: dict) -> list[Check]:
+    """
+    Compile the property schema into a list of checks.
+    """
+    dtype = rules.get("type")
+    if dtype == "string":
+        return compile_string_checks(rules)
+    elif dtype is not None and (is_integer_type(dtype) or is_floating_type(dtype)):
+        return compile_numerical_checks(rules)
+    elif dtype == "array":
+        return compile_array_checks(rules)
+    elif dtype == "geometry":
+        return compile_geometry_checks(rules)
+    elif dtype == "bounding-box":
+        return compile_bbox_checks(rules)
+    elif dtype == "object":
+        return compile_object_checks(rules)
+    else:
+        return []
+
+
+def regex_mask(values: pa.Array, pattern: str) -> pa.Array:
+    """
+    Returns a mask for the values that do not match the regular expression at the beginning
+    (same as re.match).
+
+    Falls back to Python's re module for each unique value if the regular expression
+    is not supported by Arrow (RE2).
+    """
+    try:
+        return pc.invert(pc.match_substring_regex(values, f"^(?:{pattern})"))
+    except pa.ArrowInvalid:
+        regex = re.compile(pattern)
+        unique = pc.unique(values).drop_null()
+        invalid = [value for value in unique.to_pylist() if not regex.match(value)]
+        return pc.is_in(values, value_set=pa.array(invalid, type=values.type))
+
+
+def enum_mask(values: pa.Array, enum: list) -> pa.Array:
+    try:
+        value_set = pa.array(enum)
+        if value_set.type != values.type:
+            value_set = value_set.cast(values.type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        # Enum values that don't fit the data type (e.g. strings for integers) can't match
+        # any value, so the values are checked against the remaining enum values
+        value_set = pa.array([], type=values.type)
+        for value in enum:
+            try:
+                value_set = pa.concat_arrays([value_set, pa.array([value]).cast(values.type)])
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                continue
+    # is_in returns false for null values, but null values are always valid
+    return pc.and_(pc.invert(pc.is_in(values, value_set=value_set)), values.is_valid())
 
 
 # Geometry validation
-def validate_geometry(value, rules):
-    issues = []
+GEOMETRY_TYPE_IDS = {
+    "Point": 0,
+    "LineString": 1,
+    "LinearRing": 2,
+    "Polygon": 3,
+    "MultiPoint": 4,
+    "MultiLineString": 5,
+    "MultiPolygon": 6,
+    "GeometryCollection": 7,
+}
+# Number of geometries that are validated per thread
+GEOMETRY_CHUNK_SIZE = 50000
+
+
+def compile_geometry_checks(rules: dict) -> list[Check]:
+    checks = []
 
     geom_types = rules.get("geometryTypes", [])
-    if len(geom_types) > 0 and value.geom_type not in geom_types:
+    if len(geom_types) > 0:
         allowed = ", ".join(geom_types)
-        issues.append(
-            f"Geometry type '{value.geom_type}' is not one of the allowed types: {allowed}"
+        type_ids = [GEOMETRY_TYPE_IDS[t] for t in geom_types if t in GEOMETRY_TYPE_IDS]
+        checks.append(
+            (
+                "geometryTypes",
+                lambda v: np.isin(shapely.get_type_id(v), [-1] + type_ids, invert=True),
+                lambda g: f"Geometry type '{g.geom_type}' is not one of the allowed types: {allowed}",
+            )
         )
 
-    why = explain_validity(value)
-    if why != "Valid Geometry":
-        issues.append(f"Geometry {value} is not valid: {why}")
-
-    return issues
+    checks.append(
+        (
+            "valid",
+            invalid_geometries_by_reason,
+            lambda g: f"Geometry {g} is not valid: {explain_validity(g)}",
+        )
+    )
+
+    return checks
+
+
+def invalid_geometries_by_reason(values: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Returns a mask for the invalid geometries per reason (without the location).
+
+    The validity is checked in chunks in parallel threads, the reason is only
+    determined for the invalid geometries.
+    """
+    chunks = [
+        values[i : i + GEOMETRY_CHUNK_SIZE] for i in range(0, len(values), GEOMETRY_CHUNK_SIZE)
+    ]
+    if len(chunks) > 1:
+        with ThreadPoolExecutor() as executor:
+            valid = np.concatenate(list(executor.map(shapely.is_valid, chunks)))
+    else:
+        valid = shapely.is_valid(values)
+
+    # Missing geometries are valid
+    invalid = np.flatnonzero(~(valid | shapely.is_missing(values)))
+    if len(invalid) == 0:
+        return {}
+
+    # e.g. "Self-intersection[0.5 0.5]" => "Self-intersection"
+    reasons = np.array(
+        [REGEX_REASON_LOCATION.sub("", r) for r in shapely.is_valid_reason(values[invalid])]
+    )
+    masks = {}
+    # Order by first occurrence
+    unique, first = np.unique(reasons, return_index=True)
+    for reason in unique[np.argsort(first)]:
+        mask = np.zeros(len(values), dtype=bool)
+        mask[invalid[reasons == reason]] = True
+        masks[reason] = mask
+    return masks
+
+
+# Bounding box validation
+def compile_bbox_checks(rules: dict) -> list[Check]:
+    def field(values, name):
+        return pc.struct_field(values, name)
+
+    return [
+        (
+            "x",
+            lambda v: pc.greater(field(v, "xmin"), field(v, "xmax")),
+            lambda b: f"Bounding box has xmin value greater than xmax value: {b['xmin']} > {b['xmax']}",
+        ),
+        (
+            "y",
+            lambda v: pc.greater(field(v, "ymin"), field(v, "ymax")),
+            lambda b: f"Bounding box has ymin value greater than ymax value: {b['ymin']} > {b['ymax']}",
+        ),
+    ]
 
 
 # String validation
-def validate_string(value, rules):
-    issues = []
-    if "minLength" in rules and len(value) < rules["minLength"]:
-        issues.append(
-            f"String '{value}' is shorter than the minimum length of {rules['minLength']}."
+def compile_string_checks(rules: dict) -> list[Check]:
+    checks = []
+    if "minLength" in rules:
+        min_length = rules["minLength"]
+        checks.append(
+            (
+                "minLength",
+                lambda v: pc.less(pc.utf8_length(v), min_length),
+                lambda s: f"String '{s}' is shorter than the minimum length of {min_length}.",
+            )
         )
-    if "maxLength" in rules and len(value) > rules["maxLength"]:
-        issues.append(
-            f"String '{value}' is longer than the maximum length of {rules['maxLength']}."
+    if "maxLength" in rules:
+        max_length = rules["maxLength"]
+        checks.append(
+            (
+                "maxLength",
+                lambda v: pc.greater(pc.utf8_length(v), max_length),
+                lambda s: f"String '{s}' is longer than the maximum length of {max_length}.",
+            )
         )
-    if "pattern" in rules and not re.match(rules["pattern"], value):
-        issues.append(f"String '{value}' does not match the required pattern: {rules['pattern']}.")
-    if "enum" in rules and value not in rules["enum"]:
-        allowed = ", ".join(rules["enum"])
-        issues.append(
-            f"String '{value}' is not one of the allowed values in the enumeration: {allowed}"
+    if "pattern" in rules:
+        pattern = rules["pattern"]
+        checks.append(
+            (
+                "pattern",
+                lambda v: regex_mask(v, pattern),
+                lambda s: f"String '{s}' does not match the required pattern: {pattern}.",
+            )
+        )
+    if "enum" in rules:
+        enum = rules["enum"]
+        allowed = ", ".join(map(str, enum))
+        checks.append(
+            (
+                "enum",
+                lambda v: enum_mask(v, enum),
+                lambda s: f"String '{s}' is not one of the allowed values in the enumeration: {allowed}",
+            )
         )
     if "format" in rules:
-        if rules["format"] == "email" and not REGEX_EMAIL.match(value):
-            issues.append(f"String '{value}' is not a valid email address.")
-        if rules["format"] == "uri" and not urlparse(value).scheme:
-            issues.append(f"String '{value}' is not a valid URI.")
-        if rules["format"] == "uuid" and not REGEX_UUID.match(value):
-            issues.append(f"String '{value}' is not a valid UUID.")
-    return issues
+        formats = {
+            "email": (REGEX_EMAIL, "a valid email address"),
+            "uri": (REGEX_URI_SCHEME, "a valid URI"),
+            "uuid": (REGEX_UUID, "a valid UUID"),
+        }
+        if rules["format"] in formats:
+            regex, what = formats[rules["format"]]
+            checks.append(
+                (
+                    "format",
+                    lambda v: regex_mask(v, regex.pattern),
+                    lambda s: f"String '{s}' is not {what}.",
+                )
+            )
+    return checks
 
 
 # Numerical validation
-def validate_numerical(value, rules):
-    issues = []
-    if "minimum" in rules and value < rules["minimum"]:
-        issues.append(
-            f"Value {value} is less than the minimum allowed value of {rules['minimum']}."
-        )
-    if "maximum" in rules and value > rules["maximum"]:
-        issues.append(
-            f"Value {value} is greater than the maximum allowed value of {rules['maximum']}."
-        )
-    if "exclusiveMinimum" in rules and value <= rules["exclusiveMinimum"]:
-        issues.append(
-            f"Value {value} is less than or equal to the exclusive minimum value of {rules['exclusiveMinimum']}."
-        )
-    if "exclusiveMaximum" in rules and value >= rules["exclusiveMaximum"]:
-        issues.append(
-            f"Value {value} is greater than or equal to the exclusive maximum value of {rules['exclusiveMaximum']}."
-        )
-    if "enum" in rules and value not in rules["enum"]:
-        allowed = ", ".join(map(str, rules["enum"]))
-        issues.append(
-            f"Integer '{value}' is not one of the allowed values in the enumeration: {allowed}"
+def compile_numerical_checks(rules: dict) -> list[Check]:
+    checks = []
+    comparisons = [
+        ("minimum", pc.less, "less than the minimum allowed value of"),
+        ("maximum", pc.greater, "greater than the maximum allowed value of"),
+        ("exclusiveMinimum", pc.less_equal, "less than or equal to the exclusive minimum value of"),
+        (
+            "exclusiveMaximum",
+            pc.greater_equal,
+            "greater than or equal to the exclusive maximum value of",
+        ),
+    ]
+    for key, compare, text in comparisons:
+        if key in rules:
+            limit = rules[key]
+            checks.append(
+                (
+                    key,
+                    lambda v, compare=compare, limit=limit: compare(v, limit),
+                    lambda n, text=text, limit=limit: f"Value {n} is {text} {limit}.",
+                )
+            )
+    if "enum" in rules:
+        enum = rules["enum"]
+        allowed = ", ".join(map(str, enum))
+        checks.append(
+            (
+                "enum",
+                lambda v: enum_mask(v, enum),
+                lambda n: f"Integer '{n}' is not one of the allowed values in the enumeration: {allowed}",
+            )
         )
-    return issues
+    return checks
 
 
 # Array validation
-def validate_array(values, rules):
-    issues = []
-
-    item_schema = rules.get("items", {})
-
-    if "minItems" in rules and len(values) < rules["minItems"]:
-        issues.append(f"Array has fewer items than the minimum of {rules['minItems']}.")
-    if "maxItems" in rules and len(values) > rules["maxItems"]:
-        issues.append(f"Array has more items than the maximum of {rules['maxItems']}.")
-
-    if "uniqueItems" in rules and rules["uniqueItems"]:
-        item_dtype = item_schema.get("type")
-        if is_scalar_type(item_dtype) and len(values) != len(set(values)):
-            issues.append("Array items are not unique.")
-        else:
-            pass  # not supported for non-scalar types
+def compile_array_checks(rules: dict) -> list[Check]:
+    checks = []
+    if "minItems" in rules:
+        min_items = rules["minItems"]
+        checks.append(
+            (
+                "minItems",
+                lambda v: pc.less(pc.list_value_length(v), min_items),
+                lambda a: f"Array has fewer items than the minimum of {min_items}.",
+            )
+        )
+    if "maxItems" in rules:
+        max_items = rules["maxItems"]
+        checks.append(
+            (
+                "maxItems",
+                lambda v: pc.greater(pc.list_value_length(v), max_items),
+                lambda a: f"Array has more items than the maximum of {max_items}.",
+            )
+        )
+    item_dtype = rules.get("items", {}).get("type")
+    if rules.get("uniqueItems") and is_scalar_type(item_dtype):
+        # not supported for non-scalar types
+        checks.append(("uniqueItems", duplicates_mask, lambda a: "Array items are not unique."))
 
     # todo: Further validation for 'items' if necessary
-    return issues
+    return checks
+
+
+def duplicates_mask(values: pa.Array) -> np.ndarray:
+    """
+    Returns a mask for the lists that contain duplicate items.
+    """
+    items = pa.table(
+        {
+            "row": pc.list_parent_indices(values),
+            "item": pc.list_flatten(values),
+        }
+    )
+    unique = items.group_by(["row", "item"]).aggregate([])
+    unique_counts = np.zeros(len(values), dtype=np.int64)
+    np.add.at(unique_counts, unique["row"].to_numpy(), 1)
+    lengths = pc.fill_null(pc.list_value_length(values), 0).to_numpy()
+    return unique_counts < lengths
 
 
 # Object validation
-def validate_object(value, rules):
-    issues = []
-
-    if "minProperties" in rules and len(value) < rules["minProperties"]:
-        issues.append(f"Object has fewer properties than the minimum of {rules['minProperties']}.")
-    if "maxProperties" in rules and len(value) > rules["maxProperties"]:
-        issues.append(f"Object has more properties than the maximum of {rules['maxProperties']}.")
+def compile_object_checks(rules: dict) -> list[Check]:
+    checks = []
+    if "minProperties" in rules:
+        min_props = rules["minProperties"]
+        checks.append(
+            (
+                "minProperties",
+                lambda v: pc.less(num_properties(v), min_props),
+                lambda o: f"Object has fewer properties than the minimum of {min_props}.",
+            )
+        )
+    if "maxProperties" in rules:
+        max_props = rules["maxProperties"]
+        checks.append(
+            (
+                "maxProperties",
+                lambda v: pc.greater(num_properties(v), max_props),
+                lambda o: f"Object has more properties than the maximum of {max_props}.",
+            )
+        )
 
-    props = rules.get("properties", {})
     # todo:
     # other_props = rules.get("additionalProperties", False)
     # pattern_props = rules.get("patternProperties", {})
-    for key, val in props.items():
-        if key not in value:
-            issues.append(f"Key '{key}' is missing from the object.")
+    for key in rules.get("properties", {}).keys():
+        checks.append(
+            (
+                f"properties.{key}",
+                lambda v, key=key: missing_key_mask(v, key),
+                lambda o, key=key: f"Key '{key}' is missing from the object.",
+            )
+        )
         # todo: Further validation based on the type of property
 
-    return issues
+    return checks
+
+
+def map_to_list(values: pa.Array) -> pa.Array:
+    return values.cast(pa.list_(pa.struct([values.type.key_field, values.type.item_field])))
+
+
+def num_properties(values: pa.Array) -> Union[pa.Array, np.ndarray]:
+    if pat.is_map(values.type):
+        return pc.list_value_length(map_to_list(values))
+    # Structs have the same properties for all values
+    null_mask = values.is_null().to_numpy(zero_copy_only=False)
+    return pa.array(np.full(len(values), values.type.num_fields), mask=null_mask)
+
+
+def missing_key_mask(values: pa.Array, key: str) -> Union[pa.Array, np.ndarray]:
+    if pat.is_map(values.type):
+        entries = map_to_list(values)
+        has_key = pc.equal(pc.struct_field(pc.list_flatten(entries), "key"), key)
+        rows = pc.filter(pc.list_parent_indices(entries), has_key)
+        mask = np.ones(len(values), dtype=bool)
+        mask[rows.to_numpy()] = False
+        return np.logical_and(mask, values.is_valid().to_numpy(zero_copy_only=False))
+    elif values.type.get_field_index(key) == -1:
+        return values.is_valid()
+    else:
+        return None
@@ -1,12 +1,23 @@
-from typing import Optional
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterator, Optional, Union
+
+from jsonschema.exceptions import ValidationError
 
 from ..create_jsonschema import CreateJsonSchema
 from ..encoding.geojson import GeoJSON
+from ..validate_schema import ValidateSchema, make_picklable, resource_cache
+from ..vecorel import util
 from ..vecorel.typing import SchemaMapping
+from ..vecorel.util import reservoir_sample
 from .base import Validator
 
 
 class GeoJSONValidator(Validator):
+    # Number of features that are validated at once
+    chunk_size: int = 1000
+
     def __init__(self, encoding: GeoJSON):
         super().__init__(encoding, mixed_versions=True)
         self.encoding: GeoJSON = encoding  # for correct type hinting
@@ -21,9 +32,14 @@ class GeoJSONValidator(Validator):
         :param num: Optional number of records to validate. Only applies to FeatureCollections.
         :param schema_map: Optional mapping of schema names to their definitions.
         """
-        # Load data
+        # Load the GeoJSON object, for FeatureCollections without the features
         try:
-            data = self.encoding.read_geojson(num=num, schema_map=schema_map)
+            data = self.encoding.read_top_level()
+            gj_type = data.get("type")
+            if gj_type == "Feature":
+                data = self.encoding.read_geojson(schema_map=schema_map)
+            elif gj_type != "FeatureCollection":
+                raise ValueError("JSON file must contain a FeatureCollection or Feature")
         except Exception as e:
             return self.error(e)
 
@@ -39,6 +55,7 @@ class GeoJSONValidator(Validator):
         # Validate GeoJSON metadata (per collection)
         jsonschema_instance = self._create_jsonschema_command()
         jsonschemas = {}
+        feature_schemas = {}
         datatypes = {}
         for cid, cschema in schemas.items():
             version = cschema.get_core_version()
@@ -51,13 +68,18 @@ class GeoJSONValidator(Validator):
                 validator=self,
             )
 
-            jsonschemas[cid] = jsonschema_instance.create_from_dict(
-                vecorel_schema, datatypes[version]
-            )
+            if gj_type == "Feature":
+                jsonschemas[cid] = jsonschema_instance.create_from_dict(
+                    vecorel_schema, datatypes[version]
+                )
+            else:
+                jsonschemas[cid], feature_schemas[cid] = (
+                    jsonschema_instance.create_feature_schemas_from_dict(
+                        vecorel_schema, datatypes[version], set(collection.keys())
+                    )
+                )
 
         # Validate data
-        gj_type = data.get("type")
-        errors = []
         if gj_type == "Feature":
             collection = data.get("properties", {}).get("collection")
             if not collection:
@@ -71,33 +93,111 @@ class GeoJSONValidator(Validator):
                 self.error(error)
 
         else:  # FeatureCollection
-            features = data.get("features", [])
-            if len(features) == 0:
+            # Validate the FeatureCollection without the features
+            data["features"] = []
+            for jsonschema in jsonschemas.values():
+                errors = self.validate_json_schema(data, jsonschema)
+                for error in errors:
+                    self.error(error)
+
+            if self.level == "metadata":
+                self.warning("Data was not validated, only structural checks were applied")
+                return
+
+            # Stream the features and validate them one by one
+            try:
+                count = 0
+                for errors, num_features in self.validate_features(feature_schemas, num=num):
+                    count += num_features
+                    for error in errors:
+                        self.error(error)
+            except Exception as e:
+                return self.error(e)
+
+            if count == 0:
                 self.warning("No data to validate")
-            if not features:
                 return self.error("FeatureCollection is empty")
 
-            grouped = {}
-            for index, feature in enumerate(features):
-                collection = feature.get("properties", {}).get("collection")
-                if not collection:
-                    self.error(f"Feature {index + 1}: Missing the 'collection' property")
-                    continue
-
-                if collection not in jsonschemas:
-                    self.error(
-                        f"Feature {index + 1}: Collection '{collection}' not found in schemas"
-                    )
-                    continue
-
-                if collection not in grouped:
-                    grouped[collection] = []
-                grouped[collection].append(feature)
+    def validate_features(
+        self, schemas: dict[str, dict], num: Optional[int] = None
+    ) -> Iterator[tuple[list, int]]:
+        """
+        Validate the (first num) features of the FeatureCollection against the feature schemas
+        of the collection they belong to.
 
-            for cid, jsonschema in jsonschemas.items():
-                # not super clean to just override the features in the original dict,
-                # but should be most memory efficient
-                data["features"] = grouped.get(cid, [])
-                errors = self.validate_json_schema(data, jsonschema)
-                for error in errors:
-                    self.error(error)
+        If a sample size is set (see set_sample), a random sample of the features is validated.
+        The features are streamed and validated in chunks (see chunk_size), if jobs is greater
+        than 1 in parallel processes (see set_jobs).
+        Yields the errors and the number of features for each chunk, in order.
+        """
+        if self.sample is not None:
+            # The sample is drawn from all features
+            num = None
+        features = enumerate(self.encoding.iter_features(num=num))
+        if self.sample is not None:
+            features, total = reservoir_sample(features, self.sample, seed=self.seed)
+            if total > self.sample:
+                self.warning(
+                    f"Data was not fully validated, only a random sample of {self.sample} features was checked"
+                )
+            features = iter(features)
+        chunks = iter(lambda: list(islice(features, self.chunk_size)), [])
+
+        if self.jobs <= 1:
+            validators = {
+                cid: self._create_validate_schema_command(schema) for cid, schema in schemas.items()
+            }
+            for chunk in chunks:
+                yield _validate_features(chunk, validators), len(chunk)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=self.jobs,
+            initializer=_init_worker,
+            initargs=(dict(resource_cache), util.offline),
+        ) as executor:
+            # Limit the number of pending chunks so that the file is not read completely into memory
+            pending = deque()
+            for chunk in chunks:
+                pending.append(
+                    (executor.submit(_validate_features_worker, chunk, schemas), len(chunk))
+                )
+                if len(pending) > self.jobs * 2:
+                    future, size = pending.popleft()
+                    yield future.result(), size
+            while pending:
+                future, size = pending.popleft()
+                yield future.result(), size
+
+
+def _init_worker(resources: dict, offline: bool):
+    resource_cache.update(resources)
+    util.offline = offline
+
+
+def _validate_features_worker(features: list[tuple[int, dict]], schemas: dict[str, dict]) -> list:
+    validators = {cid: ValidateSchema(schema) for cid, schema in schemas.items()}
+    errors = _validate_features(features, validators)
+    return [make_picklable(e) if isinstance(e, ValidationError) else e for e in errors]
+
+
+def _validate_features(
+    features: list[tuple[int, dict]], validators: dict[str, ValidateSchema]
+) -> list[Union[ValidationError, str]]:
+    errors = []
+    for index, feature in features:
+        collection = (feature.get("properties") or {}).get("collection")
+        if not collection:
+            errors.append(f"Feature {index + 1}: Missing the 'collection' property")
+            continue
+
+        if collection not in validators:
+            errors.append(f"Feature {index + 1}: Collection '{collection}' not found in schemas")
+            continue
+
+        for error in validators[collection].validate(feature):
+            # Make the path relative to the FeatureCollection
+            error.path.extendleft([index, "features"])
+            errors.append(error)
+
+    return errors
@@ -1,25 +1,37 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.types as pat
 
 from ..encoding.geoparquet import GeoParquet
-from ..parquet.types import PA_TYPE_CHECK
+from ..parquet.plan import ColumnPlan
+from ..parquet.types import is_enum, is_integer_type, is_numerical_type
 from ..vecorel.typing import SchemaMapping
 from .base import Validator
-from .data import validate_column
+from .data import ColumnValidator
+
+# Column plans per collection ID (None if the file contains a single collection) for each column
+ColumnPlans = dict[str, dict[Optional[str], ColumnPlan]]
 
 
 class GeoParquetValidator(Validator):
+    # Number of threads that validate row groups concurrently, None for the Python default.
+    # Roughly one row group per thread is held in memory.
+    max_workers: Optional[int] = None
+
     def __init__(self, encoding: GeoParquet):
         super().__init__(encoding)
         self.encoding: GeoParquet = encoding  # for correct type hinting
 
     def _validate(self, num: Optional[int] = None, schema_map: SchemaMapping = {}):
-        validate_data = num is None or num > 0
+        validate_data = num is None or num > 0 or self.sample is not None
 
-        # Load data
+        # Load metadata, the data is loaded later row group by row group
         try:
-            data = self.encoding.read(num=num, schema_map=schema_map, hydrate=True)
+            self.encoding.get_parquet_metadata()
         except Exception as e:
             return self.error(e)
 
@@ -42,9 +54,21 @@ class GeoParquetValidator(Validator):
             schema_map=schema_map,
             validator=self,
         )
+        # Resolve the schemas for each collection once, the data is validated for each collection separately
+        collection_schemas = {}
+        if validate_data and has_multiple_collections:
+            for cid, cschema in schemas.items():
+                collection_schemas[cid] = cschema.merge_schemas(
+                    schema_map=schema_map,
+                    custom_schemas=collection.get_custom_schemas(),
+                    validator=self,
+                )
 
-        # Check that all required fields are present
-        columns = data.columns
+        # Check that all required fields are present,
+        # the collection properties are merged into the data (see hydrate_from_collection)
+        properties = self.encoding.get_properties()
+        collection_only = collection.get_collection_only_properties(schema_map=schema_map)
+        columns = list(properties.keys()) + [k for k in collection if k not in collection_only]
         required_props = schema.get("required", [])
         collection_props = schema.get("collection", {})
         for key in required_props:
@@ -53,18 +77,19 @@ class GeoParquetValidator(Validator):
 
         # Validate whether the Parquet schema complies with the property schemas
         geo = self.encoding.get_geoparquet_metadata()
-        property_schemas = schema.get("properties", {})
+        plan = schema.get_plan()
         parquet_schema = self.encoding.get_parquet_schema().to_arrow_schema()
-        properties = self.encoding.get_properties()
+        column_plans: ColumnPlans = {}
         for key in properties:
             # Ignore fields without a schema
-            if key not in property_schemas:
+            column_plan = plan.get(key)
+            if column_plan is None:
                 self.warning(f"{key}: No schema defined")
                 continue
 
-            prop_schema = property_schemas[key]
+            prop_schema = column_plan.schema
             # Make sure the schema has a data type assigned
-            dtype = prop_schema.get("type")
+            dtype = column_plan.dtype
             if dtype is None:
                 self.warning(f"{key}: No type specified")
                 continue
@@ -73,18 +98,17 @@ class GeoParquetValidator(Validator):
             pq_type = pq_field.type
 
             # Does the field (dis)allow null?
-            nullable = key not in schema.get("required", [])
+            nullable = column_plan.nullable
             if not has_multiple_collections and nullable != pq_field.nullable:
                 self.error(
                     f"{key}: Nullability differs, is {pq_field.nullable} but must be {nullable}",
                 )
 
             # Is the data type of the field correct?
-            pa_check = PA_TYPE_CHECK.get(dtype)
-            if pa_check is None:
+            if column_plan.type_check is None:
                 self.warning(f"{key}: Validating {dtype} is not supported yet")
                 continue
-            elif not pa_check(pq_type):
+            elif not column_plan.type_check(pq_type):
                 self.error(f"{key}: Data type invalid, is {pq_type} but must be {dtype}")
                 continue
 
@@ -100,48 +124,226 @@ class GeoParquetValidator(Validator):
             elif dtype == "geometry":
                 self.validate_geometry_column(key, prop_schema, geo)
 
-            # Validate data of the column
-            issues = []
+            # Check the column statistics instead of the data
+            if self.level == "metadata" and not has_multiple_collections:
+                self.validate_statistics(key, prop_schema, required=not nullable)
+
+            # Validate data of the column later
             if validate_data and not has_multiple_collections:
-                issues = validate_column(data[key], prop_schema)
+                column_plans[key] = {None: column_plan}
             elif validate_data and has_multiple_collections:
                 # Validate data for each collection separately
-                for cid, cschema in schemas.items():
-                    vecorel_schema = cschema.merge_schemas(
-                        schema_map=schema_map,
-                        custom_schemas=collection.get_custom_schemas(),
-                        validator=self,
-                    )
-                    sub_prop_schema = vecorel_schema.get("properties", {}).get(key, {})
-                    sub_data = data[data["collection"] == cid]
-                    sub_issues = validate_column(sub_data[key], sub_prop_schema)
-                    issues.extend(sub_issues)
+                column_plans[key] = {}
+                for cid, vecorel_schema in collection_schemas.items():
+                    collection_plan = vecorel_schema.get_plan().get(key)
+                    if collection_plan is not None:
+                        column_plans[key][cid] = collection_plan
+
+        # Validate the data
+        if validate_data and len(column_plans) > 0:
+            try:
+                validators = self.validate_data(
+                    column_plans, num=num, collection_id=collection.get("collection")
+                )
+            except Exception as e:
+                return self.error(e)
 
-            for issue in issues:
-                self.error(f"{key}: {issue}")
+            for key, column_validators in validators.items():
+                for validator in column_validators.values():
+                    for issue in validator.get_issues():
+                        self.error(f"{key}: {issue}")
 
         # Show a note once if data was not validated
-        if not validate_data:
+        if not validate_data and self.level == "metadata":
+            self.warning(
+                "Data was not validated, only structural checks and statistics were applied"
+            )
+        elif not validate_data:
             self.warning("Data was not validated, only structural checks were applied")
-        if (
-            validate_data
-            and num is not None
-            and num < self.encoding.get_parquet_metadata().num_rows
-        ):
+        num_rows = self.encoding.get_parquet_metadata().num_rows
+        if self.sample is not None and self.sample < num_rows:
+            self.warning(
+                f"Data was not fully validated, only a random sample of {self.sample} rows was checked",
+            )
+        elif validate_data and self.sample is None and num is not None and num < num_rows:
             self.warning(
                 f"Data was not fully validated, only the first {num} rows were checked",
             )
 
+    def validate_data(
+        self, columns: ColumnPlans, num: Optional[int] = None, collection_id=None
+    ) -> dict[str, dict[Optional[str], ColumnValidator]]:
+        """
+        Validate the data of the given columns.
+
+        If a sample size is set (see set_sample), a random sample of rows is validated.
+        Otherwise, if num is None, all row groups are validated concurrently (see max_workers),
+        or the first num rows.
+        If the file doesn't contain a collection column, all rows belong to collection_id.
+        Returns the column validators that hold the issues for each column and collection.
+        """
+        properties = list(columns.keys())
+        multiple_collections = any(None not in plans for plans in columns.values())
+        if multiple_collections and "collection" not in properties:
+            if "collection" in self.encoding.get_properties():
+                properties.append("collection")
+
+        def validate_table(table: pa.Table, row_numbers: np.ndarray):
+            # Determine the rows of each collection once for all columns
+            groups = None
+            if multiple_collections and "collection" in table.column_names:
+                groups = GeoParquetValidator.group_rows(table["collection"])
+
+            validators = {}
+            for key, plans in columns.items():
+                validators[key] = {}
+                for cid, column_plan in plans.items():
+                    validator = column_plan.create_validator()
+                    validators[key][cid] = validator
+
+                    values = table[key]
+                    rows = row_numbers
+                    if cid is not None and groups is not None:
+                        indices = groups.get(cid)
+                        if indices is None:
+                            continue
+                        values = values.take(indices)
+                        rows = row_numbers[indices]
+                    elif cid is not None and cid != collection_id:
+                        continue
+
+                    validator.update(values, rows=rows)
+
+            return validators
+
+        if num is not None and self.sample is None:
+            table = self.encoding.read_table(num=num, properties=properties)
+            return validate_table(table, np.arange(table.num_rows))
+
+        metadata = self.encoding.get_parquet_metadata()
+        row_groups = range(metadata.num_row_groups)
+        offsets = np.cumsum([0] + [metadata.row_group(i).num_rows for i in row_groups])
+
+        # Row numbers (within the row group) to validate per row group, None for all rows
+        selection = {}
+        if self.sample is not None:
+            rng = np.random.default_rng(self.seed)
+            size = min(self.sample, metadata.num_rows)
+            sample = np.sort(rng.choice(metadata.num_rows, size=size, replace=False))
+            # Only the row groups that contain sampled rows are read
+            sample_groups = np.searchsorted(offsets, sample, side="right") - 1
+            for index in np.unique(sample_groups):
+                selection[int(index)] = sample[sample_groups == index] - offsets[index]
+            row_groups = list(selection.keys())
+
+        def validate_row_group(index: int):
+            table = self.encoding.read_row_group(index, properties=properties)
+            rows = selection.get(index)
+            if rows is None:
+                rows = np.arange(table.num_rows)
+            else:
+                table = table.take(rows)
+            return validate_table(table, rows + offsets[index])
+
+        results = {}
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            # Merge the results in the order of the row groups
+            for validators in executor.map(validate_row_group, row_groups):
+                for key, column_validators in validators.items():
+                    if key not in results:
+                        results[key] = column_validators
+                        continue
+                    for cid, validator in column_validators.items():
+                        results[key][cid].merge(validator)
+
+        return results
+
+    @staticmethod
+    def group_rows(values: pa.ChunkedArray) -> dict:
+        """
+        Get the row indices for each distinct (non-null) value.
+        """
+        encoded = values.combine_chunks().dictionary_encode()
+        codes = pc.fill_null(encoded.indices, -1).to_numpy()
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(encoded.dictionary) + 1))
+        return {
+            value: order[bounds[code] : bounds[code + 1]]
+            for code, value in enumerate(encoded.dictionary.to_pylist())
+        }
+
+    def validate_statistics(self, key: str, prop_schema: dict, required: bool = False):
+        """
+        Validate a column based on the statistics in the Parquet footer, without reading the data.
+
+        Checks the number of null values for required columns, the minimum and maximum values
+        for numerical columns and whether the minimum and maximum values are part of
+        the enumeration (if any).
+        """
+        metadata = self.encoding.get_parquet_metadata()
+        null_count = 0
+        minimum = None
+        maximum = None
+        for i in range(metadata.num_row_groups):
+            row_group = metadata.row_group(i)
+            stats = None
+            for j in range(row_group.num_columns):
+                column = row_group.column(j)
+                if column.path_in_schema == key:
+                    stats = column.statistics
+                    break
+            # Nested columns and columns without statistics can't be checked
+            if stats is None:
+                return
+
+            if stats.has_null_count:
+                null_count += stats.null_count
+            if stats.has_min_max:
+                minimum = stats.min if minimum is None else min(minimum, stats.min)
+                maximum = stats.max if maximum is None else max(maximum, stats.max)
+
+        if required and null_count > 0:
+            self.error(f"{key}: Required field contains {null_count} null values")
+
+        if minimum is None or maximum is None:
+            return
+
+        dtype = prop_schema.get("type")
+        if is_numerical_type(dtype):
+            if "minimum" in prop_schema and minimum < prop_schema["minimum"]:
+                self.error(
+                    f"{key}: Value {minimum} is less than the minimum allowed value of {prop_schema['minimum']}."
+                )
+            if "maximum" in prop_schema and maximum > prop_schema["maximum"]:
+                self.error(
+                    f"{key}: Value {maximum} is greater than the maximum allowed value of {prop_schema['maximum']}."
+                )
+            if "exclusiveMinimum" in prop_schema and minimum <= prop_schema["exclusiveMinimum"]:
+                self.error(
+                    f"{key}: Value {minimum} is less than or equal to the exclusive minimum value of {prop_schema['exclusiveMinimum']}."
+                )
+            if "exclusiveMaximum" in prop_schema and maximum >= prop_schema["exclusiveMaximum"]:
+                self.error(
+                    f"{key}: Value {maximum} is greater than or equal to the exclusive maximum value of {prop_schema['exclusiveMaximum']}."
+                )
+
+        # The minimum and maximum are values that occur in the data, so they must be allowed
+        if is_enum(prop_schema) and (dtype == "string" or is_integer_type(dtype)):
+            allowed = ", ".join(map(str, prop_schema["enum"]))
+            for value in sorted({minimum, maximum}):
+                if value not in prop_schema["enum"]:
+                    self.error(
+                        f"{key}: Value '{value}' is not one of the allowed values in the enumeration: {allowed}"
+                    )
+
     def validate_geometry_column(self, key, prop_schema, geo):
         columns = geo.get("columns", {})
         if key not in columns:
             self.error(f"{key}: Geometry column not found in GeoParquet metadata")
 
-        schema_geo_types = prop_schema.get("geometryTypes", [])
-        schema_geo_types.sort()
+        schema_geo_types = sorted(prop_schema.get("geometryTypes", []))
         if len(schema_geo_types) > 0:
-            gp_geo_types = columns[key].get("geometry_types", [])
-            gp_geo_types.sort()
+            gp_geo_types = sorted(columns[key].get("geometry_types", []))
             if len(gp_geo_types) == 0:
                 self.warning(f"{key}: No geometry types specified in GeoParquet metadata")
 
@@ -0,0 +1,137 @@
+import copy
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Iterator, Optional
+
+
+def read_only(self, *args, **kwargs):
+    raise TypeError("Cached data is read-only, use copy.deepcopy() to get a modifiable copy")
+
+
+class FrozenDict(dict):
+    """
+    A read-only dict for data that is shared between callers, e.g. cached schemas.
+
+    copy() returns a modifiable shallow copy, copy.deepcopy() a modifiable deep copy.
+    """
+
+    __setitem__ = __delitem__ = __ior__ = read_only
+    clear = pop = popitem = setdefault = update = read_only
+
+    def copy(self) -> dict:
+        return dict(self)
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo) -> dict:
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list):
+    """
+    A read-only list for data that is shared between callers, e.g. cached schemas.
+
+    copy() returns a modifiable shallow copy, copy.deepcopy() a modifiable deep copy.
+    """
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = read_only
+    append = clear = extend = insert = pop = remove = reverse = sort = read_only
+
+    def copy(self) -> list:
+        return list(self)
+
+    def __copy__(self) -> list:
+        return list(self)
+
+    def __deepcopy__(self, memo) -> list:
+        return [copy.deepcopy(value, memo) for value in self]
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+def freeze(data: Any) -> Any:
+    """
+    Convert dicts and lists (recursively) into their read-only counterparts.
+    """
+    if isinstance(data, (FrozenDict, FrozenList)):
+        return data
+    elif isinstance(data, dict):
+        return FrozenDict({key: freeze(value) for key, value in data.items()})
+    elif isinstance(data, list):
+        return FrozenList([freeze(value) for value in data])
+    else:
+        return data
+
+
+class LRUCache(MutableMapping):
+    """
+    A thread-safe cache with read-only values that evicts the least recently used
+    entries once the total size of the entries exceeds max_size (in bytes).
+    """
+
+    def __init__(self, max_size: int = 64 * 1024 * 1024):
+        self.max_size = max_size
+        self.size = 0
+        self._entries: OrderedDict[str, tuple[Any, int]] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def set(self, key: str, value: Any, size: Optional[int] = None) -> Any:
+        """
+        Store a value, the size is estimated from the JSON encoding of the value if not given.
+
+        Returns the read-only value.
+        """
+        if size is None:
+            size = self.estimate_size(value)
+        value = freeze(value)
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.size += size
+            # Evict the least recently used entries, but always keep the latest entry
+            while self.size > self.max_size and len(self._entries) > 1:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+        return value
+
+    @staticmethod
+    def estimate_size(value: Any) -> int:
+        if isinstance(value, (bytes, str)):
+            return len(value)
+        try:
+            return len(json.dumps(value, default=str))
+        except (TypeError, ValueError):
+            return 0
+
+    def __getitem__(self, key: str) -> Any:
+        with self._lock:
+            value, _ = self._entries[key]
+            self._entries.move_to_end(key)
+            return value
+
+    def __setitem__(self, key: str, value: Any):
+        self.set(key, value)
+
+    def __delitem__(self, key: str):
+        with self._lock:
+            self.size -= self._entries.pop(key)[1]
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._entries.keys()))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
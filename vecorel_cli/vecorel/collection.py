@@ -1,13 +1,16 @@
+import json
 from typing import Optional, Union
 
 from ..validation.base import Validator
 from ..vecorel.typing import SchemaMapping
-from .schemas import RawSchemas, Schemas, VecorelSchema
+from .schemas import FrozenVecorelSchema, RawSchemas, Schemas, VecorelSchema
 
 
 class Collection(dict):
     def __init__(self, collection: Optional[dict] = None):
         super().__init__(collection or {})
+        # Merged schemas by the schemas, custom schemas and schema map they were merged from
+        self._merged_schemas: dict[str, FrozenVecorelSchema] = {}
 
     def is_empty(self) -> bool:
         return len(self) == 0
@@ -48,13 +51,30 @@ class Collection(dict):
 
     def merge_schemas(
         self, schema_map: SchemaMapping = {}, validator: Optional[Validator] = None
-    ) -> VecorelSchema:
+    ) -> FrozenVecorelSchema:
+        """
+        Merge the schemas of all collections and the custom schemas into a single schema.
+
+        The result is cached by the schema URIs, the custom schemas and the schema map,
+        so it's merged again only if the schemas or the custom schemas change.
+        The schema is read-only, use copy.deepcopy() to get a modifiable copy.
+        """
+        uris = self.get_schemas().unique_schemas()
         custom_schemas = self.get_custom_schemas()
-        resolved = self.resolve_schemas(
+        key = json.dumps([sorted(uris), custom_schemas, schema_map], sort_keys=True, default=str)
+        if key in self._merged_schemas:
+            return self._merged_schemas[key]
+
+        resolved = VecorelSchema.resolve_schema_uris(
+            uris,
             schema_map=schema_map,
             validator=validator,
-        ).values()
-        return VecorelSchema.merge_all(*resolved, custom_schemas)
+        )
+        merged = FrozenVecorelSchema(VecorelSchema.merge_all(*resolved.values(), custom_schemas))
+        # Don't cache incomplete results, the errors must be reported again
+        if len(resolved) == len(uris):
+            self._merged_schemas = {key: merged}
+        return merged
 
     def get_collection_context(self, schema_map: SchemaMapping = {}) -> dict[str, bool]:
         """
@@ -4,14 +4,22 @@ import copy
 import re
 from typing import TYPE_CHECKING, Optional, Union
 
+from ..parquet.plan import SchemaPlan
 from ..vecorel.typing import RawSchemas, SchemaMapping
-from ..vecorel.util import load_file
+from ..vecorel.util import load_files
+from .cache import freeze, read_only
 from .version import is_sdl_supported, sdl_uri, vecorel_version
 
 if TYPE_CHECKING:
     from ..validation.base import Validator
 
 
+class SchemaLoadError(ValueError):
+    """
+    A schema can't be loaded, e.g. because it's not available or due to network errors.
+    """
+
+
 class VecorelSchema(dict):
     sdl_pattern = r"https://vecorel.org/sdl/v([^/]+)/schema.json"
     sdl_schema = sdl_uri
@@ -33,25 +41,29 @@ class VecorelSchema(dict):
     def resolve_schema_uris(
         uris: set[str], schema_map: SchemaMapping = {}, validator: Optional[Validator] = None
     ) -> dict[str, VecorelSchema]:
-        # Load all schemas
-        loaded = {}
+        uris = list(uris)
+        locations = []
         for uri in uris:
-            try:
-                if uri in schema_map:
-                    actual_location = schema_map[uri]
-                    if validator:
-                        validator.info(f"Redirecting {uri} to {actual_location}")
-                else:
-                    actual_location = uri
+            if uri in schema_map:
+                locations.append(schema_map[uri])
+                if validator:
+                    validator.info(f"Redirecting {uri} to {schema_map[uri]}")
+            else:
+                locations.append(uri)
 
-                data = load_file(actual_location)
+        # Load all schemas concurrently
+        loaded = {}
+        for uri, data in zip(uris, load_files(locations)):
+            try:
+                if isinstance(data, Exception):
+                    raise data
                 loaded[uri] = VecorelSchema(data, identifier=uri)
             except Exception as e:
-                message = f"Schema {uri} can't be loaded. {e}"
+                error = SchemaLoadError(f"Schema {uri} can't be loaded. {e}")
                 if validator:
-                    validator.error(message)
+                    validator.error(error)
                 else:
-                    raise ValueError(message) from e
+                    raise error from e
 
         return loaded
 
@@ -65,6 +77,22 @@ class VecorelSchema(dict):
             sdl_version = self.get_sdl_version()
             is_sdl_supported(sdl_version, raise_exception=True)
 
+    def __getstate__(self):
+        # The cached plans are neither copied nor pickled
+        return {}
+
+    def get_plan(self, multiple_collections: bool = False) -> SchemaPlan:
+        """
+        Get the column plans for the properties.
+
+        The plans are created once and cached with the schema,
+        so the schema must not be changed afterwards (except via merge).
+        """
+        plans = self.__dict__.setdefault("_plans", {})
+        if multiple_collections not in plans:
+            plans[multiple_collections] = SchemaPlan(self, multiple_collections)
+        return plans[multiple_collections]
+
     def get_sdl_version(self):
         sdl = self.get("$schema", "")
         match = re.match(VecorelSchema.sdl_pattern, sdl)
@@ -86,6 +114,7 @@ class VecorelSchema(dict):
 
     def merge(self, other: "VecorelSchema"):
         """Merge another schema into this one, in-place."""
+        self.__dict__.pop("_plans", None)
         if isinstance(other, dict):
             other = VecorelSchema(other)
 
@@ -129,7 +158,8 @@ class VecorelSchema(dict):
                     pass  # doesn't exist in other schema, keep as is
             else:
                 # doesn't exist in this schema, just add it from the other schema
-                a[key] = b[key]
+                # (copied as the other schema may be cached and read-only)
+                a[key] = copy.deepcopy(b[key])
         return a
 
     def _merge_json_schema(self, a: dict, b: dict, path: str = "") -> dict:
@@ -151,13 +181,13 @@ class VecorelSchema(dict):
                 elif a[key] is False or b[key] is False:
                     a[key] = False
                 elif a[key] is True and isinstance(b[key], dict):
-                    a[key] = b[key]
+                    a[key] = copy.deepcopy(b[key])
                 else:
                     pass  # a is good as is, no action needed
             elif key not in b:
                 continue
             elif key not in a:
-                a[key] = b[key]
+                a[key] = copy.deepcopy(b[key])
             else:
                 p = f"{path}.{key}"
                 match key:
@@ -180,7 +210,7 @@ class VecorelSchema(dict):
                             a[key] = True
                     case _:  # description, type, format, pattern, default
                         if a[key] == b[key]:
-                            a[key] = b[key]
+                            a[key] = copy.deepcopy(b[key])
                         else:
                             raise ValueError(f"Conflict in '{p}': '{a[key]}' != '{b[key]}'")
 
@@ -233,6 +263,33 @@ class VecorelSchema(dict):
         return VecorelSchema(result)
 
 
+class FrozenVecorelSchema(VecorelSchema):
+    """
+    A read-only VecorelSchema that is shared between callers, e.g. cached merged schemas.
+
+    copy() returns a modifiable shallow copy, copy.deepcopy() a modifiable deep copy.
+    """
+
+    __setitem__ = __delitem__ = __ior__ = read_only
+    clear = pop = popitem = setdefault = update = merge = migrate = read_only
+
+    def __init__(self, schema: dict):
+        # The schema is not migrated or checked again
+        dict.__init__(self, {key: freeze(value) for key, value in schema.items()})
+
+    def copy(self) -> VecorelSchema:
+        return VecorelSchema(dict(self))
+
+    def __copy__(self) -> VecorelSchema:
+        return VecorelSchema(dict(self))
+
+    def __deepcopy__(self, memo) -> VecorelSchema:
+        return VecorelSchema({key: copy.deepcopy(value, memo) for key, value in self.items()})
+
+    def __reduce__(self):
+        return (FrozenVecorelSchema, (dict(self),))
+
+
 class CollectionSchemas(set):
     @staticmethod
     def parse_version(schema_uri: str, pattern: Union[str, re.Pattern]):
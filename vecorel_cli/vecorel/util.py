@@ -1,46 +1,305 @@
+import hashlib
 import json
 import os
+import random
 import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Union
+from typing import Iterable, Optional, Union
 from urllib.parse import urlparse
 
+import requests
 import yaml
 from fsspec import AbstractFileSystem
+from fsspec.compression import compr, register_compression
 from fsspec.implementations.http import HTTPFileSystem
 from fsspec.implementations.local import LocalFileSystem
 from yarl import URL
 
 from ..const import SUPPORTED_PROTOCOLS
+from ..registry import Registry
+from .cache import LRUCache
 
-file_cache = {}
+# Loaded files by URI, the cached data is read-only
+file_cache = LRUCache()
+
+# Number of seconds after which remote files in the persistent cache are revalidated
+cache_ttl: int = int(os.environ.get("VECOREL_CACHE_TTL", 24 * 60 * 60))
+# Don't access the network, remote files are only loaded from the persistent cache
+offline: bool = os.environ.get("VECOREL_OFFLINE", "0") == "1"
+# Maximum number of concurrent HTTP requests per host
+max_requests_per_host: int = 4
+# Maximum number of concurrent file downloads per host, limited separately from other requests
+max_downloads_per_host: int = 4
+# Number of retries for HTTP requests that failed due to network or server errors
+request_retries: int = 2
+
+# Keys of fsspec file infos that identify the version of a file, in order of preference
+file_version_keys: list[str] = ["ETag", "etag", "generation", "mtime", "LastModified", "updated"]
+
+# Local copies of remote files by URL, e.g. from schema maps created by prefetch-schemas
+mirrored_files: dict[str, Path] = {}
+_loaded_schema_maps: set[Path] = set()
+
+_host_semaphores: dict[str, threading.BoundedSemaphore] = {}
+_download_semaphores: dict[str, threading.BoundedSemaphore] = {}
+_host_semaphores_lock = threading.Lock()
+
+
+def get_cache_dir(*parts: str) -> Path:
+    """
+    Get the folder for persistent caches, optionally a sub-folder of it.
+
+    Defaults to the XDG cache directory (e.g. ~/.cache/vecorel-cli) and can be
+    changed with the environment variable VECOREL_CACHE_DIR.
+    """
+    folder = os.environ.get("VECOREL_CACHE_DIR")
+    if not folder:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        folder = Path(base) / Registry.name
+    return Path(folder).joinpath(*parts)
 
 
 def load_file(uri: Union[Path, URL, str]) -> dict:
-    """Load files from various sources"""
+    """
+    Load files from various sources.
+
+    The data is cached and read-only, use copy.deepcopy() to get a modifiable copy.
+    """
     if isinstance(uri, Path):
         uri = str(uri.absolute())
     if isinstance(uri, URL):
         uri = str(uri)
 
-    if uri in file_cache:
-        return file_cache[uri]
-
-    fs = get_fs(uri)
+    cached = file_cache.get(uri)
+    if cached is not None:
+        return cached
 
-    with fs.open(uri) as f:
-        data = f.read()
+    if urlparse(uri).scheme in ("http", "https"):
+        data = load_remote_file(uri)
+    else:
+        fs = get_fs(uri)
+        with fs.open(uri) as f:
+            data = f.read()
 
+    size = len(data)
     if uri.endswith(".yml") or uri.endswith(".yaml"):
         data = yaml.safe_load(data)
     elif uri.endswith(".json") or uri.endswith(".geojson"):
         data = json.loads(data)
 
-    file_cache[uri] = data
+    return file_cache.set(uri, data, size=size)
+
+
+def load_files(
+    uris: list[Union[Path, URL, str]], max_workers: int = 8
+) -> list[Union[dict, Exception]]:
+    """
+    Load multiple files concurrently (see load_file).
+
+    Returns the data or the exception for each file, in the order of the given URIs.
+    """
+
+    def load(uri):
+        try:
+            return load_file(uri)
+        except Exception as e:
+            return e
+
+    if len(uris) <= 1:
+        return [load(uri) for uri in uris]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(uris))) as executor:
+        return list(executor.map(load, uris))
+
+
+def load_schema_map(path: Union[Path, str]) -> dict[str, Path]:
+    """
+    Load a schema map file (e.g. created by prefetch-schemas), which maps URLs to file paths.
+    Relative paths are resolved against the folder of the schema map.
+    """
+    path = Path(path)
+    with open(path, "r", encoding="utf-8") as f:
+        mapping = json.load(f)
+
+    if not isinstance(mapping, dict):
+        raise ValueError("Schema map must be a JSON object.")
+
+    return {url: path.parent / file for url, file in mapping.items()}
+
+
+def add_mirrored_files(mapping: dict[str, Union[Path, str]]):
+    """
+    Register local copies of remote files, which are used instead of the URLs by load_remote_file.
+    """
+    mirrored_files.update({url: Path(file) for url, file in mapping.items()})
+
+
+def get_mirrored_file(uri: str) -> Optional[Path]:
+    """
+    Get the local copy of a remote file.
+
+    Besides the registered files, the schema map given in the environment variable
+    VECOREL_SCHEMA_MAP is used.
+    Mirrors are only used if requested explicitly as they are not revalidated.
+    """
+    schema_map = os.environ.get("VECOREL_SCHEMA_MAP")
+    if not schema_map:
+        return mirrored_files.get(uri)
+
+    schema_map = Path(schema_map)
+    if schema_map not in _loaded_schema_maps:
+        _loaded_schema_maps.add(schema_map)
+        try:
+            for url, file in load_schema_map(schema_map).items():
+                mirrored_files.setdefault(url, file)
+        except (OSError, ValueError):
+            pass  # No mirror available
+
+    return mirrored_files.get(uri)
+
+
+def load_remote_file(uri: str) -> bytes:
+    """
+    Load a file via HTTP(S) through the persistent cache.
+
+    Local copies of the file (see get_mirrored_file) are preferred.
+
+    Cached files are used without a request until the TTL (see cache_ttl) is exceeded.
+    Afterwards they are revalidated via ETag / Last-Modified.
+    If the server is not reachable or in offline mode, the cached file is used regardless of its age.
+    """
+    mirrored = get_mirrored_file(uri)
+    if mirrored is not None:
+        try:
+            return mirrored.read_bytes()
+        except OSError:
+            pass  # Fall back to the URL
+
+    folder = get_cache_dir("remote")
+    key = hashlib.sha256(uri.encode("utf-8")).hexdigest()
+    data_path = folder / key
+    meta_path = folder / f"{key}.json"
+
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        cached = data_path.read_bytes()
+    except (OSError, ValueError):
+        meta = cached = None
+
+    if meta is not None and (offline or time.time() - meta["checked"] < cache_ttl):
+        return cached
+    if offline:
+        raise FileNotFoundError(f"{uri} is not available in the cache and offline mode is enabled")
+
+    # see https://github.com/OSGeo/PROJ/issues/4567
+    headers = {"User-Agent": Registry.name}
+    if meta is not None and meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta is not None and meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        response = http_get(uri, headers=headers)
+    except requests.RequestException:
+        if meta is None:
+            raise
+        return cached
+
+    if response.status_code == 304 and meta is not None:
+        data = cached
+    else:
+        data = response.content
+        meta = {
+            "uri": uri,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+    meta["checked"] = time.time()
+
+    try:
+        folder.mkdir(parents=True, exist_ok=True)
+        write_file_atomic(data_path, data)
+        write_file_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+    except OSError:
+        pass  # The cache is optional, e.g. if the folder is not writable
 
     return data
 
 
+def http_get(uri: str, headers: dict = {}, **kwargs) -> requests.Response:
+    """
+    Send a GET request with at most max_requests_per_host concurrent requests per host.
+
+    Connection errors, timeouts and server errors are retried with an exponential backoff.
+    Raises an HTTPError for error responses.
+    """
+    semaphore = get_host_semaphore(uri)
+    for attempt in range(request_retries + 1):
+        try:
+            with semaphore:
+                response = requests.get(uri, headers=headers, timeout=60, **kwargs)
+            if response.status_code < 500 or attempt == request_retries:
+                response.raise_for_status()
+                return response
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == request_retries:
+                raise
+        time.sleep(0.5 * 2**attempt)
+
+
+def get_file_version(info: dict) -> Optional[str]:
+    """
+    Get the version of a file (e.g. the ETag or the modification time) from an fsspec file info.
+    """
+    version = next((info[k] for k in file_version_keys if info.get(k)), None)
+    return None if version is None else str(version)
+
+
+def get_host_semaphore(uri: str) -> threading.BoundedSemaphore:
+    """
+    Get the semaphore that limits the number of concurrent requests to the host of the URI.
+    """
+    return _get_semaphore(_host_semaphores, uri, max_requests_per_host)
+
+
+def get_download_semaphore(uri: str) -> threading.BoundedSemaphore:
+    """
+    Get the semaphore that limits the number of concurrent downloads from the host of the URI.
+
+    Downloads can take a long time, so they don't count against max_requests_per_host.
+    """
+    return _get_semaphore(_download_semaphores, uri, max_downloads_per_host)
+
+
+def _get_semaphore(
+    semaphores: dict[str, threading.BoundedSemaphore], uri: str, limit: int
+) -> threading.BoundedSemaphore:
+    with _host_semaphores_lock:
+        host = urlparse(uri).netloc
+        if host not in semaphores:
+            semaphores[host] = threading.BoundedSemaphore(limit)
+        return semaphores[host]
+
+
+def write_file_atomic(path: Path, data: bytes):
+    """
+    Write to a temporary file first and move it into place,
+    so that concurrent processes never read partially written files.
+    """
+    fd, temp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp, path)
+    except Exception:
+        Path(temp).unlink(missing_ok=True)
+        raise
+
+
 def stream_file(fs, src_uri, dst_file, chunk_size=10 * 1024 * 1024):
     with fs.open(src_uri, mode="rb", block_size=0) as f:
         while True:
@@ -74,6 +333,24 @@ def get_fs(url_or_path: Union[str, Path, URL], **kwargs) -> AbstractFileSystem:
     return LocalFileSystem(**kwargs)
 
 
+def register_zstd_compression() -> bool:
+    """
+    Make zstd available for fsspec's `compression` parameter.
+
+    fsspec only registers zstd for Python 3.14+ or if the zstandard package is installed,
+    so fall back to the backports.zstd package for older Python versions.
+    """
+    if "zstd" in compr:
+        return True
+    try:
+        from backports.zstd import ZstdFile
+    except ImportError:
+        return False
+
+    register_compression("zstd", ZstdFile, "zst")
+    return True
+
+
 def name_from_uri(url):
     if "://" in url:
         try:
@@ -120,3 +397,24 @@ def parse_link_str(link_str: str) -> tuple[str, Optional[str]]:
     if match:
         return match.group(1), match.group(2)
     return link_str.strip(), None
+
+
+def reservoir_sample(items: Iterable, size: int, seed: Optional[int] = None) -> tuple[list, int]:
+    """
+    Draw a random sample of the given size from items of unknown length in a single pass.
+
+    Returns the sampled items in their original order and the total number of items.
+    """
+    rng = random.Random(seed)
+    reservoir = []
+    count = 0
+    for count, item in enumerate(items, 1):
+        if len(reservoir) < size:
+            reservoir.append((count, item))
+        else:
+            index = rng.randrange(count)
+            if index < size:
+                reservoir[index] = (count, item)
+
+    reservoir.sort(key=lambda entry: entry[0])
+    return [item for _, item in reservoir], count